@@ -0,0 +1,235 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+"""
+Cost of moving a community in a large hierarchy, comparing the incremental
+maintenance in tr_Community_iu to the full Community_ParentList MERGE and
+SortCode/Depth recompute it replaced.
+
+A synthetic hierarchy is inserted into the Community tables of a test
+database inside a transaction that is rolled back at the end. After the
+moves, some renames and some new communities saved the way sp_Community_u
+saves them (the Community row before its names), the full recompute is run
+once more and must change nothing. This checks that the incremental
+triggers left the same closure and SortCode behind.
+
+Run from the python directory against a test database:
+
+    python benchmarks/closure.py --config test.ini --nodes 100000
+"""
+
+# std lib
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# this app
+from communitymanager.scripts import add_common_arguments, setup  # noqa: E402
+
+# what tr_Community_iu ran on every ParentCommunity update before
+FULL_RECOMPUTE = """
+SET NOCOUNT ON
+
+DECLARE @Changes TABLE (Action nvarchar(10));
+
+WITH ParentList (CM_ID, Parent_CM_ID) AS
+(
+    SELECT CM_ID, ParentCommunity
+    FROM Community
+    WHERE ParentCommunity IS NOT NULL
+  UNION ALL
+    SELECT cm1.CM_ID, p.Parent_CM_ID
+    FROM Community cm1
+    INNER JOIN ParentList p
+        ON cm1.ParentCommunity=p.CM_ID
+)
+MERGE INTO Community_ParentList AS cmpl
+USING ParentList AS p
+ON cmpl.CM_ID=p.CM_ID AND cmpl.Parent_CM_ID=p.Parent_CM_ID
+WHEN NOT MATCHED BY TARGET
+    THEN INSERT (CM_ID, Parent_CM_ID) VALUES (p.CM_ID, p.Parent_CM_ID)
+WHEN NOT MATCHED BY SOURCE
+    THEN DELETE
+OUTPUT $action INTO @Changes
+OPTION (MAXRECURSION 30);
+
+WITH SiblingRank(CM_ID, SortCode) AS
+(
+    SELECT cm.CM_ID, CAST(RIGHT('0000000' + CAST(RANK() OVER (ORDER BY cmn.Name) AS VARCHAR(3)), 3) AS varchar(MAX))
+    FROM Community cm
+    INNER JOIN Community_Name cmn
+        ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=0
+    WHERE ParentCommunity IS NULL
+    UNION ALL
+    SELECT cm.CM_ID, s.SortCode + '-' + CAST(RIGHT('0000000' + CAST(RANK() OVER (ORDER BY cmn.Name) AS VARCHAR(3)), 3) AS varchar(MAX))
+    FROM Community cm
+    INNER JOIN Community_Name cmn
+        ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=0
+    INNER JOIN SiblingRank s
+        ON s.CM_ID=cm.ParentCommunity
+)
+UPDATE cm
+    SET
+        Depth = (SELECT COUNT(*) FROM Community_ParentList WHERE CM_ID=cm.CM_ID),
+        SortCode = s.SortCode
+OUTPUT CASE WHEN ISNULL(deleted.SortCode, '')<>ISNULL(inserted.SortCode, '')
+        OR ISNULL(deleted.Depth, -1)<>ISNULL(inserted.Depth, -1) THEN 'UPDATE' END
+    INTO @Changes
+FROM Community cm
+INNER JOIN SiblingRank s
+    ON cm.CM_ID=s.CM_ID
+
+SELECT COUNT(*) FROM @Changes WHERE Action IS NOT NULL
+"""
+
+INSERT_LEVEL = """
+SET NOCOUNT ON
+
+DECLARE @Inserted TABLE (CM_ID int NOT NULL);
+
+WITH n AS (
+    SELECT TOP (?) ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS i
+    FROM sys.all_objects a CROSS JOIN sys.all_objects b
+)
+INSERT INTO Community (CREATED_BY, MODIFIED_BY, ParentCommunity)
+OUTPUT inserted.CM_ID INTO @Inserted
+SELECT 'benchmark', 'benchmark', p.CM_ID
+FROM n
+INNER JOIN #Parents p
+    ON p.i=(n.i - 1) % (SELECT COUNT(*) FROM #Parents) + 1
+
+INSERT INTO Community_Name (CM_ID, LangID, Name)
+SELECT CM_ID, 0, 'Benchmark ' + CAST(CM_ID AS varchar(20))
+FROM @Inserted
+
+SELECT CM_ID FROM @Inserted
+"""
+
+
+def build_hierarchy(conn, nodes, fanout):
+    root = conn.execute("""SET NOCOUNT ON
+        INSERT INTO Community (CREATED_BY, MODIFIED_BY) VALUES ('benchmark', 'benchmark')
+        DECLARE @CM_ID int = SCOPE_IDENTITY()
+        INSERT INTO Community_Name (CM_ID, LangID, Name) VALUES (@CM_ID, 0, 'Benchmark Root')
+        SELECT @CM_ID""").fetchone()[0]
+
+    levels = [[root]]
+    total = 1
+    while total < nodes:
+        count = min(len(levels[-1]) * fanout, nodes - total)
+        conn.execute("CREATE TABLE #Parents (i int IDENTITY(1, 1), CM_ID int NOT NULL)")
+        # each level is one INSERT, so its identity values are a range
+        conn.execute(
+            "INSERT INTO #Parents (CM_ID) SELECT CM_ID FROM Community "
+            "WHERE CM_ID BETWEEN ? AND ? AND CREATED_BY='benchmark' ORDER BY CM_ID",
+            min(levels[-1]),
+            max(levels[-1]),
+        )
+        levels.append([x[0] for x in conn.execute(INSERT_LEVEL, count).fetchall()])
+        conn.execute("DROP TABLE #Parents")
+        total += count
+
+    return levels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_common_arguments(parser)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--moves", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    connmgr = setup(args)
+    rng = random.Random(42)
+
+    with connmgr.get_connection() as conn:
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            start = time.perf_counter()
+            levels = build_hierarchy(conn, args.nodes, args.fanout)
+            print(
+                "built %d nodes in %d levels in %.1fs"
+                % (sum(map(len, levels)), len(levels), time.perf_counter() - start)
+            )
+
+            # sort codes for the synthetic names, and the old cost of one move
+            start = time.perf_counter()
+            conn.execute(FULL_RECOMPUTE).fetchone()
+            full = time.perf_counter() - start
+            print("full recompute:   %8.1f ms per move" % (full * 1000))
+
+            timings = []
+            for i in range(args.moves):
+                # a branch from the middle of the tree to a new parent higher up
+                level = rng.randrange(2, len(levels))
+                cm_id = rng.choice(levels[level])
+                parent = rng.choice(levels[rng.randrange(0, level - 1)])
+
+                start = time.perf_counter()
+                conn.execute(
+                    "UPDATE Community SET ParentCommunity=? WHERE CM_ID=?",
+                    parent,
+                    cm_id,
+                )
+                timings.append(time.perf_counter() - start)
+
+            timings.sort()
+            print(
+                "incremental:      %8.1f ms per move (median of %d, max %.1f ms)"
+                % (timings[len(timings) // 2] * 1000, len(timings), timings[-1] * 1000)
+            )
+
+            for i in range(args.moves):
+                # a name that sorts first among its siblings
+                cm_id = rng.choice(levels[rng.randrange(1, len(levels))])
+                conn.execute(
+                    "UPDATE Community_Name SET Name=? WHERE CM_ID=? AND LangID=0",
+                    "Benchmark 0 renamed %d" % cm_id,
+                    cm_id,
+                )
+
+            for i in range(args.moves):
+                parent = rng.choice(levels[rng.randrange(0, len(levels) - 1)])
+                conn.execute(
+                    """SET NOCOUNT ON
+                    INSERT INTO Community (CREATED_BY, MODIFIED_BY, ParentCommunity)
+                        VALUES ('benchmark', 'benchmark', ?)
+                    DECLARE @CM_ID int = SCOPE_IDENTITY()
+                    INSERT INTO Community_Name (CM_ID, LangID, Name)
+                        VALUES (@CM_ID, 0, 'Benchmark 0 added ' + CAST(@CM_ID AS varchar(20)))""",
+                    parent,
+                )
+
+            changed = conn.execute(FULL_RECOMPUTE).fetchone()[0]
+            if changed:
+                raise SystemExit(
+                    "full recompute changed %d rows after incremental updates" % changed
+                )
+            print(
+                "full recompute after the moves, renames and additions changed nothing"
+            )
+
+        finally:
+            conn.execute("ROLLBACK TRANSACTION")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+"""
+Round trip time of sp_Community_u for an alternate search area with many
+search communities, sending XML documents compared to table-valued
+parameters.
+
+Each save runs in a transaction that is rolled back, so the database is
+left unchanged. Run from the python directory against a test database:
+
+    python benchmarks/communitysave.py --config test.ini --cmid 1234
+"""
+
+# std lib
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# this app
+from communitymanager.lib.communitysave import CommunitySave  # noqa: E402
+from communitymanager.scripts import add_common_arguments, setup  # noqa: E402
+
+
+def load_save(conn, cm_id, area_count):
+    community = conn.execute(
+        "SELECT ParentCommunity, ProvinceState, AlternativeArea FROM Community WHERE CM_ID=?",
+        cm_id,
+    ).fetchone()
+    if not community or not community.AlternativeArea:
+        raise SystemExit("%s is not an alternate search area" % cm_id)
+
+    descriptions = {
+        x.Culture: {"Name": x.Name}
+        for x in conn.execute(
+            "SELECT l.Culture, cmn.Name FROM Community_Name cmn "
+            "INNER JOIN Language l ON l.LangID=cmn.LangID WHERE cmn.CM_ID=?",
+            cm_id,
+        ).fetchall()
+    }
+
+    alt_areas = [
+        x.CM_ID
+        for x in conn.execute(
+            "SELECT TOP (?) CM_ID FROM Community WHERE CM_ID<>? AND AlternativeArea=0 ORDER BY CM_ID",
+            area_count,
+            cm_id,
+        ).fetchall()
+    ]
+
+    user_id = conn.execute("SELECT TOP 1 User_ID FROM Users WHERE Admin=1").fetchone()[
+        0
+    ]
+
+    return CommunitySave(
+        cm_id,
+        user_id,
+        True,
+        community.ParentCommunity,
+        community.ProvinceState,
+        "benchmark",
+        descriptions,
+        [],
+        alt_areas,
+    )
+
+
+def time_save(conn, sql, args, repeat):
+    best = None
+    for i in range(repeat):
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            start = time.perf_counter()
+            result = conn.execute(sql, args).fetchone()
+            elapsed = time.perf_counter() - start
+        finally:
+            conn.execute("ROLLBACK TRANSACTION")
+
+        if result.Return:
+            raise SystemExit("sp_Community_u failed: %s" % result.ErrMsg)
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_common_arguments(parser)
+    parser.add_argument(
+        "--cmid", type=int, required=True, help="an alternate search area"
+    )
+    parser.add_argument("--areas", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    connmgr = setup(args)
+
+    print(
+        "%8s %12s %12s %12s %12s"
+        % ("areas", "xml build", "xml save", "tvp build", "tvp save")
+    )
+    with connmgr.get_connection() as conn:
+        for area_count in args.areas:
+            save = load_save(conn, args.cmid, area_count)
+
+            start = time.perf_counter()
+            xml_sql, xml_args = save.xml_args()
+            xml_build = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            tvp_sql, tvp_args = save.table_args()
+            tvp_build = (time.perf_counter() - start) * 1000
+
+            print(
+                "%8d %9.2f ms %9.2f ms %9.2f ms %9.2f ms"
+                % (
+                    len(save.alt_areas),
+                    xml_build,
+                    time_save(conn, xml_sql, xml_args, args.repeat),
+                    tvp_build,
+                    time_save(conn, tvp_sql, tvp_args, args.repeat),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
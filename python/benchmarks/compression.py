@@ -0,0 +1,161 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+"""
+Compare compression settings for the published archives on a synthetic
+repository export.
+
+Run from the python directory:
+
+    python benchmarks/compression.py --communities 50000
+"""
+
+# std lib
+import argparse
+import gzip
+import io
+import os
+import random
+import sys
+import time
+import uuid
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# this app
+from communitymanager.lib.compression import Compression  # noqa: E402
+
+SETTINGS = [
+    ("store", None, 1),
+    ("deflate", 1, 1),
+    ("deflate", 1, 4),
+    ("deflate", 6, 1),
+    ("deflate", 6, 2),
+    ("deflate", 6, 4),
+    ("deflate", 6, 8),
+    ("deflate", 9, 1),
+    ("deflate", 9, 4),
+    ("bzip2", 9, 1),
+    ("lzma", None, 1),
+]
+
+_words = (
+    "North South East West Upper Lower Lake River Bay Park Hill Valley "
+    "Falls Harbour Point Creek Springs Mills Grove Heights Township County"
+).split()
+
+
+def synthetic_export(communities, seed=1):
+    """Return xml shaped like the sp_Community_l_xml export, as chunks of text."""
+    rnd = random.Random(seed)
+    chunks = ["<province_states>"]
+    for i in range(1, 14):
+        chunks.append(
+            '<province_state id="%d" name_or_code="P%d" country="Canada">'
+            '<names><name culture="en-CA" value="Province %d"/></names>'
+            "</province_state>" % (i, i, i)
+        )
+    chunks.append("</province_states><communities>")
+
+    for i in range(1, communities + 1):
+        name = " ".join(rnd.choice(_words) for _ in range(rnd.randint(1, 3)))
+        chunks.append(
+            '<community id="%d" parent_id="%d" prov_state="%d" guid="%s" '
+            'created_date="2015-01-01T00:00:00" modified_date="2020-%02d-%02dT12:00:00">'
+            '<names><name culture="en-CA" value="%s %d"/>'
+            '<name culture="fr-CA" value="%s %d"/></names>'
+            "<alt_names/></community>"
+            % (
+                i,
+                rnd.randint(1, max(1, i - 1)),
+                rnd.randint(1, 13),
+                str(uuid.UUID(int=rnd.getrandbits(128))).upper(),
+                rnd.randint(1, 12),
+                rnd.randint(1, 28),
+                name,
+                i,
+                name,
+                i,
+            )
+        )
+    chunks.append("</communities><alt_search_areas/>")
+
+    return chunks
+
+
+def run(compression, chunks):
+    zipped = io.BytesIO()
+    start = time.perf_counter()
+    with compression.zipfile(zipped) as zf:
+        with compression.open_member(zf, "export.xml") as member:
+            for chunk in chunks:
+                member.write(chunk.encode("utf-8"))
+    zip_seconds = time.perf_counter() - start
+
+    gzipped = io.BytesIO()
+    start = time.perf_counter()
+    gz = compression.gzip_file(gzipped, "export.ndjson")
+    for chunk in chunks:
+        gz.write(chunk.encode("utf-8"))
+    gz.close()
+    gz_seconds = time.perf_counter() - start
+
+    # everything written must still open with the standard library readers
+    data = "".join(chunks).encode("utf-8")
+    assert zipfile.ZipFile(zipped).read("export.xml") == data
+    assert gzip.decompress(gzipped.getvalue()) == data
+
+    return zip_seconds, len(zipped.getvalue()), gz_seconds, len(gzipped.getvalue())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--communities", type=int, default=50000)
+    parser.add_argument("--block-size", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    chunks = synthetic_export(args.communities)
+    size = sum(len(x.encode("utf-8")) for x in chunks)
+    print(
+        "synthetic export: %d communities, %.1f MiB"
+        % (args.communities, size / 1048576.0)
+    )
+    print()
+    print(
+        "%-8s %5s %7s  %10s %8s  %10s %8s"
+        % ("codec", "level", "threads", "zip MiB/s", "ratio", "gzip MiB/s", "ratio")
+    )
+
+    for codec, level, threads in SETTINGS:
+        compression = Compression(codec, level, threads, args.block_size)
+        zip_seconds, zip_size, gz_seconds, gz_size = run(compression, chunks)
+        print(
+            "%-8s %5s %7d  %10.1f %8.3f  %10.1f %8.3f"
+            % (
+                codec,
+                "-" if level is None else level,
+                threads,
+                size / 1048576.0 / zip_seconds,
+                zip_size / float(size),
+                size / 1048576.0 / gz_seconds,
+                gz_size / float(size),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
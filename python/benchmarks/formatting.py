@@ -0,0 +1,92 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+"""
+Per row cost of formatting change history dates, comparing babel called
+with a locale parsed on every call to the cached CultureFormatter.
+
+Run from the python directory:
+
+    python benchmarks/formatting.py --rows 10000
+"""
+
+# std lib
+import argparse
+from datetime import datetime, timedelta
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# 3rd party
+from babel import Locale, dates  # noqa: E402
+
+# this app
+from communitymanager.lib.formatting import (  # noqa: E402
+    get_formatter,
+    locale_date_format,
+)
+
+
+def uncached_format_datetime(dt, culture):
+    # what request.format_datetime did for every row before the cache
+    locale = Locale.parse(culture, sep="-")
+    date_part = dates.format_date(
+        dt, locale=locale, format=locale_date_format.get(culture, "medium")
+    )
+    time_part = dates.format_time(dt, locale=Locale.parse(culture, sep="-"))
+    return date_part + " " + time_part
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    start = datetime(2020, 1, 1, 8, 30)
+    rows = [start + timedelta(minutes=97 * i) for i in range(args.rows)]
+
+    for culture in ("en-CA", "fr-CA"):
+        formatter = get_formatter(culture)
+        assert [formatter.format_datetime(x) for x in rows[:100]] == [
+            uncached_format_datetime(x, culture) for x in rows[:100]
+        ]
+
+        old = min(
+            timeit.repeat(
+                lambda: [uncached_format_datetime(x, culture) for x in rows],
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        new = min(
+            timeit.repeat(
+                lambda: [formatter.format_datetime(x) for x in rows],
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+
+        print(
+            "%s: uncached %.1f us/row, cached %.1f us/row, %.1fx"
+            % (culture, old / args.rows * 1e6, new / args.rows * 1e6, old / new)
+        )
+
+
+if __name__ == "__main__":
+    main()
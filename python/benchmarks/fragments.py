@@ -0,0 +1,118 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+"""
+Cost of decoding the list columns of sp_Users_l, sp_Community_s and
+sp_Community_s_MoreInfo returned FOR XML AUTO compared to FOR JSON PATH.
+
+Run from the python directory:
+
+    python benchmarks/fragments.py --rows 2000
+"""
+
+# std lib
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+from xml.sax.saxutils import quoteattr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# this app
+from communitymanager.lib.fragments import (  # noqa: E402
+    json_to_dict_list,
+    xml_to_dict_list,
+)
+
+NAMES = [
+    "Toronto",
+    "Lac-Saint-Jean",
+    "Trois-Rivières",
+    "Kawartha Lakes & Area",
+    "L'Île-Perrot",
+    "Sault Ste. Marie",
+    "Grande Prairie <County>",
+    'The "Soo"',
+    "Îles-de-la-Madeleine",
+]
+
+# (element, attributes, max elements) as produced by the procedures
+SHAPES = [
+    ("cmn", ("Name",), 12),  # sp_Users_l ManageCommunities
+    ("es", ("Name",), 3),  # sp_Users_l ManageExternalSystems
+    ("child", ("CM_ID", "Name"), 25),  # ChildCommunities, SearchCommunities
+    ("nm", ("Name",), 4),  # OtherNames
+    ("u", ("UserName", "Initials"), 15),  # Managers
+]
+
+
+def make_rows(count, rng):
+    rows = []
+    for i in range(count):
+        tag, attrs, most = rng.choice(SHAPES)
+        items = []
+        for j in range(rng.randint(0, most)):
+            item = {}
+            for attr in attrs:
+                if attr == "CM_ID":
+                    item[attr] = rng.randint(1, 5000)
+                elif attr == "Initials":
+                    item[attr] = rng.choice(NAMES)[:2].upper()
+                else:
+                    item[attr] = rng.choice(NAMES)
+            items.append(item)
+
+        xml = "".join(
+            "<%s %s/>"
+            % (tag, " ".join("%s=%s" % (k, quoteattr(str(v))) for k, v in x.items()))
+            for x in items
+        )
+        rows.append((xml or None, json.dumps(items) if items else None))
+
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows, random.Random(42))
+
+    for xml, js in rows:
+        as_text = [{k: str(v) for k, v in x.items()} for x in json_to_dict_list(js)]
+        if xml_to_dict_list(xml) != as_text:
+            raise SystemExit("Output differs for %r" % xml)
+
+    def run(fn, column):
+        def decode():
+            for row in rows:
+                fn(row[column])
+
+        best = min(timeit.repeat(decode, number=1, repeat=args.repeat))
+        return best / len(rows) * 1e6
+
+    print("rows: %d" % len(rows))
+    print("FOR XML AUTO:   %6.1f us/row" % run(xml_to_dict_list, 0))
+    print("FOR JSON PATH:  %6.1f us/row" % run(json_to_dict_list, 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+"""
+Latency of the community name searches using the CommunityNames full-text
+catalog compared to the LIKE fallback.
+
+Search terms are prefixes of words taken from the community names in the
+database, as typed into the autocomplete fields. Run from the python
+directory against a database with the full-text indexes populated:
+
+    python benchmarks/fulltext.py --config test.ini --terms 50
+"""
+
+# std lib
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# this app
+from communitymanager.lib.fulltext import contains_condition  # noqa: E402
+from communitymanager.scripts import add_common_arguments, setup  # noqa: E402
+
+# (procedure, sql, takes a User_ID)
+PROCEDURES = [
+    ("sp_Community_ls", "EXEC sp_Community_ls ?, ?, ?", True),
+    ("sp_Community_ls_Autocomplete", "EXEC sp_Community_ls_Autocomplete ?, ?", False),
+    (
+        "sp_Community_ls_ParentSelector",
+        "EXEC sp_Community_ls_ParentSelector ?, NULL, ?, ?",
+        True,
+    ),
+]
+
+
+def sample_terms(conn, count, rng):
+    names = [
+        x[0]
+        for x in conn.execute(
+            "SELECT Name FROM Community_DisplayName WHERE LangID=@@LANGID"
+        ).fetchall()
+    ]
+    terms = []
+    for name in rng.sample(names, min(count, len(names))):
+        word = rng.choice(name.split())
+        terms.append(word[: rng.randint(3, max(3, len(word)))])
+
+    return terms
+
+
+def time_search(conn, sql, args, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        rows = conn.execute(sql, args).fetchall()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, len(rows)
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_common_arguments(parser)
+    parser.add_argument("--terms", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    connmgr = setup(args)
+    rng = random.Random(42)
+
+    with connmgr.get_connection() as conn:
+        ready = conn.execute(
+            "SELECT dbo.fn_HasFullTextIndex('dbo.Community_Name') & "
+            "dbo.fn_HasFullTextIndex('dbo.Community_AltName')"
+        ).fetchone()[0]
+        if not ready:
+            raise SystemExit(
+                "The CommunityNames full-text indexes are not installed, "
+                "run sql/Optional/FullTextSearch.sql first"
+            )
+
+        user_id = conn.execute(
+            "SELECT TOP 1 User_ID FROM Users WHERE Admin=1"
+        ).fetchone()[0]
+        terms = sample_terms(conn, args.terms, rng)
+        print("%d terms, best of %d runs each" % (len(terms), args.repeat))
+        print(
+            "%-32s %12s %12s %14s" % ("procedure", "like", "contains", "rows ft/like")
+        )
+
+        for name, sql, takes_user in PROCEDURES:
+            prefix = (user_id,) if takes_user else ()
+            like = []
+            contains = []
+            like_rows = contains_rows = 0
+            for term in terms:
+                elapsed, rows = time_search(
+                    conn, sql, prefix + (term, None), args.repeat
+                )
+                like.append(elapsed)
+                like_rows += rows
+
+                elapsed, rows = time_search(
+                    conn, sql, prefix + (term, contains_condition(term)), args.repeat
+                )
+                contains.append(elapsed)
+                contains_rows += rows
+
+            print(
+                "%-32s %9.2f ms %9.2f ms %4d/%-5d"
+                % (
+                    name,
+                    median(like) * 1000,
+                    median(contains) * 1000,
+                    contains_rows,
+                    like_rows,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -248,6 +248,13 @@ def main(global_config, **settings):
 
     config.add_route("pwreset", "/pwreset", pregenerator=passvars_pregen)
 
+    config.add_route(
+        "reload_caches",
+        "/reload",
+        pregenerator=passvars_pregen,
+        factory=OnlyAdminRootFactory,
+    )
+
     config.add_route(
         "request_reject",
         "/request_reject",
@@ -259,6 +266,12 @@ def main(global_config, **settings):
 
     config.add_route("download", "/downloads/{filename}", pregenerator=passvars_pregen)
 
+    config.add_route(
+        "download_changes",
+        "/downloads/{filename}/changes",
+        pregenerator=passvars_pregen,
+    )
+
     config.add_route(
         "publish",
         "/publish",
@@ -277,6 +290,13 @@ def main(global_config, **settings):
         factory="communitymanager.views.externalsystem.ExternalSystemRoot",
     )
 
+    config.add_route(
+        "json_external_community_list",
+        "/external_communities/{SystemCode}/communities",
+        pregenerator=passvars_pregen,
+        factory="communitymanager.views.externalsystem.ExternalSystemRoot",
+    )
+
     config.add_route(
         "json_external_community_parents",
         "/external_communities/{SystemCode}/parents",
@@ -309,6 +329,8 @@ def main(global_config, **settings):
 
     config.add_route("logout", "/logout", pregenerator=passvars_pregen)
 
+    config.add_route("json_community_details", "/json/communities/details")
+
     config.add_route("json_community", "/json/communities/{cmid}")
 
     config.add_route("json_parents", "/json/parents")
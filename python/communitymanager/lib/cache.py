@@ -0,0 +1,79 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# std lib
+import threading
+import time
+
+import logging
+
+log = logging.getLogger("communitymanager.lib.cache")
+
+# seconds reference data is kept before it is fetched again
+DEFAULT_TTL = 10 * 60
+
+_caches = []
+
+
+class LanguageCache(object):
+    """
+    Process wide cache of near static data fetched from the database, one
+    value per SQL Server language since the names it contains are localized.
+
+    loader(conn) is called with a connection in that language and returns
+    the value to cache. Cached values are shared between requests, callers
+    must not modify them.
+    """
+
+    def __init__(self, name, loader, ttl=DEFAULT_TTL):
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._values = {}
+        _caches.append(self)
+
+    def get(self, request):
+        language = request.language.LanguageAlias
+        now = time.time()
+
+        cached = self._values.get(language)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        with self._lock:
+            # another thread may have loaded it while we waited
+            cached = self._values.get(language)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+
+            log.debug("Loading %s (%s)", self.name, language)
+            with request.connmgr.get_connection(language) as conn:
+                value = self.loader(conn)
+
+            self._values[language] = (now + self.ttl, value)
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._values = {}
+
+
+def clear_all():
+    """Drop every cached value, they are fetched again on next use."""
+    for cache in _caches:
+        cache.clear()
@@ -0,0 +1,188 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# std lib
+import xml.etree.ElementTree as ET
+
+# 3rd party
+import pyodbc
+
+import logging
+
+log = logging.getLogger("communitymanager.lib.communitysave")
+
+_XML_SQL = """
+    DECLARE @RC int, @CM_ID int, @ErrMsg nvarchar(500)
+
+    SET @CM_ID = ?
+
+    EXEC @RC = sp_Community_u @CM_ID OUTPUT, ?, ?, ?, ?, ?, ?, ?, ?, @ErrMsg OUTPUT
+
+    SELECT @RC AS [Return], @CM_ID AS CM_ID, @ErrMsg AS ErrMsg
+    """
+
+_ROWS_SQL = """
+    DECLARE @RC int, @CM_ID int, @ErrMsg nvarchar(500)
+
+    SET @CM_ID = ?
+
+    EXEC @RC = sp_Community_u @CM_ID OUTPUT, ?, ?, ?, ?, ?, NULL, NULL, NULL, @ErrMsg OUTPUT%s
+
+    SELECT @RC AS [Return], @CM_ID AS CM_ID, @ErrMsg AS ErrMsg
+    """
+
+# cleared the first time the driver or database rejects the table-valued
+# parameters, saves then use the XML parameters for the life of the process
+use_table_parameters = True
+
+# SQLSTATEs from drivers that cannot bind or describe table-valued parameters
+_TVP_DRIVER_STATES = {"07006", "HY004", "HY105", "HYC00"}
+
+# messages from a database without the table types or procedure parameters
+_TVP_MESSAGES = (
+    "cannot find data type",
+    "table type",
+    "table-valued",
+    "operand type clash",
+    "invalid parameter type",
+)
+
+
+def _table_parameters_rejected(e):
+    # pyodbc puts the SQLSTATE first for driver errors and last for its own
+    args = [str(x) for x in e.args]
+    if _TVP_DRIVER_STATES.intersection(args):
+        return True
+
+    message = " ".join(args).lower()
+    return any(x in message for x in _TVP_MESSAGES)
+
+
+class CommunitySave(object):
+    """
+    The values submitted for a community, ready to be sent to sp_Community_u
+    either as table-valued parameters or as the XML documents the procedure
+    also accepts.
+    """
+
+    def __init__(
+        self,
+        cm_id,
+        user_id,
+        is_alt_area,
+        parent_community,
+        province_state,
+        reason_for_change,
+        descriptions,
+        alt_names,
+        alt_areas,
+    ):
+        self.base_args = [
+            cm_id,
+            user_id,
+            is_alt_area,
+            parent_community,
+            province_state,
+            reason_for_change,
+        ]
+
+        self.is_alt_area = is_alt_area
+
+        # (Culture, Name)
+        self.descriptions = [
+            (culture.replace("_", "-"), description.get("Name"))
+            for culture, description in descriptions.items()
+        ]
+
+        # (Culture, AltName)
+        self.alt_names = [
+            (name["Culture"], name["AltName"])
+            for name in alt_names
+            if not name.get("Delete") and name.get("AltName")
+        ]
+
+        # (ID,)
+        self.alt_areas = [(int(x),) for x in alt_areas] if is_alt_area else []
+
+    def xml_args(self):
+        root = ET.Element("DESCS")
+        for culture, name in self.descriptions:
+            desc = ET.SubElement(root, "DESC")
+            ET.SubElement(desc, "Culture").text = culture
+            if name:
+                ET.SubElement(desc, "Name").text = name
+
+        args = self.base_args + [ET.tostring(root)]
+
+        root = ET.Element("NAMES")
+        for culture, alt_name in self.alt_names:
+            desc = ET.SubElement(root, "Name")
+            ET.SubElement(desc, "Culture").text = culture
+            ET.SubElement(desc, "AltName").text = alt_name
+
+        args.append(ET.tostring(root))
+
+        if self.is_alt_area:
+            root = ET.Element("ALTAREAS")
+            for (area,) in self.alt_areas:
+                ET.SubElement(root, "CM_ID").text = str(area)
+
+            args.append(ET.tostring(root))
+
+        else:
+            args.append(None)
+
+        return _XML_SQL, args
+
+    def table_args(self):
+        args = list(self.base_args)
+        named = []
+
+        # an omitted table-valued parameter is an empty table, which also
+        # avoids binding a TVP with no rows
+        for name, rows in (
+            ("@DescriptionRows", self.descriptions),
+            ("@AltNameRows", self.alt_names),
+            ("@AltSearchAreaRows", self.alt_areas),
+        ):
+            if rows:
+                named.append(", %s=?" % name)
+                args.append(rows)
+
+        return _ROWS_SQL % "".join(named), args
+
+    def execute(self, conn):
+        """Run sp_Community_u, returning the Return, CM_ID, ErrMsg row."""
+        global use_table_parameters
+        if use_table_parameters:
+            sql, args = self.table_args()
+            try:
+                return conn.execute(sql, args).fetchone()
+            except (pyodbc.ProgrammingError, pyodbc.NotSupportedError) as e:
+                # the types or parameters are missing, or the driver cannot
+                # describe them; nothing was saved. Anything else is a real
+                # error from the save.
+                if not _table_parameters_rejected(e):
+                    raise
+
+                log.warning(
+                    "Table-valued parameters rejected, saving communities with XML",
+                    exc_info=True,
+                )
+                use_table_parameters = False
+
+        sql, args = self.xml_args()
+        return conn.execute(sql, args).fetchone()
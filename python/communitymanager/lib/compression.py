@@ -0,0 +1,238 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# std lib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import io
+import struct
+import zipfile
+import zlib
+
+import logging
+
+log = logging.getLogger("communitymanager.lib.compression")
+
+CODECS = {
+    "deflate": zipfile.ZIP_DEFLATED,
+    "store": zipfile.ZIP_STORED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+# deflate can refer back at most 32K, priming each block with the end of the
+# previous one keeps the ratio close to that of a single stream
+_WINDOW_SIZE = 1 << 15
+
+
+def _compress_block(block, level, zdict, final):
+    if zdict:
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    data = compressor.compress(block)
+    # a sync flush ends the block on a byte boundary without marking it as
+    # the last one, so the compressed blocks can simply be concatenated
+    return data + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelDeflate(object):
+    """
+    Raw deflate compressor with the compress()/flush() interface of a
+    zlib compress object that compresses fixed size blocks on a thread pool.
+
+    zlib releases the GIL while compressing so the blocks are compressed
+    concurrently. The output is a single ordinary deflate stream.
+    """
+
+    def __init__(self, level=-1, threads=2, block_size=DEFAULT_BLOCK_SIZE):
+        self.level = level
+        self.block_size = block_size
+        self.max_pending = threads * 2
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.buffer = bytearray()
+        self.pending = deque()
+        self.zdict = None
+
+    def _submit(self, block, final):
+        self.pending.append(
+            self.executor.submit(_compress_block, block, self.level, self.zdict, final)
+        )
+        self.zdict = block[-_WINDOW_SIZE:]
+
+    def _collect(self, wait_all=False):
+        out = []
+        while self.pending and (
+            wait_all or self.pending[0].done() or len(self.pending) > self.max_pending
+        ):
+            out.append(self.pending.popleft().result())
+
+        return b"".join(out)
+
+    def compress(self, data):
+        self.buffer += data
+        while len(self.buffer) >= self.block_size:
+            block = bytes(self.buffer[: self.block_size])
+            del self.buffer[: self.block_size]
+            self._submit(block, False)
+
+        return self._collect()
+
+    def flush(self):
+        try:
+            self._submit(bytes(self.buffer), True)
+            self.buffer = bytearray()
+            return self._collect(wait_all=True)
+        finally:
+            self.executor.shutdown(wait=False)
+
+
+class ParallelGzipFile(io.RawIOBase):
+    """Write only gzip file compressed with ParallelDeflate."""
+
+    def __init__(self, fileobj, filename=None, compressor=None):
+        self.fileobj = fileobj
+        self.compressor = compressor
+        self.crc = 0
+        self.size = 0
+
+        flags = 0
+        fname = b""
+        if filename:
+            flags = gzip.FNAME
+            fname = filename.encode("latin-1", "replace") + b"\0"
+
+        # magic, deflate, flags, mtime 0 for reproducible output, xfl, os unknown
+        self.fileobj.write(b"\x1f\x8b\x08" + struct.pack("<BLBB", flags, 0, 0, 255))
+        self.fileobj.write(fname)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        self.fileobj.write(self.compressor.compress(data))
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+
+        try:
+            self.fileobj.write(self.compressor.flush())
+            self.fileobj.write(
+                struct.pack("<LL", self.crc & 0xFFFFFFFF, self.size & 0xFFFFFFFF)
+            )
+        finally:
+            super(ParallelGzipFile, self).close()
+
+
+class Compression(object):
+    """
+    Compression settings for published and exported archives.
+
+    codec is one of CODECS, level is the codec's compression level (None for
+    its default) and threads > 1 compresses deflate output in parallel blocks.
+    Everything produced can be read by ordinary zip and gzip readers.
+    """
+
+    def __init__(self, codec="deflate", level=None, threads=1, block_size=None):
+        if codec not in CODECS:
+            raise ValueError("Unknown compression codec: %s" % codec)
+
+        self.codec = codec
+        self.level = level
+        self.threads = max(1, threads or 1)
+        self.block_size = block_size or DEFAULT_BLOCK_SIZE
+
+    @classmethod
+    def from_config(cls, config):
+        level = config.get("compression.level")
+        threads = config.get("compression.threads")
+        block_size = config.get("compression.block_size")
+        return cls(
+            codec=config.get("compression.codec") or "deflate",
+            level=int(level) if level else None,
+            threads=int(threads) if threads else 1,
+            block_size=int(block_size) if block_size else None,
+        )
+
+    def __repr__(self):
+        return "Compression(%r, level=%r, threads=%r, block_size=%r)" % (
+            self.codec,
+            self.level,
+            self.threads,
+            self.block_size,
+        )
+
+    @property
+    def parallel(self):
+        return self.codec == "deflate" and self.threads > 1
+
+    def _deflate_level(self):
+        if self.codec == "store":
+            return 0
+
+        return -1 if self.level is None else self.level
+
+    def _parallel_deflate(self):
+        return ParallelDeflate(self._deflate_level(), self.threads, self.block_size)
+
+    def zipfile(self, fileobj):
+        return zipfile.ZipFile(
+            fileobj, "w", CODECS[self.codec], compresslevel=self.level
+        )
+
+    def open_member(self, zf, name, force_zip64=False):
+        # force_zip64 is needed when the member may pass 2GB, its size is not
+        # known before it is written
+        member = zf.open(name, "w", force_zip64=force_zip64)
+        if self.parallel:
+            # ZipFile does not have a way to plug in a compressor, but it
+            # only calls compress() and flush() on the one it creates
+            member._compressor = self._parallel_deflate()
+
+        return member
+
+    def gzip_file(self, fileobj, filename=None):
+        """Return a writable binary gzip file on fileobj."""
+        # gzip's own default is 9 rather than zlib's 6
+        if self.level is None and self.codec != "store":
+            level = 9
+        else:
+            level = self._deflate_level()
+
+        if self.parallel:
+            raw = ParallelGzipFile(
+                fileobj,
+                filename,
+                ParallelDeflate(level, self.threads, self.block_size),
+            )
+            return io.BufferedWriter(raw, buffer_size=self.block_size)
+
+        return gzip.GzipFile(
+            filename=filename, mode="wb", fileobj=fileobj, compresslevel=level, mtime=0
+        )
+
+
+DEFAULT_COMPRESSION = Compression()
@@ -15,47 +15,115 @@
 # =========================================================================================
 
 import os
+import threading
+import time
+from collections.abc import Mapping
 from configparser import SafeConfigParser as ConfigParser
 
+# seconds between checks of the config file's modification time
+CHECK_INTERVAL = 5
+
+
+class ConfigSnapshot(Mapping):
+	"""
+	Read only view of the [global] section of the config file as it was
+	when it was loaded. A changed file produces a new snapshot, so values
+	derived from a snapshot can be cached on it.
+	"""
+
+	def __init__(self, values, mtime=None):
+		self._values = dict(values)
+		self.mtime = mtime
+		self._derived = {}
+
+	def __getitem__(self, key):
+		return self._values[key]
+
+	def __iter__(self):
+		return iter(self._values)
+
+	def __len__(self):
+		return len(self._values)
+
+	def __repr__(self):
+		return '<ConfigSnapshot %r>' % sorted(self._values)
+
+	def derived(self, key, fn):
+		"""Return fn(self), computed once for this snapshot."""
+		try:
+			return self._derived[key]
+		except KeyError:
+			# racing threads compute the same value, either result is fine
+			value = self._derived[key] = fn(self)
+			return value
+
+
+def _read(config_file):
+	mtime = os.path.getmtime(config_file)
+
+	cp = ConfigParser()
+	cp.read(config_file)
+
+	return ConfigSnapshot(cp.items('global'), mtime)
+
 
 class ConfigManager(object):
 	def __init__(self, config_file):
 		self._config_file = config_file
-		self.load()
-
-	def load(self):
-		self._changed = os.path.getmtime(self._config_file)
-
-		cp = ConfigParser()
-		cp.read(self._config_file)
+		self._lock = threading.Lock()
+		self.snapshot = _read(config_file)
+		self._checked = time.time()
 
-		self.config_dict = dict(cp.items('global'))
+	@property
+	def _changed(self):
+		return self.snapshot.mtime
 
 	def maybe_reload(self, config_file=None):
+		"""
+		Swap in a new snapshot if the config file changed. The file is only
+		checked once every CHECK_INTERVAL seconds. Returns True if reloaded.
+		"""
 		if config_file and config_file != self._config_file:
-			self._config_file = config_file
-			self.load()
-			return
+			with self._lock:
+				self._config_file = config_file
+				self.snapshot = _read(config_file)
+				self._checked = time.time()
+			return True
 
-		mtime = os.path.getmtime(self._config_file)
-		if self._changed != mtime:
-			self.load()
+		now = time.time()
+		if now - self._checked < CHECK_INTERVAL:
+			return False
+
+		with self._lock:
+			if now - self._checked < CHECK_INTERVAL:
+				return False
+
+			self._checked = now
+			if os.path.getmtime(self._config_file) == self.snapshot.mtime:
+				return False
+
+			self.snapshot = _read(self._config_file)
+			return True
 
 
 _config = None
+_config_lock = threading.Lock()
 
 
 def get_config(config_file, include_changed=False):
 	global _config
-	if not _config:
-		_config = ConfigManager(config_file)
-		changed = True
-	else:
-		before = _config._changed
-		_config.maybe_reload(config_file)
-		changed = _config._changed != before
+	if _config is None:
+		with _config_lock:
+			if _config is None:
+				_config = ConfigManager(config_file)
+				if include_changed:
+					return (_config.snapshot, True)
+
+				return _config.snapshot
+
+	changed = _config.maybe_reload(config_file)
 
 	if include_changed:
-		return (_config.config_dict.copy(), changed)
+		return (_config.snapshot, changed)
 
-	return _config.config_dict.copy()
+	return _config.snapshot
@@ -18,6 +18,18 @@ import pyodbc
 from pyramid.decorator import reify
 
 
+def _connection_string(config):
+    settings = [
+        ("Driver", config.get("driver", "ODBC Driver 17 for SQL Server")),
+        ("Server", config["server"]),
+        ("Database", config["database"]),
+        ("UID", config["uid"]),
+        ("PWD", config["pwd"]),
+    ]
+
+    return ";".join("%s={%s}" % x for x in settings)
+
+
 class ConnectionManager(object):
     def __init__(self, request):
         self.request = request
@@ -25,16 +37,8 @@ class ConnectionManager(object):
 
     @reify
     def connection_string(self):
-        config = self.config
-        settings = [
-            ("Driver", config.get("driver", "ODBC Driver 17 for SQL Server")),
-            ("Server", config["server"]),
-            ("Database", config["database"]),
-            ("UID", config["uid"]),
-            ("PWD", config["pwd"]),
-        ]
-
-        return ";".join("%s={%s}" % x for x in settings)
+        # built once per config snapshot rather than once per request
+        return self.config.derived("connection_string", _connection_string)
 
     def get_connection(self, language=None):
         if not language:
@@ -46,3 +50,17 @@ class ConnectionManager(object):
         conn.execute("SET LANGUAGE '" + language + "'")
 
         return conn
+
+
+class ConfigConnectionManager(ConnectionManager):
+    """Connection manager for command line scripts that have no request."""
+
+    def __init__(self, config, language="English"):
+        self.request = None
+        self.config = config
+        self.language = language
+
+    def get_connection(self, language=None):
+        return super(ConfigConnectionManager, self).get_connection(
+            language or self.language
+        )
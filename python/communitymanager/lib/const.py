@@ -37,11 +37,12 @@ _app_path = None
 _config_file = None
 _app_name = None
 publish_dir = None
+external_cache_dir = None
 
 
 def update_cache_values():
     # called from application init at startup
-    global _app_path, _config_file, _app_name, publish_dir
+    global _app_path, _config_file, _app_name, publish_dir, external_cache_dir
 
     if _app_path is None:
         _app_path = os.path.normpath(
@@ -50,8 +51,10 @@ def update_cache_values():
         _app_name = os.path.split(_app_path)[1]
         _config_file = os.path.join(_app_path, "..", "..", "config", _app_name + ".ini")
         publish_dir = os.path.join(_app_path, "python", "published_files")
+        external_cache_dir = os.path.join(_app_path, "python", "external_cache")
 
-        try:
-            os.makedirs(publish_dir)
-        except os.error:
-            pass
+        for path in (publish_dir, external_cache_dir):
+            try:
+                os.makedirs(path)
+            except os.error:
+                pass
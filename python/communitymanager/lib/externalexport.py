@@ -0,0 +1,308 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# std lib
+from datetime import datetime
+import hashlib
+import json
+import os
+import re
+import tempfile
+from xml.sax.saxutils import quoteattr
+
+# 3rd party
+from pyramid.httpexceptions import HTTPNotModified
+from pyramid.response import Response
+
+# this app
+from communitymanager.lib import const
+from communitymanager.lib.compression import DEFAULT_COMPRESSION
+from communitymanager.lib.fileresponse import file_response
+
+import logging
+
+log = logging.getLogger("communitymanager.lib.externalexport")
+
+_root_names = [
+    "SystemCode",
+    "SystemName",
+    "CopyrightHolder1",
+    "CopyrightHolder2",
+    "ContactEmail",
+]
+
+_unsafe_filename_chars = re.compile(r"[^A-Za-z0-9_\-]")
+
+
+def safe_filename(system_code):
+    return _unsafe_filename_chars.sub("_", system_code)
+
+
+def root_parameters(external_system, date=None):
+    """Return the ExternalSystem root attributes and the xml file name"""
+    if date is None:
+        date = datetime.now()
+
+    names = list(_root_names)
+    values = [getattr(external_system, x) for x in names]
+
+    isodate = date.replace(microsecond=0).isoformat()
+    names.append("date")
+    values.append(isodate)
+
+    isodate = isodate.replace(":", "-")
+
+    values = [quoteattr(str(x) if x is not None else "") for x in values]
+    params = " ".join("=".join(x) for x in zip(names, values))
+
+    fname = "CommunityMap-%s-%s.xml" % (external_system.SystemCode, isodate)
+
+    return params, fname
+
+
+def write_xml_data(root_parameters, cursor, zipfile, fname, compression=None):
+    """
+    Write the sp_External_Community_l_xml result sets into zipfile as fname.
+
+    This is a generator that yields after every batch of rows so callers
+    that stream the archive can pass on what has been written so far.
+    """
+    if compression is None:
+        compression = DEFAULT_COMPRESSION
+
+    with compression.open_member(zipfile, fname) as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n'.encode("utf-8"))
+        file.write(("<ExternalSystem %s>\n" % root_parameters).encode("utf-8"))
+
+        for nextset, tagname in enumerate(["ExternalCommunities", "CommunityMapping"]):
+            if nextset:
+                cursor.nextset()
+
+            file.write(("<%s>" % tagname).encode("utf-8"))
+
+            while True:
+                rows = cursor.fetchmany(2000)
+                if not rows:
+                    break
+
+                rows = "\n".join(x[0] for x in rows) + "\n"
+                file.write(rows.encode("utf-8"))
+                yield
+
+            file.write(("</%s>" % tagname).encode("utf-8"))
+
+        file.write("</ExternalSystem>\n".encode("utf-8"))
+
+    yield
+
+
+def write_archive(conn, external_system, fileobj, date=None, compression=None):
+    """
+    Write the complete mapping archive for external_system to fileobj.
+    Returns the name of the xml file inside the archive.
+    """
+    if compression is None:
+        compression = DEFAULT_COMPRESSION
+
+    params, fname = root_parameters(external_system, date)
+
+    with compression.zipfile(fileobj) as zf:
+        cursor = conn.execute(
+            "EXEC sp_External_Community_l_xml ?", external_system.SystemCode
+        )
+
+        for _ in write_xml_data(params, cursor, zf, fname, compression):
+            pass
+
+        cursor.close()
+
+    return fname
+
+
+def watermark_etag(system_code, watermark):
+    value = "|".join(str(x) for x in (system_code,) + tuple(watermark))
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+
+class ExportCache(object):
+    """
+    On-disk cache of the most recent mapping archive for each external
+    system, stored alongside a small json file describing it.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _paths(self, system_code):
+        base = os.path.join(self.cache_dir, safe_filename(system_code))
+        return base + ".zip", base + ".json"
+
+    def lookup(self, system_code, etag):
+        zip_path, meta_path = self._paths(system_code)
+        try:
+            with open(meta_path, "rb") as f:
+                meta = json.loads(f.read().decode("utf-8"))
+        except (OSError, ValueError):
+            return None, None
+
+        if meta.get("etag") != etag or not os.path.exists(zip_path):
+            return None, None
+
+        return zip_path, meta
+
+    def open_temp(self):
+        fd, tmpname = tempfile.mkstemp(
+            prefix=".external-", suffix=".tmp", dir=self.cache_dir
+        )
+        return os.fdopen(fd, "wb"), tmpname
+
+    def commit(self, system_code, tmpname, meta):
+        zip_path, meta_path = self._paths(system_code)
+
+        os.replace(tmpname, zip_path)
+
+        fd, meta_tmpname = tempfile.mkstemp(
+            prefix=".external-", suffix=".tmp", dir=self.cache_dir
+        )
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(meta).encode("utf-8"))
+
+        os.replace(meta_tmpname, meta_path)
+
+
+class _StreamSink(object):
+    """
+    Write-only, unseekable file for zipfile that keeps the written bytes
+    for the response and copies them into the cache file.
+    """
+
+    def __init__(self, cachefile):
+        self.cachefile = cachefile
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.cachefile.write(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _generate_export(request, external_system, cache, etag, compression):
+    system_code = external_system.SystemCode
+    params, fname = root_parameters(external_system)
+
+    cachefile, tmpname = cache.open_temp()
+    committed = False
+    try:
+        sink = _StreamSink(cachefile)
+        with compression.zipfile(sink) as zf:
+            with request.connmgr.get_connection() as conn:
+                cursor = conn.execute("EXEC sp_External_Community_l_xml ?", system_code)
+
+                for _ in write_xml_data(params, cursor, zf, fname, compression):
+                    data = sink.pop()
+                    if data:
+                        yield data
+
+                cursor.close()
+
+        yield sink.pop()
+
+        cachefile.close()
+        cache.commit(
+            system_code,
+            tmpname,
+            {"etag": etag, "filename": fname[:-4] + ".zip", "size": sink.position},
+        )
+        committed = True
+
+    finally:
+        if not committed:
+            cachefile.close()
+            try:
+                os.unlink(tmpname)
+            except OSError:
+                pass
+
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = ExportCache(const.external_cache_dir)
+
+    return _cache
+
+
+def export_response(request, external_system, watermark, compression=None):
+    """
+    Respond with the mapping archive for external_system.
+
+    The archive is served from the cache when watermark (the row returned by
+    sp_External_Community_s_Watermark) is unchanged since it was built.
+    Otherwise it is streamed to the client while it is generated and saved
+    to the cache as it goes. The ETag is derived from the watermark, so it
+    is known up front and clients can revalidate without regenerating.
+    """
+    if compression is None:
+        compression = DEFAULT_COMPRESSION
+
+    system_code = external_system.SystemCode
+    cache = get_cache()
+    etag = watermark_etag(system_code, watermark)
+
+    # the embedded generation date differs between rebuilds, so the tag is weak
+    etag_header = 'W/"%s"' % etag
+
+    if etag in request.if_none_match:
+        res = HTTPNotModified()
+        res.headers["ETag"] = etag_header
+        return res
+
+    zip_path, meta = cache.lookup(system_code, etag)
+    if meta is not None:
+        res = file_response(request, zip_path, meta["filename"])
+
+    else:
+        log.debug("Generating external community export: %s", system_code)
+        fname = root_parameters(external_system)[1]
+        res = Response(
+            content_type="application/zip",
+            app_iter=_generate_export(
+                request, external_system, cache, etag, compression
+            ),
+        )
+        res.charset = None
+        res.headers["Content-Disposition"] = "attachment;filename=%s.zip" % fname[:-4]
+
+    res.headers["ETag"] = etag_header
+    res.cache_control.no_cache = True
+    return res
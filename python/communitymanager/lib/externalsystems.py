@@ -0,0 +1,102 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# std lib
+import threading
+import time
+
+import logging
+
+log = logging.getLogger("communitymanager.lib.externalsystems")
+
+# seconds between checks of the External_System watermark
+CHECK_INTERVAL = 60
+
+
+def _key(system_code):
+    # SystemCode uses a case insensitive collation
+    return system_code.casefold()
+
+
+class ExternalSystemRegistry(object):
+    """
+    In memory copy of the External_System table.
+
+    At most once every CHECK_INTERVAL seconds a cheap watermark query is run
+    and the systems are only fetched again when it changed. In between,
+    looking up a system or listing them does not touch the database.
+    """
+
+    def __init__(self, check_interval=CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._watermark = None
+        self._checked = 0
+        self._systems = []
+        self._by_code = {}
+
+    def _refresh(self, request):
+        if time.time() - self._checked < self.check_interval:
+            return
+
+        with self._lock:
+            now = time.time()
+            if now - self._checked < self.check_interval:
+                return
+
+            with request.connmgr.get_connection() as conn:
+                if self._watermark is not None:
+                    cursor = conn.execute("EXEC sp_External_System_s_Watermark")
+                    watermark = tuple(cursor.fetchone())
+                    cursor.close()
+
+                    if watermark == self._watermark:
+                        self._checked = now
+                        return
+
+                log.debug("Loading external systems")
+                cursor = conn.execute("EXEC sp_External_System_l_Registry")
+                watermark = tuple(cursor.fetchone())
+
+                cursor.nextset()
+
+                systems = cursor.fetchall()
+
+                cursor.close()
+
+            by_code = {_key(x.SystemCode): x for x in systems}
+            self._systems, self._by_code = systems, by_code
+            self._watermark = watermark
+            self._checked = now
+
+    def get(self, request, system_code):
+        """Return the External_System row for system_code or None."""
+        self._refresh(request)
+        return self._by_code.get(_key(system_code))
+
+    def list(self, request):
+        """Return every External_System row, ordered by SystemName."""
+        self._refresh(request)
+        return self._systems
+
+    def invalidate(self):
+        """Fetch the systems again on next use, call after changing them."""
+        with self._lock:
+            self._watermark = None
+            self._checked = 0
+
+
+registry = ExternalSystemRegistry()
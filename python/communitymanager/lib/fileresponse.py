@@ -0,0 +1,65 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# std lib
+import os
+
+# 3rd party
+from pyramid.response import Response
+from webob.static import FileIter
+
+BLOCK_SIZE = 1 << 16
+
+# one year, the longest lifetime caches are expected to honour
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def file_response(
+    request, path, filename, content_type="application/zip", etag=None, immutable=False
+):
+    """
+    Serve the file at path as an attachment.
+
+    Whole-file GETs use the server's wsgi.file_wrapper (sendfile) when it is
+    available. Range requests use a seekable iterator so that webob's
+    conditional response handling can answer with 206 without reading the
+    skipped part of the file. If-None-Match / If-Modified-Since are answered
+    with 304 by webob as well.
+    """
+    st = os.stat(path)
+    f = open(path, "rb")
+
+    res = Response(content_type=content_type, conditional_response=True)
+    res.charset = None
+
+    file_wrapper = request.environ.get("wsgi.file_wrapper")
+    if file_wrapper is not None and request.range is None:
+        res.app_iter = file_wrapper(f, BLOCK_SIZE)
+    else:
+        res.app_iter = FileIter(f)
+
+    res.content_length = st.st_size
+    res.last_modified = st.st_mtime
+    res.accept_ranges = "bytes"
+
+    if etag:
+        res.etag = etag
+
+    if immutable:
+        res.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+
+    res.headers["Content-Disposition"] = "attachment;filename=%s" % filename
+    return res
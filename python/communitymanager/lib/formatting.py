@@ -0,0 +1,121 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# Python STD Lib
+from datetime import date, datetime, time
+
+# 3rd party libs
+from babel import Locale, dates
+
+locale_date_format = {
+    "en-CA": "d MMM yyyy",
+    "fr-CA": "d MMM yyyy",
+    "de": "dd.MM.yyyy",
+    "fr": "d MMM yyyy",
+    "es-MX": "MM/dd/yyyy",
+    "it": "d MMM yyyy",
+    "nl": "d MMM yyyy",
+    "no": "d MMM yyyy",
+    "pt": "d-MM-yyyy",
+    "sv": "d MMM yyyy",
+    "hu": "MMM d. yyyy",
+    "pl": "d MMM yyyy",
+    "ro": "d MMM yyyy",
+    "hr": "d MMM yyyy",
+    "sk": "dd.MM.yyyy",
+    "sl": "d MMM yyyy",
+    "el": "dd/MM/yyyy",
+    "bg": "d MMM yyyy",
+    "ru": "d MMM yyyy",
+    "tr": "d MMM yyyy",
+    "lv": "d MMM yyyy",
+    "lt": "d MMM yyyy",
+    "zh-TW": "yyyy/MM/dd",
+    "ko": "yyyy/MM/dd",
+    "zh-CN": "yyyy/MM/dd",
+    "th": "d MMM yyyy",
+}
+
+
+class CultureFormatter(object):
+    """
+    Date and time formatting for one culture with the babel Locale and the
+    date/time patterns parsed once, so formatting a value only applies the
+    compiled pattern.
+    """
+
+    def __init__(self, culture):
+        self.culture = culture
+        self.locale = Locale.parse(culture, sep="-")
+
+        date_format = locale_date_format.get(culture)
+        if date_format:
+            self.date_pattern = dates.parse_pattern(date_format)
+        else:
+            self.date_pattern = dates.get_date_format("medium", locale=self.locale)
+
+        self.time_pattern = dates.get_time_format("medium", locale=self.locale)
+
+    def format_date(self, d):
+        if d is None:
+            return ""
+        if not isinstance(d, (date, datetime)):
+            return d
+
+        if isinstance(d, datetime):
+            d = d.date()
+
+        return self.date_pattern.apply(d, self.locale)
+
+    def format_time(self, t):
+        if t is None:
+            return ""
+        if not isinstance(t, (datetime, time)):
+            return t
+
+        # babel keeps the wall clock time of naive values
+        if isinstance(t, datetime):
+            t = t.timetz()
+
+        return self.time_pattern.apply(t, self.locale)
+
+    def format_datetime(self, dt):
+        if dt is None:
+            return ""
+        if not isinstance(dt, (date, datetime, time)):
+            return dt
+
+        parts = []
+
+        if isinstance(dt, (date, datetime)):
+            parts.append(self.format_date(dt))
+
+        if isinstance(dt, (datetime, time)):
+            parts.append(self.format_time(dt))
+
+        return " ".join(parts)
+
+
+_formatters = {}
+
+
+def get_formatter(culture):
+    try:
+        return _formatters[culture]
+    except KeyError:
+        # a formatter built twice by racing threads is harmless
+        formatter = _formatters[culture] = CultureFormatter(culture)
+        return formatter
@@ -0,0 +1,61 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+"""
+Decoders for the list columns stored procedures return, either
+FOR XML AUTO fragments (<Name CM_ID="1" Name="x"/><Name .../>) or
+FOR JSON PATH arrays ([{"CM_ID":1,"Name":"x"},...]).
+"""
+
+# std lib
+import json
+from xml.etree import ElementTree as ET
+
+
+def xml_to_dict_list(text):
+    """
+    Return the attributes of each element of a FOR XML AUTO fragment as a
+    list of dicts.
+    """
+    if not text:
+        return []
+
+    root = ET.fromstring(b"<root>" + text.encode("utf8") + b"</root>")
+
+    return [el.attrib for el in root]
+
+
+def json_to_dict_list(text):
+    """
+    Return the objects of a FOR JSON PATH array as a list of dicts. Unlike
+    XML attributes, values keep their JSON types, so an int column is an int
+    rather than a str.
+    """
+    if not text:
+        return []
+
+    return json.loads(text)
+
+
+def to_dict_list(text):
+    """Decode a list column returned either FOR XML AUTO or FOR JSON PATH."""
+    if not text:
+        return []
+
+    if text[0] == "[":
+        return json_to_dict_list(text)
+
+    return xml_to_dict_list(text)
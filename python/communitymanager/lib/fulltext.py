@@ -0,0 +1,46 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+"""
+Search conditions for the CONTAINS predicates used by the community name
+procedures when the CommunityNames full-text catalog is installed.
+"""
+
+# std lib
+import re
+
+# CONTAINS rejects conditions with too many terms, and a name never needs
+# more than a handful of words to narrow it down
+MAX_TERMS = 8
+
+_word_re = re.compile(r"\w+", re.UNICODE)
+
+
+def contains_condition(terms):
+    """
+    Return a CONTAINS search condition matching names with a word starting
+    with each word of terms, e.g. 'st marie' gives '"st*" AND "marie*"'.
+
+    Only the letters and digits of the terms are kept, so the condition
+    cannot contain quotes, operators or other CONTAINS syntax. None is
+    returned when nothing is left, in which case the procedures fall back
+    to LIKE.
+    """
+    words = _word_re.findall(terms or "")[:MAX_TERMS]
+    if not words:
+        return None
+
+    return " AND ".join('"%s*"' % word for word in words)
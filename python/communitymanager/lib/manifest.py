@@ -0,0 +1,218 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# std lib
+from collections import namedtuple
+import hashlib
+import json
+import os
+import threading
+
+# 3rd party
+import isodate
+
+# this app
+from communitymanager.lib.storage import get_storage
+
+import logging
+
+log = logging.getLogger("communitymanager.lib.manifest")
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+_entry_fields = "filename date size sha256 rows first_hst_id last_hst_id outputs"
+PublishedFile = namedtuple("PublishedFile", _entry_fields)
+
+# one file per format produced by a publish, the xml output is the entry itself
+PublishedOutput = namedtuple("PublishedOutput", "format filename size sha256")
+
+
+def find_output(entry, format):
+    for output in entry.outputs:
+        if output.format == format:
+            return output
+
+    return None
+
+
+def file_sha256(path, blocksize=1 << 16):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(blocksize), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def date_from_filename(filename):
+    return isodate.parse_datetime(filename.rsplit(".", 2)[0].replace("_", ":"))
+
+
+def _entry_to_json(entry):
+    value = entry._asdict()
+    value["date"] = entry.date.isoformat()
+    value["outputs"] = [x._asdict() for x in entry.outputs]
+    return value
+
+
+def _entry_from_json(value):
+    value = dict(value)
+    value["date"] = isodate.parse_datetime(value["date"])
+    value.setdefault("rows", {})
+    value.setdefault("first_hst_id", None)
+    value.setdefault("last_hst_id", None)
+
+    outputs = value.get("outputs")
+    if outputs:
+        value["outputs"] = [PublishedOutput(**x) for x in outputs]
+    else:
+        value["outputs"] = [
+            PublishedOutput("xml", value["filename"], value["size"], value["sha256"])
+        ]
+
+    return PublishedFile(**{k: value.get(k) for k in PublishedFile._fields})
+
+
+class Manifest(object):
+    """
+    Index of the published download files, kept in the publish storage.
+
+    The parsed manifest is held in memory and only re-read when the file's
+    mtime or size changes, so listing files and resolving the latest file do
+    not touch the published files themselves.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._files = []
+        self._by_name = {}
+
+    def _stat(self):
+        return self.storage.meta_stamp(MANIFEST_NAME)
+
+    def _load(self, locked=False):
+        stamp = self._stat()
+        if stamp is None:
+            if not locked:
+                # another process may write the manifest while we wait for
+                # the lock, so check again once we hold it
+                with self.storage.lock():
+                    self._load(locked=True)
+                return
+
+            self._rebuild()
+            return
+
+        if stamp == self._stamp:
+            return
+
+        data = json.loads(self.storage.read_meta(MANIFEST_NAME).decode("utf-8"))
+
+        files = [_entry_from_json(x) for x in data.get("files", [])]
+        self._set_files(files, stamp)
+
+    def _set_files(self, files, stamp):
+        files = sorted(files, key=lambda x: x.date, reverse=True)
+        by_name = {o.filename: (x, o) for x in files for o in x.outputs}
+
+        # swap in the new values in one go for readers not holding the lock
+        self._files, self._by_name, self._stamp = files, by_name, stamp
+
+    def _rebuild(self):
+        # one time migration for publish directories that predate the manifest
+        log.info("Building download manifest for %r", self.storage)
+        files = []
+        for filename in self.storage.legacy_files("*.xml.zip"):
+            path = self.storage.path(filename)
+            try:
+                date = date_from_filename(filename)
+            except (ValueError, isodate.ISO8601Error):
+                log.warning("Skipping unrecognized published file: %s", filename)
+                continue
+
+            size = os.stat(path).st_size
+            sha256 = file_sha256(path)
+            files.append(
+                PublishedFile(
+                    filename=filename,
+                    date=date,
+                    size=size,
+                    sha256=sha256,
+                    rows={},
+                    first_hst_id=None,
+                    last_hst_id=None,
+                    outputs=[PublishedOutput("xml", filename, size, sha256)],
+                )
+            )
+
+        self._write(files)
+
+    def _write(self, files):
+        files = sorted(files, key=lambda x: x.date, reverse=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "files": [_entry_to_json(x) for x in files],
+        }
+
+        self.storage.write_meta(
+            MANIFEST_NAME, json.dumps(data, indent=1).encode("utf-8")
+        )
+
+        self._set_files(files, self._stat())
+
+    def files(self):
+        """Return published files, newest first."""
+        with self._lock:
+            self._load()
+
+        return self._files
+
+    def latest(self):
+        files = self.files()
+        return files[0] if files else None
+
+    def get(self, filename):
+        """Return (entry, output) for any published filename, or (None, None)."""
+        with self._lock:
+            self._load()
+
+        return self._by_name.get(filename, (None, None))
+
+    def add(self, entry):
+        # other processes or app nodes may be publishing to the same storage
+        with self._lock, self.storage.lock():
+            self._load(locked=True)
+
+            files = [x for x in self._files if x.filename != entry.filename]
+            files.append(entry)
+            self._write(files)
+
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest():
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                _manifest = Manifest(get_storage())
+
+    return _manifest
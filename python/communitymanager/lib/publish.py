@@ -0,0 +1,514 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# std lib
+import csv
+import io
+import json
+import os
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+# this app
+from communitymanager.lib.compression import DEFAULT_COMPRESSION
+from communitymanager.lib.manifest import PublishedFile, PublishedOutput, file_sha256
+
+import logging
+
+log = logging.getLogger("communitymanager.lib.publish")
+
+LICENSE_URL = "https://creativecommons.org/licenses/by/4.0/"
+
+XML_HEADER = """\
+<?xml version="1.0" encoding="UTF-8"?><community_information source=%s>
+<!--
+    All user geography data contributed to the CIOC Community Repository is cc-by 4.0 licensed.
+    For details of the license see: https://creativecommons.org/licenses/by/4.0/
+
+    Our cc-by 4.0 licensing, while intentionally permissive, does *require attribution*:
+
+    "Attribution - You must give appropriate credit, provide a link to the
+            license, and indicate if changes were made. You may do so in any
+            reasonable manner, but not in any way that suggests the licensor
+            endorses you or your use."
+
+    Specifically the attribution requirements are as follows:
+
+      1.  Visually display or otherwise indicate the source of the content as
+          coming from the CIOC Community Repository. This requirement is
+          satisfied with a discreet text blurb, or some other unobtrusive but
+          clear visual indication.
+
+      2.  Ensure that any Internet use of the content includes a hyperlink directly
+          to the CIOC Community Repository (https://community-repository.cioc.ca/) in
+          standard HTML (i.e. not through a Tinyurl or other such indirect hyperlink,
+          form of obfuscation or redirection), without any "nofollow" command or any
+          other such means of avoiding detection by search engines, and visible even
+          with JavaScript disabled.
+
+    Change suggestions can be submitted to https://community-repository.cioc.ca/suggest.
+-->
+            """
+
+XML_FOOTER = "</community_information>"
+
+# format name, filename extension, content type
+OUTPUT_FORMATS = [
+    ("xml", ".xml.zip", "application/zip"),
+    ("json", ".json.gz", "application/gzip"),
+    ("ndjson", ".ndjson.gz", "application/gzip"),
+    ("csv", ".csv.gz", "application/gzip"),
+]
+
+FORMAT_EXTENSIONS = {fmt: ext for fmt, ext, content_type in OUTPUT_FORMATS}
+CONTENT_TYPES = {ext: content_type for fmt, ext, content_type in OUTPUT_FORMATS}
+
+# record element -> section it belongs to, in document order
+RECORD_SECTIONS = [
+    ("province_state", "province_states"),
+    ("community", "communities"),
+    ("alt_search_area", "alt_search_areas"),
+]
+_record_tags = dict(RECORD_SECTIONS)
+
+# The stats, cultures and export are read in one transaction so the published
+# file is consistent. Snapshot isolation does not block saves while the export
+# streams; without it the read is SERIALIZABLE, which holds saves until the
+# publish finishes.
+_publish_sql = """
+    IF EXISTS(SELECT * FROM sys.databases WHERE database_id=DB_ID() AND snapshot_isolation_state=1)
+        SET TRANSACTION ISOLATION LEVEL SNAPSHOT
+    ELSE
+        SET TRANSACTION ISOLATION LEVEL SERIALIZABLE
+
+    BEGIN TRANSACTION
+
+    SELECT GETDATE() AS currentdate, (SELECT MAX(HST_ID) FROM dbo.Community_ChangeHistory) AS last_hst_id
+    SELECT Culture FROM dbo.Language ORDER BY LangID
+    EXEC dbo.sp_Community_l_xml
+"""
+
+# the connection may go back to a pool, so leave it as it was
+_publish_end_sql = """
+    IF @@TRANCOUNT > 0 COMMIT TRANSACTION
+    SET TRANSACTION ISOLATION LEVEL READ COMMITTED
+"""
+
+# rows fetched from each sp_Community_l_xml result set at a time
+FETCH_SIZE = 2000
+
+_changes_sql = """
+    SELECT MAX(HST_ID) AS last_hst_id, MAX(MODIFIED_DATE) AS last_modified
+    FROM dbo.Community_ChangeHistory
+"""
+
+
+def format_for_filename(filename):
+    for fmt, ext, content_type in OUTPUT_FORMATS:
+        if filename.endswith(ext):
+            return fmt
+
+    return None
+
+
+def _int_or_none(value):
+    if value is None or value == "":
+        return None
+
+    return int(value)
+
+
+def _culture_values(el, tag):
+    container = el.find(tag)
+    if container is None:
+        return []
+
+    return [(x.get("culture"), x.get("value")) for x in container]
+
+
+def element_to_record(el):
+    """Convert one record element from the XML export to a plain dict"""
+    if el.tag == "province_state":
+        return {
+            "id": _int_or_none(el.get("id")),
+            "name_or_code": el.get("name_or_code"),
+            "country": el.get("country"),
+            "names": dict(_culture_values(el, "names")),
+        }
+
+    record = {
+        "id": _int_or_none(el.get("id")),
+        "parent_id": _int_or_none(el.get("parent_id")),
+        "guid": el.get("guid"),
+        "created_date": el.get("created_date"),
+        "modified_date": el.get("modified_date"),
+    }
+
+    if el.tag == "community":
+        record["prov_state"] = _int_or_none(el.get("prov_state"))
+
+    record["names"] = dict(_culture_values(el, "names"))
+    record["alt_names"] = [
+        {"culture": culture, "value": value}
+        for culture, value in _culture_values(el, "alt_names")
+    ]
+
+    if el.tag == "alt_search_area":
+        search_areas = el.find("search_areas")
+        record["search_areas"] = (
+            [int(x.get("value")) for x in search_areas]
+            if search_areas is not None
+            else []
+        )
+
+    return record
+
+
+class _Output(object):
+    """A published file being written to a temporary file in the storage."""
+
+    format = None
+
+    def __init__(self, storage, stamp, compression):
+        self.storage = storage
+        self.stamp = stamp
+        self.compression = compression
+        self.filename = stamp + FORMAT_EXTENSIONS[self.format]
+        self.file, self.tmpname = storage.open_temp()
+
+    def start(self, context):
+        pass
+
+    def write_xml(self, text):
+        pass
+
+    def record(self, section, record):
+        pass
+
+    def finish(self):
+        self.file.close()
+
+    def commit(self):
+        size = os.path.getsize(self.tmpname)
+        sha256 = file_sha256(self.tmpname)
+        self.storage.commit(self.tmpname, self.filename, sha256)
+        return PublishedOutput(
+            format=self.format, filename=self.filename, size=size, sha256=sha256
+        )
+
+    def discard(self):
+        try:
+            self.file.close()
+        except Exception:
+            pass
+
+        self.storage.discard(self.tmpname)
+
+
+class _TextOutput(_Output):
+    def __init__(self, storage, stamp, compression):
+        super(_TextOutput, self).__init__(storage, stamp, compression)
+        self.gzfile = compression.gzip_file(self.file, self.filename[:-3])
+        self.text = io.TextIOWrapper(self.gzfile, encoding="utf-8", newline="")
+
+    def finish(self):
+        self.text.close()
+        super(_TextOutput, self).finish()
+
+
+class XmlOutput(_Output):
+    format = "xml"
+
+    def __init__(self, storage, stamp, compression):
+        super(XmlOutput, self).__init__(storage, stamp, compression)
+        self.zipfile = compression.zipfile(self.file)
+        self.member = compression.open_member(
+            self.zipfile, self.filename[:-4], force_zip64=True
+        )
+
+    def start(self, context):
+        self.member.write((XML_HEADER % quoteattr(context["source"])).encode("utf-8"))
+
+    def write_xml(self, text):
+        self.member.write(text.encode("utf-8"))
+
+    def finish(self):
+        self.member.write(XML_FOOTER.encode("utf-8"))
+        self.member.close()
+        self.zipfile.close()
+        super(XmlOutput, self).finish()
+
+
+class JsonOutput(_TextOutput):
+    format = "json"
+
+    def start(self, context):
+        self._section = None
+        self._pending = [x[1] for x in RECORD_SECTIONS]
+        self._first = True
+
+        head = json.dumps(
+            {
+                "source": context["source"],
+                "date": context["date"].isoformat(),
+                "license": LICENSE_URL,
+            }
+        )
+        # leave the object open so the sections can be streamed in
+        self.text.write(head[:-1])
+
+    def _open_section(self, section):
+        while self._pending:
+            name = self._pending.pop(0)
+            if self._section is not None:
+                self.text.write("\n]")
+
+            self.text.write(',\n"%s": [' % name)
+            self._section = name
+            self._first = True
+            if name == section:
+                return
+
+    def record(self, section, record):
+        if section != self._section:
+            self._open_section(section)
+
+        self.text.write("\n" if self._first else ",\n")
+        self._first = False
+        self.text.write(json.dumps(record, ensure_ascii=False))
+
+    def finish(self):
+        self._open_section(None)
+        if self._section is not None:
+            self.text.write("\n]")
+        self.text.write("}\n")
+        super(JsonOutput, self).finish()
+
+
+class NdjsonOutput(_TextOutput):
+    format = "ndjson"
+
+    _types = {section: tag for tag, section in RECORD_SECTIONS}
+
+    def record(self, section, record):
+        line = dict(record, type=self._types[section])
+        self.text.write(json.dumps(line, ensure_ascii=False))
+        self.text.write("\n")
+
+
+class CsvOutput(_TextOutput):
+    format = "csv"
+
+    def start(self, context):
+        self.cultures = context["cultures"]
+        self.writer = csv.writer(self.text)
+        self.writer.writerow(
+            [
+                "id",
+                "parent_id",
+                "guid",
+                "alternative_area",
+                "prov_state",
+                "created_date",
+                "modified_date",
+            ]
+            + ["name_" + x for x in self.cultures]
+        )
+
+    def record(self, section, record):
+        if section == "province_states":
+            return
+
+        names = record["names"]
+        self.writer.writerow(
+            [
+                record["id"],
+                record["parent_id"],
+                record["guid"],
+                int(section == "alt_search_areas"),
+                record.get("prov_state"),
+                record["created_date"],
+                record["modified_date"],
+            ]
+            + [names.get(x) for x in self.cultures]
+        )
+
+
+OUTPUT_CLASSES = [XmlOutput, JsonOutput, NdjsonOutput, CsvOutput]
+
+
+class RecordParser(object):
+    """
+    Incrementally parse the XML export and hand each record element to the
+    callback as soon as it is complete, so every output is produced from a
+    single pass over the data without building the whole document.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.parser = ET.XMLPullParser(events=("end",))
+        # the export is a sequence of sections, give it a single root
+        self.parser.feed("<root>")
+
+    def _drain(self):
+        for event, el in self.parser.read_events():
+            section = _record_tags.get(el.tag)
+            if section is None:
+                continue
+
+            self.callback(section, element_to_record(el))
+            el.clear()
+
+    def feed(self, text):
+        self.parser.feed(text)
+        self._drain()
+
+    def close(self):
+        self.parser.feed("</root>")
+        self._drain()
+        self.parser.close()
+
+
+def _export_chunks(cursor):
+    """
+    Yield the XML export from the sp_Community_l_xml result sets, one batch
+    of record elements at a time, wrapped in their section elements.
+    """
+    for i, (tag, section) in enumerate(RECORD_SECTIONS):
+        if i:
+            cursor.nextset()
+
+        yield "<%s>" % section
+
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+
+            yield "".join(x.row for x in rows)
+
+        yield "</%s>" % section
+
+
+def publish_repository(conn, manifest, source, compression=None):
+    """
+    Export the repository from the database into every output format and
+    record the result in the manifest. Returns the new manifest entry.
+    """
+    if compression is None:
+        compression = DEFAULT_COMPRESSION
+
+    storage = manifest.storage
+
+    try:
+        cursor = conn.execute(_publish_sql)
+    except Exception:
+        conn.execute(_publish_end_sql)
+        raise
+
+    counts = {section: 0 for tag, section in RECORD_SECTIONS}
+
+    outputs = []
+    try:
+        stats = cursor.fetchone()
+
+        cursor.nextset()
+
+        cultures = [x.Culture for x in cursor.fetchall()]
+
+        cursor.nextset()
+
+        date = stats.currentdate
+        stamp = date.isoformat().replace(":", "_")
+
+        context = {"source": source, "date": date, "cultures": cultures}
+
+        for cls in OUTPUT_CLASSES:
+            outputs.append(cls(storage, stamp, compression))
+
+        for output in outputs:
+            output.start(context)
+
+        def on_record(section, record):
+            counts[section] += 1
+            for output in outputs:
+                output.record(section, record)
+
+        parser = RecordParser(on_record)
+        for chunk in _export_chunks(cursor):
+            for output in outputs:
+                output.write_xml(chunk)
+
+            parser.feed(chunk)
+
+        parser.close()
+
+        for output in outputs:
+            output.finish()
+
+        published = [x.commit() for x in outputs]
+
+    except Exception:
+        for output in outputs:
+            output.discard()
+        raise
+
+    finally:
+        cursor.close()
+        conn.execute(_publish_end_sql)
+
+    log.debug("published %s: %r", stamp, counts)
+
+    previous = manifest.latest()
+    first_hst_id = None
+    if previous is not None and previous.last_hst_id is not None:
+        first_hst_id = previous.last_hst_id + 1
+
+    xml = published[0]
+    entry = PublishedFile(
+        filename=xml.filename,
+        date=date,
+        size=xml.size,
+        sha256=xml.sha256,
+        rows=counts,
+        first_hst_id=first_hst_id,
+        last_hst_id=stats.last_hst_id,
+        outputs=published,
+    )
+    manifest.add(entry)
+
+    return entry
+
+
+def has_changes(conn, manifest):
+    """
+    Return True if communities have changed since the latest published file.
+    """
+    latest = manifest.latest()
+    if latest is None:
+        return True
+
+    cursor = conn.execute(_changes_sql)
+    stats = cursor.fetchone()
+    cursor.close()
+
+    if stats.last_hst_id is None:
+        return False
+
+    if latest.last_hst_id is not None:
+        return stats.last_hst_id > latest.last_hst_id
+
+    return stats.last_modified > latest.date
@@ -0,0 +1,69 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# this app
+from communitymanager.lib.cache import LanguageCache
+
+
+def _load_province_states(conn):
+    cursor = conn.execute(
+        "SELECT ProvID, ProvinceStateCountry FROM dbo.vw_ProvinceStateCountry ORDER BY DisplayOrder, ProvinceStateCountry"
+    )
+    prov_state = list(map(tuple, cursor.fetchall()))
+    cursor.close()
+
+    return prov_state
+
+
+def _load_external_form_lists(conn):
+    cursor = conn.execute("EXEC sp_External_Community_s_FormLists")
+
+    area_types = cursor.fetchall()
+
+    cursor.nextset()
+
+    prov_state = cursor.fetchall()
+
+    cursor.nextset()
+
+    airs_export_types = cursor.fetchall()
+
+    cursor.close()
+
+    return {
+        "area_types": list(map(tuple, area_types)),
+        "prov_state": list(map(tuple, prov_state)),
+        "airs_export_types": [x[0] for x in airs_export_types],
+    }
+
+
+_province_states = LanguageCache("province states", _load_province_states)
+_external_form_lists = LanguageCache(
+    "external community form lists", _load_external_form_lists
+)
+
+
+def province_states(request):
+    """(ProvID, name) options for the community form's province/state select"""
+    return _province_states.get(request)
+
+
+def external_form_lists(request):
+    """
+    Options for the external community form, a dict with area_types,
+    prov_state and airs_export_types.
+    """
+    return _external_form_lists.get(request)
@@ -16,16 +16,16 @@
 
 # Python STD Lib
 from collections import defaultdict
-from datetime import date, datetime, time
 
 import logging
 
 # 3rd party libs
 from pyramid.request import Request
 from pyramid.decorator import reify
-from pyramid.i18n import get_localizer, TranslationStringFactory, TranslationString
+from pyramid.i18n import make_localizer, TranslationStringFactory, TranslationString
+from pyramid.interfaces import ILocalizer, ITranslationDirectories
 
-from babel import Locale, dates
+from babel import Locale
 
 # This app
 from communitymanager.lib.syslanguage import (
@@ -34,48 +34,22 @@ from communitymanager.lib.syslanguage import (
     is_active_culture,
 )
 from communitymanager.lib import config, connection, const
+from communitymanager.lib.formatting import get_formatter
 
 log = logging.getLogger("communitymanager.lib.request")
 
 
 class LocaleDict(defaultdict):
     def __missing__(self, key):
-        return Locale.parse(key, sep="-")
+        value = self[key] = Locale.parse(key, sep="-")
+        return value
 
 
 _locales = LocaleDict()
-_locale_date_format = {
-    "en-CA": "d MMM yyyy",
-    "fr-CA": "d MMM yyyy",
-    "de": "dd.MM.yyyy",
-    "fr": "d MMM yyyy",
-    "es-MX": "MM/dd/yyyy",
-    "it": "d MMM yyyy",
-    "nl": "d MMM yyyy",
-    "no": "d MMM yyyy",
-    "pt": "d-MM-yyyy",
-    "sv": "d MMM yyyy",
-    "hu": "MMM d. yyyy",
-    "pl": "d MMM yyyy",
-    "ro": "d MMM yyyy",
-    "hr": "d MMM yyyy",
-    "sk": "dd.MM.yyyy",
-    "sl": "d MMM yyyy",
-    "el": "dd/MM/yyyy",
-    "bg": "d MMM yyyy",
-    "ru": "d MMM yyyy",
-    "tr": "d MMM yyyy",
-    "lv": "d MMM yyyy",
-    "lt": "d MMM yyyy",
-    "zh-TW": "yyyy/MM/dd",
-    "ko": "yyyy/MM/dd",
-    "zh-CN": "yyyy/MM/dd",
-    "th": "d MMM yyyy",
-}
 
 
 def get_locale(request):
-    return _locales[request.language.Culture]
+    return request.formatter.locale
 
 
 def get_date_locale(request):
@@ -83,41 +57,15 @@ def get_date_locale(request):
 
 
 def format_date(d, request):
-    if d is None:
-        return ""
-    if not isinstance(d, (date, datetime)):
-        return d
-
-    l = get_locale(request)
-    format = _locale_date_format.get(request.language.Culture, "medium")
-    return dates.format_date(d, locale=l, format=format)
+    return request.formatter.format_date(d)
 
 
 def format_time(t, request):
-    if t is None:
-        return ""
-    if not isinstance(t, (datetime, time)):
-        return t
-
-    l = get_locale(request)
-    return dates.format_time(t, locale=l)
+    return request.formatter.format_time(t)
 
 
 def format_datetime(dt, request):
-    if dt is None:
-        return ""
-    if not isinstance(dt, (date, datetime, time)):
-        return dt
-
-    parts = []
-
-    if isinstance(dt, (date, datetime)):
-        parts.append(format_date(dt, request))
-
-    if isinstance(dt, (datetime, time)):
-        parts.append(format_time(dt, request))
-
-    return " ".join(parts)
+    return request.formatter.format_datetime(dt)
 
 
 class CommunityManagerRequest(Request):
@@ -164,27 +112,27 @@ class CommunityManagerRequest(Request):
 
     @reify
     def translate(self):
-        if not hasattr(self, "localizer"):
-            self.localizer = get_localizer(self)
-
-        localizer = self.localizer
-
-        def auto_translate(string):
-            if not isinstance(string, TranslationString):
-                string = tsf(string)
+        return get_translator(self.registry, self._LOCALE_)
 
-            return localizer.translate(string)
+    @reify
+    def localizer(self):
+        return self.translate.localizer
 
-        return auto_translate
+    @reify
+    def formatter(self):
+        return get_formatter(self.language.Culture)
 
-    def format_date(self, d):
-        return format_date(d, self)
+    @reify
+    def format_date(self):
+        return self.formatter.format_date
 
-    def format_time(self, t):
-        return format_time(t, self)
+    @reify
+    def format_time(self):
+        return self.formatter.format_time
 
-    def format_datetime(self, dt):
-        return format_datetime(dt, self)
+    @reify
+    def format_datetime(self):
+        return self.formatter.format_datetime
 
     @reify
     def user(self):
@@ -213,22 +161,69 @@ class CommunityManagerRequest(Request):
 
 tsf = TranslationStringFactory("CommunityManager")
 
+# plain strings remembered per translator, a guard against unbounded growth
+# if dynamic text is passed in
+MAX_CACHED_STRINGS = 20000
 
-def get_translate_fn(request, _culture=None):
-    if not _culture or _culture == request._LOCALE_:
-        return request.translate
 
-    ln = request._LOCALE_
+class Translator(object):
+    """
+    Callable translating UI strings for one locale.
+
+    Plain strings (the static UI text passed to _()) are translated once and
+    then served from a dict. TranslationStrings, which may carry a mapping,
+    always go through the localizer.
+    """
+
+    def __init__(self, localizer):
+        self.localizer = localizer
+        self._cache = {}
+
+    def __call__(self, string):
+        if type(string) is str:
+            try:
+                return self._cache[string]
+            except KeyError:
+                pass
+
+            value = self.localizer.translate(tsf(string))
+            if len(self._cache) < MAX_CACHED_STRINGS:
+                self._cache[string] = value
+
+            return value
+
+        if not isinstance(string, TranslationString):
+            string = tsf(string)
+
+        return self.localizer.translate(string)
+
+
+_translators = {}
+
+
+def get_translator(registry, locale_name):
+    """Return the process wide Translator for locale_name."""
     try:
-        request._LOCALE_ = _culture
-        localizer = get_localizer(request)
-    finally:
-        request._LOCALE_ = ln
+        return _translators[locale_name]
+    except KeyError:
+        pass
+
+    # the same lookup pyramid does for request.localizer
+    localizer = registry.queryUtility(ILocalizer, name=locale_name)
+    if localizer is None:
+        tdirs = registry.queryUtility(ITranslationDirectories, default=[])
+        localizer = make_localizer(locale_name, tdirs)
+        registry.registerUtility(localizer, ILocalizer, name=locale_name)
+
+    translator = _translators[locale_name] = Translator(localizer)
+    return translator
 
-    def auto_translate(string):
-        return localizer.translate(tsf(string))
 
-    return auto_translate
+def get_translate_fn(request, _culture=None):
+    if not _culture:
+        return request.translate
+
+    return get_translator(request.registry, _culture.replace("-", "_"))
 
 
 def passvars_pregen(request, elements, kw):
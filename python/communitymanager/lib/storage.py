@@ -0,0 +1,257 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# std lib
+from contextlib import contextmanager
+from glob import glob
+import errno
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# this app
+from communitymanager.lib import config as ciocconfig, const
+
+import logging
+
+log = logging.getLogger("communitymanager.lib.storage")
+
+LOCK_NAME = ".lock"
+
+# errors from a non blocking lock attempt when another process holds the lock
+_LOCK_BUSY = (errno.EAGAIN, errno.EACCES, getattr(errno, "EDEADLOCK", errno.EDEADLK))
+
+
+if fcntl is not None:
+
+    def _try_lock(fd):
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+else:
+
+    def _try_lock(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def _unlock(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class LocalStorage(object):
+    """
+    Published files stored by name in a single directory.
+
+    Small metadata files (the manifest) live in the same directory. All
+    writes go to a temporary file first and are moved into place, so readers
+    never see a partial file.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.staging_dir = root
+        if not os.path.isdir(root):
+            os.makedirs(root)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.root)
+
+    def _meta_path(self, name):
+        return os.path.join(self.root, name)
+
+    def path(self, filename, sha256=None):
+        """Return the local path to read the published file from."""
+        return os.path.join(self.root, filename)
+
+    def exists(self, filename, sha256=None):
+        return os.path.exists(self.path(filename, sha256))
+
+    def legacy_files(self, pattern):
+        """Files published before the manifest existed, matching pattern."""
+        return [os.path.basename(x) for x in glob(os.path.join(self.root, pattern))]
+
+    def open_temp(self, prefix=".publish-"):
+        fd, tmpname = tempfile.mkstemp(
+            prefix=prefix, suffix=".tmp", dir=self.staging_dir
+        )
+        return os.fdopen(fd, "wb"), tmpname
+
+    def discard(self, tmpname):
+        try:
+            os.unlink(tmpname)
+        except OSError:
+            pass
+
+    def commit(self, tmpname, filename, sha256):
+        os.replace(tmpname, self.path(filename, sha256))
+
+    def meta_stamp(self, name):
+        try:
+            st = os.stat(self._meta_path(name))
+        except OSError:
+            return None
+
+        return (st.st_mtime_ns, st.st_size)
+
+    def read_meta(self, name):
+        try:
+            with open(self._meta_path(name), "rb") as f:
+                return f.read()
+        except (IOError, OSError) as e:
+            if e.errno == errno.ENOENT:
+                return None
+            raise
+
+    def write_meta(self, name, data):
+        f, tmpname = self.open_temp(prefix="." + name + "-")
+        try:
+            with f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(tmpname, self._meta_path(name))
+        except Exception:
+            self.discard(tmpname)
+            raise
+
+    @contextmanager
+    def lock(self, timeout=60):
+        """
+        Exclusive lock shared by every process using this storage, for
+        read-modify-write of the metadata files.
+        """
+        path = self._meta_path(LOCK_NAME)
+        deadline = time.time() + timeout
+
+        # The lock file is never removed; the OS lock on it is released when
+        # the holder closes it or exits, so a crashed publish cannot leave a
+        # stale lock behind.
+        fd = os.open(path, os.O_CREAT | os.O_RDWR)
+        try:
+            while True:
+                try:
+                    _try_lock(fd)
+                    break
+                except OSError as e:
+                    if e.errno not in _LOCK_BUSY:
+                        raise
+
+                if time.time() > deadline:
+                    raise RuntimeError("Timed out waiting for storage lock %s" % path)
+
+                time.sleep(0.1)
+
+            try:
+                yield
+            finally:
+                _unlock(fd)
+        finally:
+            os.close(fd)
+
+
+class ContentAddressedStorage(LocalStorage):
+    """
+    Published files stored under their sha256 in a directory shared by all
+    app nodes (a network share).
+
+    The manifest maps published filenames to their sha256, so any node can
+    serve any snapshot as soon as the manifest naming it has been written.
+    Objects are immutable and identical outputs are stored once.
+    """
+
+    def __init__(self, root):
+        super(ContentAddressedStorage, self).__init__(root)
+        self.objects_dir = os.path.join(root, "objects")
+        self.staging_dir = os.path.join(root, "staging")
+        for path in (self.objects_dir, self.staging_dir):
+            if not os.path.isdir(path):
+                os.makedirs(path)
+
+    def path(self, filename, sha256=None):
+        if not sha256:
+            raise ValueError(
+                "Content addressed storage needs the sha256 of %s" % filename
+            )
+
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    def legacy_files(self, pattern):
+        return []
+
+    def commit(self, tmpname, filename, sha256):
+        path = self.path(filename, sha256)
+        if os.path.exists(path):
+            self.discard(tmpname)
+            return
+
+        dirname = os.path.dirname(path)
+        if not os.path.isdir(dirname):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                # created by another node at the same time
+                pass
+
+        os.replace(tmpname, path)
+
+
+STORAGE_TYPES = {
+    "local": LocalStorage,
+    "shared": ContentAddressedStorage,
+}
+
+
+def storage_from_config(config, default_root=None):
+    """
+    Build the publish storage from the config file settings
+    publish.storage (local or shared) and publish.storage_path.
+    """
+    kind = config.get("publish.storage") or "local"
+    try:
+        cls = STORAGE_TYPES[kind]
+    except KeyError:
+        raise ValueError("Unknown publish.storage: %s" % kind)
+
+    root = config.get("publish.storage_path") or default_root or const.publish_dir
+    return cls(root)
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = storage_from_config(
+                    ciocconfig.get_config(const._config_file)
+                )
+
+    return _storage
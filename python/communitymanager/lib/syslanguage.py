@@ -17,9 +17,17 @@
 
 from collections import namedtuple
 from operator import attrgetter
+import threading
+import time
 
 from pyramid.decorator import reify
 
+from communitymanager.lib.connection import ConfigConnectionManager
+
+import logging
+
+log = logging.getLogger('communitymanager.lib.syslanguage')
+
 # System Language Constants
 LANG_ENGLISH = 0
 LANG_FRENCH = 2
@@ -38,27 +46,8 @@ LCID_ENGLISH_CANADIAN = 4105
 LCID_FRENCH_CANADIAN = 3084
 
 
-def default_culture():
-    return active_cultures()[0]
-
-
-def is_active_culture(culture):
-    try:
-        return _culture_cache[culture].Active
-    except KeyError:
-        return False
-
-
-def active_cultures():
-    return [x.Culture for x in sorted(_culture_list, key=attrgetter('LanguageName')) if x.Active]
-
-
-def active_record_cultures():
-    return [x.Culture for x in sorted(_culture_list, key=lambda x: (not x.Active, x.LanguageName)) if x.ActiveRecord]
-
-
-def culture_map():
-    return _culture_cache.copy()
+# seconds before the language list is fetched again in the background
+REFRESH_INTERVAL = 15 * 60
 
 _culture_fields = 'Culture LanguageName LanguageAlias LCID LangID Active ActiveRecord'
 _culture_field_list = _culture_fields.split()
@@ -72,9 +61,27 @@ class CultureDescription(CultureDescriptionBase):
     def FormCulture(self):
         return self.Culture.replace('-', '_')
 
-# global value will be updated by running app
 
-_culture_list = [
+class CultureSnapshot(object):
+    """
+    Immutable view of the languages table with the derived lists computed
+    once. A refresh builds a new snapshot and swaps it in, so readers always
+    see a consistent set.
+    """
+
+    def __init__(self, cultures, loaded_at=None):
+        self.cultures = tuple(cultures)
+        self.culture_map = dict((x.Culture, x) for x in self.cultures)
+        self.active_cultures = tuple(
+            x.Culture for x in sorted(self.cultures, key=attrgetter('LanguageName')) if x.Active)
+        self.active_record_cultures = tuple(
+            x.Culture for x in sorted(self.cultures, key=lambda x: (not x.Active, x.LanguageName)) if x.ActiveRecord)
+        self.loaded_at = loaded_at
+
+
+# global value will be replaced by running app
+
+_snapshot = CultureSnapshot([
     CultureDescription(
         Culture=CULTURE_ENGLISH_CANADIAN,
         LanguageName='English',
@@ -93,52 +100,96 @@ _culture_list = [
         Active=False,
         ActiveRecord=False
     )
-]
-_culture_cache = None
+])
 
+_refresh_lock = threading.Lock()
 
-def update_culture_map():
-    global _culture_cache
 
-    _culture_cache = dict((x.Culture, x) for x in _culture_list)
+def default_culture():
+    return _snapshot.active_cultures[0]
 
-update_culture_map()
 
+def is_active_culture(culture):
+    try:
+        return _snapshot.culture_map[culture].Active
+    except KeyError:
+        return False
+
+
+def cultures():
+    return _snapshot.cultures
+
+
+def active_cultures():
+    return _snapshot.active_cultures
 
-def update_cultures(cultures):
-    global _culture_list
-    _culture_list[:] = [CultureDescription(**x) for x in cultures]
-    update_culture_map()
 
-_fetched_from_db = False
+def active_record_cultures():
+    return _snapshot.active_record_cultures
+
+
+def culture_map():
+    return _snapshot.culture_map.copy()
+
 
+def update_cultures(cultures):
+    global _snapshot
+    _snapshot = CultureSnapshot([CultureDescription(**x) for x in cultures], time.time())
 
-def _fetch_from_db(request):
-    global _fetched_from_db
 
-    with request.connmgr.get_connection('English') as conn:
+def refresh(connmgr):
+    """Fetch the languages from the database and swap them in."""
+    with connmgr.get_connection(SQLALIAS_ENGLISH) as conn:
         cursor = conn.execute('EXEC sp_Languages_l')
 
         cols = [x[0] for x in cursor.description]
         langs = [dict(zip(cols, x)) for x in cursor.fetchall()]
 
+        cursor.close()
+
     update_cultures(langs)
-    _fetched_from_db = True
+
+
+def _background_refresh(config):
+    try:
+        refresh(ConfigConnectionManager(config))
+    except Exception:
+        log.exception('Error refreshing languages')
+    finally:
+        _refresh_lock.release()
+
+
+def _ensure_loaded(request):
+    loaded_at = _snapshot.loaded_at
+    if loaded_at is None:
+        # nothing to serve yet, the first requests wait for the load
+        with _refresh_lock:
+            if _snapshot.loaded_at is None:
+                refresh(request.connmgr)
+        return
+
+    if time.time() - loaded_at > REFRESH_INTERVAL and _refresh_lock.acquire(False):
+        # keep serving the current snapshot while a new one is fetched
+        try:
+            thread = threading.Thread(target=_background_refresh, args=(request.config,))
+            thread.daemon = True
+            thread.start()
+        except Exception:
+            _refresh_lock.release()
+            raise
 
 
 class SystemLanguage(object):
     def __init__(self, request):
-        # fill _culture_list?
-        if not _fetched_from_db or request.params.get('ResetDb') == 'True':
-            _fetch_from_db(request)
+        _ensure_loaded(request)
 
         self.setSystemLanguage(CULTURE_ENGLISH_CANADIAN)
 
     def setSystemLanguage(self, culture):
         try:
-            self.description = _culture_cache[culture]
+            self.description = _snapshot.culture_map[culture]
         except KeyError:
-            self.description = _culture_cache[CULTURE_ENGLISH_CANADIAN]._replace(Active=True)
+            self.description = _snapshot.culture_map[CULTURE_ENGLISH_CANADIAN]._replace(Active=True)
 
     @property
     def LocaleID(self):
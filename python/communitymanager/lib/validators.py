@@ -35,6 +35,7 @@ MaxLength = validators.MaxLength
 Int = validators.Int
 Bool = validators.Bool
 StringBool = validators.StringBool
+OneOf = validators.OneOf
 Invalid = validators.Invalid
 URL = validators.URL
 Schema = schema.Schema
@@ -0,0 +1,54 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+# std lib
+import logging
+import os
+
+# this app
+from communitymanager.lib import config as ciocconfig, const
+from communitymanager.lib.connection import ConfigConnectionManager
+
+
+def add_common_arguments(parser):
+    parser.add_argument(
+        "--config",
+        help="application config file, defaults to the one the web app uses",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+
+
+def setup(args):
+    """Load the application config for a command line script and return a
+    connection manager for it."""
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    const.update_cache_values()
+    config_file = os.path.abspath(args.config) if args.config else const._config_file
+
+    return ConfigConnectionManager(ciocconfig.get_config(config_file))
+
+
+def format_size(size):
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return "%d %s" % (size, unit)
+        size /= 1024.0
+
+    return "%.1f GiB" % size
@@ -0,0 +1,245 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+"""
+Export the community mapping archive of every external system into a
+directory, for mirroring to other hosts.
+
+Systems whose data has not changed since the last run (same watermark as
+recorded in the directory's manifest) are skipped unless --force is given.
+"""
+
+# std lib
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# this app
+from communitymanager.lib import externalexport
+from communitymanager.lib.compression import Compression
+from communitymanager.lib.manifest import file_sha256
+from communitymanager.scripts import add_common_arguments, format_size, setup
+
+import logging
+
+log = logging.getLogger("communitymanager.scripts.exportexternal")
+
+MANIFEST_NAME = "manifest.json"
+
+
+class _WorkerConnections(object):
+    """One database connection per worker thread, reused for every system
+    that worker exports."""
+
+    def __init__(self, connmgr):
+        self.connmgr = connmgr
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.all = []
+
+    def get(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = self.connmgr.get_connection()
+            with self.lock:
+                self.all.append(conn)
+
+        return conn
+
+    def close(self):
+        for conn in self.all:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "rb") as f:
+            data = json.loads(f.read().decode("utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+    return {x["system_code"]: x for x in data.get("systems", [])}
+
+
+def _write_manifest(output_dir, entries):
+    data = {
+        "date": datetime.now().replace(microsecond=0).isoformat(),
+        "systems": sorted(entries, key=lambda x: x["system_code"]),
+    }
+
+    fd, tmpname = tempfile.mkstemp(prefix=".manifest-", suffix=".tmp", dir=output_dir)
+    with os.fdopen(fd, "wb") as f:
+        f.write(json.dumps(data, indent=1).encode("utf-8"))
+
+    os.replace(tmpname, os.path.join(output_dir, MANIFEST_NAME))
+
+
+def export_system(connections, system_code, output_dir, previous, force, compression):
+    start = time.time()
+    conn = connections.get()
+
+    cursor = conn.execute("EXEC sp_External_System_s ?", system_code)
+    external_system = cursor.fetchone()
+    cursor.close()
+
+    cursor = conn.execute("EXEC sp_External_Community_s_Watermark ?", system_code)
+    watermark = cursor.fetchone()
+    cursor.close()
+    etag = externalexport.watermark_etag(system_code, watermark)
+
+    filename = "CommunityMap-%s.zip" % externalexport.safe_filename(system_code)
+    path = os.path.join(output_dir, filename)
+
+    if (
+        not force
+        and previous is not None
+        and previous.get("etag") == etag
+        and os.path.exists(path)
+    ):
+        return dict(previous, seconds=time.time() - start, skipped=True)
+
+    fd, tmpname = tempfile.mkstemp(prefix=".export-", suffix=".tmp", dir=output_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            xml_name = externalexport.write_archive(
+                conn, external_system, f, compression=compression
+            )
+
+        os.replace(tmpname, path)
+    except Exception:
+        try:
+            os.unlink(tmpname)
+        except OSError:
+            pass
+        raise
+
+    return {
+        "system_code": system_code,
+        "system_name": external_system.SystemName,
+        "filename": filename,
+        "xml_filename": xml_name,
+        "size": os.path.getsize(path),
+        "sha256": file_sha256(path),
+        "etag": etag,
+        "seconds": time.time() - start,
+        "skipped": False,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_common_arguments(parser)
+    parser.add_argument("output_dir", help="directory to write the archives into")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=4,
+        help="number of systems to export at the same time (default 4)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="export systems that have not changed"
+    )
+    args = parser.parse_args(argv)
+
+    connmgr = setup(args)
+    compression = Compression.from_config(connmgr.config)
+
+    output_dir = os.path.abspath(args.output_dir)
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    conn = connmgr.get_connection()
+    try:
+        systems = [x.SystemCode for x in conn.execute("EXEC sp_External_System_l")]
+    finally:
+        conn.close()
+
+    previous = _load_manifest(output_dir)
+
+    total = time.time()
+    results = {}
+    failed = []
+    connections = _WorkerConnections(connmgr)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            futures = {
+                executor.submit(
+                    export_system,
+                    connections,
+                    code,
+                    output_dir,
+                    previous.get(code),
+                    args.force,
+                    compression,
+                ): code
+                for code in systems
+            }
+            for future in as_completed(futures):
+                code = futures[future]
+                try:
+                    result = future.result()
+                except Exception:
+                    log.exception("Export of %s failed", code)
+                    failed.append(code)
+                    if code in previous:
+                        results[code] = previous[code]
+                    continue
+
+                results[code] = result
+                print(
+                    "%-30s %10s %7.2fs%s"
+                    % (
+                        code,
+                        format_size(result["size"]),
+                        result["seconds"],
+                        " (unchanged)" if result["skipped"] else "",
+                    )
+                )
+    finally:
+        connections.close()
+
+    entries = [
+        {k: v for k, v in x.items() if k not in ("seconds", "skipped")}
+        for x in results.values()
+    ]
+    _write_manifest(output_dir, entries)
+
+    print(
+        "%d systems, %d exported, %d failed, %s in %.2fs"
+        % (
+            len(systems),
+            sum(1 for x in results.values() if not x.get("skipped", True)),
+            len(failed),
+            format_size(sum(x["size"] for x in results.values())),
+            time.time() - total,
+        )
+    )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
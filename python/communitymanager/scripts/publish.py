@@ -0,0 +1,122 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+"""
+Publish the repository downloads without going through the web site.
+
+This runs the same export as the Publish page, so it can be scheduled
+off-peak or run on a standby node.
+"""
+
+# std lib
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# this app
+from communitymanager.lib import publish
+from communitymanager.lib.compression import Compression
+from communitymanager.lib.manifest import Manifest
+from communitymanager.lib.storage import LocalStorage, storage_from_config
+from communitymanager.scripts import add_common_arguments, format_size, setup
+
+import logging
+
+log = logging.getLogger("communitymanager.scripts.publish")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_common_arguments(parser)
+    parser.add_argument(
+        "--output-dir",
+        help="directory to publish into, defaults to the web site's publish storage",
+    )
+    parser.add_argument(
+        "--source",
+        default=socket.getfqdn(),
+        help="host name recorded as the source of the data (default %(default)s)",
+    )
+    parser.add_argument(
+        "--if-changed",
+        action="store_true",
+        help="only publish if communities changed since the latest published file",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="run the export into a temporary directory and discard the result",
+    )
+    args = parser.parse_args(argv)
+
+    connmgr = setup(args)
+    compression = Compression.from_config(connmgr.config)
+
+    if args.output_dir:
+        storage = LocalStorage(os.path.abspath(args.output_dir))
+    else:
+        storage = storage_from_config(connmgr.config)
+
+    manifest = Manifest(storage)
+
+    tracemalloc.start()
+    start = time.time()
+
+    conn = connmgr.get_connection()
+    try:
+        if args.if_changed and not publish.has_changes(conn, manifest):
+            print("No changes since %s, nothing published" % manifest.latest().filename)
+            return 0
+
+        if args.dry_run:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                entry = publish.publish_repository(
+                    conn, Manifest(LocalStorage(tmpdir)), args.source, compression
+                )
+        else:
+            entry = publish.publish_repository(conn, manifest, args.source, compression)
+    finally:
+        conn.close()
+
+    elapsed = time.time() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for output in entry.outputs:
+        print("%-40s %10s" % (output.filename, format_size(output.size)))
+
+    print(
+        ", ".join("%d %s" % (count, section) for section, count in entry.rows.items())
+    )
+    print(
+        "%s in %.2fs, peak memory %s%s"
+        % (
+            "Exported" if args.dry_run else "Published",
+            elapsed,
+            format_size(peak),
+            " (dry run, nothing kept)" if args.dry_run else "",
+        )
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
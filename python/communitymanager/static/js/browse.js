@@ -830,7 +830,8 @@ if ( window.globalStorage ) {
 
 (function($) {
     var open_nodes = [], default_open = null,
-        details_url = null, dialog=null,
+        details_url = null, dialog=null, labels = {},
+        details = {}, pending = {}, max_batch = 200,
     remove = function(arr, from, to) {
         var rest = arr.slice((to || from) + 1 || arr.length);
         arr.length = from < 0 ? arr.length + from : from;
@@ -851,30 +852,100 @@ if ( window.globalStorage ) {
             li.removeClass('tree-closed');
             li.addClass('tree-open');
             open_nodes.push(cm_id);
+            prefetch_children(li);
         }
         amplify.store('open_nodes', open_nodes);
 
     },
-    show_community_details = function(evt) {
-        var self = $(this), cm_id = self.data('id');
-        $.ajax({
-            url: details_url.replace('CMID', cm_id),
-            dataType: 'json',
-            cache: false,
-            success: function(data) {
-                if (data.fail) {
-                    // XXX Log something?
-                    return;
-                }
+    fetch_details = function(cm_ids, callback) {
+        var wanted = [];
+        $.each(cm_ids, function(idx, cm_id) {
+            if (!details[cm_id] && !pending[cm_id]) {
+                pending[cm_id] = true;
+                wanted.push(cm_id);
+            }
+        });
 
-                if (dialog.dialog('isOpen')) {
-                    dialog.dialog('close');
-                }
-                dialog.html(data.community_info);
-                dialog.dialog('option', 'title', data.community_name)
-                dialog.dialog('open');
+        while (wanted.length) {
+            (function(batch) {
+                $.ajax({
+                    url: details_url,
+                    data: {cmid: batch.join(',')},
+                    dataType: 'json',
+                    cache: false,
+                    success: function(data) {
+                        if (!data.fail) {
+                            $.extend(details, data.communities);
+                        }
+                    },
+                    complete: function() {
+                        $.each(batch, function(idx, cm_id) {
+                            delete pending[cm_id];
+                        });
+                        if (callback) {
+                            callback();
+                        }
+                    }
+                });
+            })(wanted.splice(0, max_batch));
+        }
+    },
+    prefetch_children = function(li) {
+        var cm_ids = [];
+        li.children('ul').children('.tree-node').each(function() {
+            cm_ids.push($(this).data('id'));
+        });
+        if (cm_ids.length) {
+            fetch_details(cm_ids);
+        }
+    },
+    detail_line = function(parent, label, value) {
+        if (value) {
+            parent.append($('<p>').append($('<strong>').text(label), ' ', document.createTextNode(value)));
+        }
+    },
+    render_details = function(community) {
+        var names = function(list) {
+                return $.map(list, function(x) { return x.name; }).join('; ');
+            },
+            content = $('<div>'), smaller = $('<p class="smaller">');
+
+        detail_line(content, labels.other_names, community.other_names.join('; '));
+        detail_line(content, labels.child_communities, names(community.children));
+        detail_line(content, labels.search_communities, names(community.search_communities));
+        detail_line(content, labels.province_state, community.province_state);
+
+        smaller.append($('<strong>').text(labels.managed_by), ' ', document.createTextNode(community.managers.join('; ')));
+        $.each([['created', labels.created], ['modified', labels.modified]], function(idx, field) {
+            if (community[field[0]]) {
+                smaller.append('<br>', $('<strong>').text(field[1]), ' ', document.createTextNode(community[field[0]]));
             }
         });
+        content.append(smaller);
+
+        return content.contents();
+    },
+    show_details = function(community) {
+        if (dialog.dialog('isOpen')) {
+            dialog.dialog('close');
+        }
+        dialog.empty().append(render_details(community));
+        dialog.dialog('option', 'title', community.title)
+        dialog.dialog('open');
+    },
+    show_community_details = function(evt) {
+        var self = $(this), cm_id = self.data('id');
+        if (details[cm_id]) {
+            show_details(details[cm_id]);
+        } else {
+            // not prefetched, the response is kept for the next click
+            delete pending[cm_id];
+            fetch_details([cm_id], function() {
+                if (details[cm_id]) {
+                    show_details(details[cm_id]);
+                }
+            });
+        }
         return false;
     },
     close_all = function(evt) {
@@ -916,10 +987,11 @@ if ( window.globalStorage ) {
         open_node_set(default_open, true);
         return false;
     },
-    init = function(in_details_url, use_tree, in_default_open) {
+    init = function(in_details_url, use_tree, in_default_open, in_labels) {
         var force_parents_open = false, troot = $('#tree-root');
         details_url=in_details_url;
         default_open = in_default_open;
+        labels = in_labels || {};
 
         troot.on('click', '.community-name', show_community_details);
         dialog = $('#dialog').dialog({autoOpen: false, minWidth: 450})
@@ -46,3 +46,13 @@
 </table>
 </%def>
 
+<%def name="makeChangesPage(logentries, more_url)">
+%if logentries:
+${makeLogTable(logentries)}
+%else:
+${_('No changes were recorded for this download.')}
+%endif
+%if more_url:
+<p><a href="${more_url}" class="load-changes">${_('Show More Changes')}</a></p>
+%endif
+</%def>
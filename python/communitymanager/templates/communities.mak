@@ -92,9 +92,17 @@ ${renderer.form_passvars()}
 <script type="text/javascript">
 jQuery(function($) {
     var default_open = ${json.dumps(request.user.ManageAreaList if request.user else [])|n},
-        details_url = ${json.dumps(request.route_path('json_community', cmid='CMID'))|n};
+        details_url = ${json.dumps(request.route_path('json_community_details'))|n},
+        labels = ${json.dumps({
+            'other_names': _('Other Names: '),
+            'child_communities': _('Child Communities: '),
+            'search_communities': _('Search Communities: '),
+            'province_state': _('Province/State/Country: '),
+            'managed_by': _('Managed By: '),
+            'created': _('Created: '),
+            'modified': _('Modified: ')})|n};
    // $('#search-button').button({ icons: { primary: "ui-icon-search" }, text: false });
-    init_browse(details_url, true, default_open);
+    init_browse(details_url, true, default_open, labels);
 });
 </script>
 </%block>
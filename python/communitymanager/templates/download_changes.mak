@@ -0,0 +1,27 @@
+<%doc>
+  =========================================================================================
+   Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+ 
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+ 
+       http://www.apache.org/licenses/LICENSE-2.0
+ 
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+  =========================================================================================
+</%doc>
+
+<%inherit file="master.mak"/>
+<%namespace file="changelog.mak" name="changelog"/>
+
+<%block name="title">${_('Changes Included in Download: ')}${request.format_datetime(entry.date)}</%block>
+
+<p><a href="${request.route_path('download', filename=entry.filename)}">${_('Download')}</a>
+| <a href="${request.route_path('downloads')}">${_('All Downloads')}</a></p>
+
+${changelog.makeChangesPage(logentries, more_url)}
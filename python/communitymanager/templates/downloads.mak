@@ -34,14 +34,45 @@
     ${_('The following changes have not been released: ')}
     %else:
     <a href="${request.route_path('download', filename=fname)}">${request.format_datetime(dt)}</a>
+    %for output in outputs.get(fname, []):
+    | <a href="${request.route_path('download', filename=output.filename)}">${output.format.upper()}</a>
+    %endfor
     %endif
     %if log:
     ${changelog.makeLogTable(log)}
     %endif
     </li>
 %endfor
+%for entry in older_files:
+    <li>
+    <a href="${request.route_path('download', filename=entry.filename)}">${request.format_datetime(entry.date)}</a>
+    %for output in outputs.get(entry.filename, []):
+    | <a href="${request.route_path('download', filename=output.filename)}">${output.format.upper()}</a>
+    %endfor
+    <div><a href="${request.route_path('download_changes', filename=entry.filename)}" class="load-changes">${_('Show Changes')}</a></div>
+    </li>
+%endfor
 </ul>
 %endif:
 %if not files or i==0 and not dt:
 ${self.printInfoMessage(_('No downloads available'))}
 %endif
+
+<%block name="bottomscripts">
+<script type="text/javascript">
+jQuery(function($) {
+    $('#download-list').on('click', '.load-changes', function() {
+        var self = $(this), container = self.parent();
+        $.ajax({
+            url: self.attr('href'),
+            dataType: 'html',
+            cache: false,
+            success: function(data) {
+                container.replaceWith(data);
+            }
+        });
+        return false;
+    });
+});
+</script>
+</%block>
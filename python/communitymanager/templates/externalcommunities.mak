@@ -17,6 +17,7 @@
 </%doc>
 
 <%inherit file="master.mak"/>
+<%namespace file="paging.mak" name="paging"/>
 <%! from markupsafe import Markup, escape %>
 
 <%block name="title">${_('External Communities for %s') % _context.external_system.SystemName}</%block>
@@ -44,19 +45,36 @@
 <a class="ui-button ui-widget ui-state-default ui-corner-all ui-button-text-icon-primary" href="${request.route_path('external_community_download', SystemCode=_context.external_system.SystemCode)}"><span class="ui-icon ui-icon-suitcase ui-button-icon-primary" aria-hidden="true"></span><span class="ui-button-text">${_('Download Mapping')}</span></a>
 </p>
 
+<p>
+<form action="${request.current_route_path(_form=True)}" method="GET" id="community-filter">
+<div class="hidden">
+${renderer.form_passvars()}
+${renderer.hidden('sort')}
+${renderer.hidden('desc')}
+</div>
+${renderer.errorlist()}
+<label for="filter">${_('Find: ')}</label>${renderer.text('filter', maxlength=100)}
+<label for="mapped">${_('Mapped: ')}</label>${renderer.select('mapped', [('', _('All')), ('1', _('Yes')), ('0', _('No'))])}
+<input type="submit" value="${_('Filter')}">
+%if sort != 'hierarchy':
+<a href="${sort_urls['hierarchy']}">${_('Sort by Hierarchy')}</a>
+%endif
+</form>
+</p>
+
 %if external_communities:
 <p>${escape(_('Mapped communities that have been assigned to multple External Communities are marked with %s.')) % (Markup('''<span class="ui-state-error required-flag"><span class="ui-icon ui-icon-star" title="%s"}"><em>%s</em></span></span>''') % (_('Warning: Duplicate Mapping'), _('Warning: Duplicate Mapping')))}</p>
-<table class="form-table tablesorter" id="mapped-communities">
+<table class="form-table" id="mapped-communities">
 <thead>
 <tr>
-<th class="ui-widget-header">${_('Area Name')}</th>
-<th class="ui-widget-header">${_('Parent Community')}</th>
+${paging.sort_header('name', _('Area Name'))}
+${paging.sort_header('parent', _('Parent Community'))}
 <th class="ui-widget-header">${_('Primary Area Type')}</th>
 ##<th class="ui-widget-header">${_('Sub Area Type')}</th>
 <th class="ui-widget-header">${_('Province/State/Country')}</th>
 ##<th class="ui-widget-header">${_('External ID')}</th>
 <th class="ui-widget-header">${_('AIRS Export Type')}</th>
-<th class="ui-widget-header">${_('Mapped Community')}</th>
+${paging.sort_header('mapped', _('Mapped Community'))}
 ##<th class="ui-widget-header">${_('Mapped Community Province/State/Country')}</th>
 <th class="ui-widget-header">${_('Mapped Community Parent')}</th>
 %if can_edit:
@@ -89,25 +107,8 @@ ${community.MappedCommunityName or ''}
 </tr>
 %endfor
 </table>
+${paging.page_links()}
 %else:
    <em>${_('No external communities found.')}</em> 
 %endif
 
-<%block name="bottomscripts">
-%if external_communities:
-<script type="text/javascript" src="/static/js/libs/jquery.tablesorter.min.js"></script> 
-<script type="text/javascript">
-jQuery(function($) {
-    var mapped_communities = $('#mapped-communities')
-%if can_edit:
-    var number_of_elements = mapped_communities.find('thead tr th').length; 
-    var args = {headers: {}};
-    args.headers[number_of_elements-1] = {sorter: false}
-%else:  
-    var args = {};
-%endif
-    mapped_communities.tablesorter(args);
-});
-</script>
-%endif
-</%block>
@@ -0,0 +1,39 @@
+<%doc>
+  =========================================================================================
+   Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+ 
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+ 
+       http://www.apache.org/licenses/LICENSE-2.0
+ 
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+  =========================================================================================
+</%doc>
+
+<%doc>
+  Sort and page links for lists paged with views.base.KeysetPager; they read
+  sort, descending, sort_urls, first_url and next_url from the page values.
+</%doc>
+
+<%def name="sort_header(option, label)">
+<th class="ui-widget-header"><a href="${sort_urls[option]}">${label}</a>${(u' \u25bc' if descending else u' \u25b2') if option == sort else ''}</th>
+</%def>
+
+<%def name="page_links()">
+%if first_url or next_url:
+<p>
+%if first_url:
+<a href="${first_url}">${_('First Page')}</a>
+%endif
+%if next_url:
+<a href="${next_url}">${_('Next Page')}</a>
+%endif
+</p>
+%endif
+</%def>
@@ -70,8 +70,16 @@ ${renderer.text('terms')}
 <script type="text/javascript">
 jQuery(function($) {
     var default_open = ${json.dumps(request.user.ManageAreaList if request.user else [])|n},
-        details_url = ${json.dumps(request.route_path('json_community', cmid='CMID'))|n};
-    init_browse(details_url, true, default_open);
+        details_url = ${json.dumps(request.route_path('json_community_details'))|n},
+        labels = ${json.dumps({
+            'other_names': _('Other Names: '),
+            'child_communities': _('Child Communities: '),
+            'search_communities': _('Search Communities: '),
+            'province_state': _('Province/State/Country: '),
+            'managed_by': _('Managed By: '),
+            'created': _('Created: '),
+            'modified': _('Modified: ')})|n};
+    init_browse(details_url, true, default_open, labels);
 });
 </script>
 </%block>
@@ -17,6 +17,7 @@
 </%doc>
 
 <%inherit file="master.mak"/>
+<%namespace file="paging.mak" name="paging"/>
 
 <%block name="title">${_('User Management')}</%block>
 
@@ -59,13 +60,31 @@
 
 <h3>${_('Existing Users')}</h3>
 %endif
-<table class="form-table tablesorter" id="existing-users">
+<p>
+<form action="${request.current_route_path(_form=True)}" method="GET" id="user-filter">
+<div class="hidden">
+${renderer.form_passvars()}
+${renderer.hidden('sort')}
+${renderer.hidden('desc')}
+%if request.params.get('show_rejected'):
+<input type="hidden" name="show_rejected" value="on">
+%endif
+</div>
+${renderer.errorlist()}
+<label for="name">${_('Name: ')}</label>${renderer.text('name', maxlength=100)}
+<label for="organization">${_('Organization: ')}</label>${renderer.text('organization')}
+<label for="admin">${_('Admin: ')}</label>${renderer.select('admin', [('', _('All')), ('1', _('Yes')), ('0', _('No'))])}
+<label for="inactive">${_('Active: ')}</label>${renderer.select('inactive', [('', _('All')), ('0', _('Yes')), ('1', _('No'))])}
+<input type="submit" value="${_('Filter')}">
+</form>
+</p>
+<table class="form-table" id="existing-users">
 <thead>
 <tr>
-<th class="ui-widget-header">${_('User Name')}</th>
-<th class="ui-widget-header">${_('Name')}</th>
+${paging.sort_header('username', _('User Name'))}
+${paging.sort_header('name', _('Name'))}
 <th class="ui-widget-header">${_('Initials')}</th>
-<th class="ui-widget-header">${_('Organization')}</th>
+${paging.sort_header('organization', _('Organization'))}
 <th class="ui-widget-header">${_('Email')}</th>
 <th class="ui-widget-header">${_('Admin')}</th>
 <th class="ui-widget-header">${_('Active')}</th>
@@ -84,8 +103,8 @@
 <td class="ui-widget-content ${'inactive' if user.Inactive else '' |n}">${user.Email}</td>
 <td class="ui-widget-content ${'inactive' if user.Inactive else '' |n}">${_('Yes') if user.Admin else _('No')}</td>
 <td class="ui-widget-content ${'inactive' if user.Inactive else '' |n}">${_('Yes') if not user.Inactive else _('No')}</td>
-<td class="ui-widget-content ${'inactive' if user.Inactive else '' |n}">${u', '.join(user.ManageCommunities)}</td>
-<td class="ui-widget-content ${'inactive' if user.Inactive else '' |n}">${u', '.join(user.ManageExternalSystems)}</td>
+<td class="ui-widget-content ${'inactive' if user.Inactive else '' |n}">${u', '.join(manage_communities.get(user.User_ID, []))}</td>
+<td class="ui-widget-content ${'inactive' if user.Inactive else '' |n}">${u', '.join(manage_external.get(user.User_ID, []))}</td>
 <td class="ui-widget-content">
 %if my_uid!=user.User_ID:
     <a href="${request.route_path('user', uid=user.User_ID)}">${_('Edit')}</a>
@@ -94,17 +113,17 @@
 </tr>
 %endfor
 </table>
+${paging.page_links()}
 
 %if not user_requests and rejected_requests and rejected_requests[0]:
 <h3>${_('Account Requests')}</h3>
 <p><a href="${request.current_route_path(_query=[('show_rejected','on')])}">${_('Show %d Rejected Requests') % rejected_requests[0]}</a></p>
 %endif
 
-<%block name="bottomscripts">
-<script type="text/javascript" src="/static/js/libs/jquery.tablesorter.min.js"></script> 
-<script type="text/javascript">
-jQuery(function($) {
-    $('#existing-users').tablesorter({headers: {8: {sorter: false}}});
-});
-</script>
-</%block>
+<form method="POST" action="${request.route_path('reload_caches', _form=True)}">
+<div class="hidden">
+${renderer.form_passvars()}
+</div>
+<input type="submit" value="${_('Reload Languages and Lists')}">
+</form>
+
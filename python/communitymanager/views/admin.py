@@ -0,0 +1,43 @@
+# =========================================================================================
+#  Copyright 2015 Community Information Online Consortium (CIOC) and KCL Software Solutions
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# =========================================================================================
+
+
+# 3rd party
+from pyramid.httpexceptions import HTTPFound
+from pyramid.view import view_config
+
+# this app
+from communitymanager.lib import cache, externalsystems, syslanguage
+from communitymanager.views.base import ViewBase
+
+import logging
+log = logging.getLogger('communitymanager.views.admin')
+
+
+class Admin(ViewBase):
+    @view_config(route_name="reload_caches", request_method='POST', permission='edit')
+    def reload_caches(self):
+        request = self.request
+        _ = request.translate
+
+        log.info('Cached settings reloaded by %s', request.user.UserName)
+
+        syslanguage.refresh(request.connmgr)
+        cache.clear_all()
+        externalsystems.registry.invalidate()
+
+        request.session.flash(_('Languages and lists have been reloaded from the database'))
+        return HTTPFound(location=request.route_url('users'))
@@ -15,22 +15,11 @@
 # =========================================================================================
 
 
-# std lib
-from xml.etree import cElementTree as ET
-
 # 3rd party
 
 # this app
 from communitymanager.lib import modelstate
-
-
-def xml_to_dict_list(text):
-    if not text:
-        return []
-
-    root = ET.fromstring(b'<root>' + text.encode('utf8') + b'</root>')
-
-    return [el.attrib for el in root]
+from communitymanager.lib.fragments import to_dict_list, xml_to_dict_list  # noqa: F401
 
 
 class ViewBase(object):
@@ -40,3 +29,56 @@ class ViewBase(object):
         self.request = request
 
         request.model_state = modelstate.ModelState(request)
+
+
+class KeysetPager(object):
+    """
+    Keyset paging for lists fetched one page plus one row at a time.
+
+    params are the validated sort, desc, after and after_id list parameters;
+    the first of sort_options is the default sort. query_params names the
+    request parameters kept when following the page and sort links.
+    """
+
+    def __init__(self, request, params, sort_options, query_params, page_size):
+        self.request = request
+        self.sort_options = sort_options
+        self.query_params = query_params
+        self.page_size = page_size
+
+        self.sort = params.get('sort') or sort_options[0]
+        self.descending = not not params.get('desc')
+
+        # SortKey and id of the last row on the previous page
+        self.after_id = params.get('after_id')
+        self.after = (params.get('after') or '') if self.after_id else None
+
+    def page(self, rows, id_attr):
+        """
+        Trim rows to one page. Returns the rows and the sort and page link
+        values used by the paging.mak defs. Each row needs a SortKey column.
+        """
+        request = self.request
+        query = [(x, request.params[x]) for x in self.query_params if request.params.get(x)]
+
+        next_url = None
+        if len(rows) > self.page_size:
+            rows = rows[:self.page_size]
+            last = rows[-1]
+            next_url = request.current_route_path(_query=query + [('after', last.SortKey), ('after_id', getattr(last, id_attr))])
+
+        first_url = request.current_route_path(_query=query) if self.after_id else None
+
+        # each column sorts ascending first, then toggles
+        sort_query = [x for x in query if x[0] not in ('sort', 'desc')]
+        sort_urls = {}
+        for option in self.sort_options:
+            option_query = sort_query + [('sort', option)]
+            if option == self.sort and not self.descending:
+                option_query.append(('desc', 'on'))
+            sort_urls[option] = request.current_route_path(_query=option_query)
+
+        return rows, {
+            'sort': self.sort, 'descending': self.descending, 'sort_urls': sort_urls,
+            'next_url': next_url, 'first_url': first_url,
+        }
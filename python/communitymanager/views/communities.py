@@ -17,14 +17,21 @@
 # std lib
 from itertools import groupby
 from operator import attrgetter
+import re
 
 # 3rd party
 from pyramid.view import view_config
 from pyramid.renderers import render
 
 # this app
-from communitymanager.views.base import ViewBase, xml_to_dict_list
-from communitymanager.lib import validators
+from communitymanager.views.base import ViewBase, to_dict_list
+from communitymanager.lib import externalsystems, validators
+from communitymanager.lib.fulltext import contains_condition
+
+# largest number of communities json_community_details returns at once
+MAX_DETAILS_BATCH = 200
+
+_id_list_split = re.compile(r'[\s,]+')
 
 
 class Communities(ViewBase):
@@ -36,17 +43,14 @@ class Communities(ViewBase):
 
         external_system_code = request.params.get('ExternalSystem')
         with request.connmgr.get_connection() as conn:
-            sql = 'EXEC sp_Community_l ?, ? ; EXEC sp_External_System_l'
-            cursor = conn.execute(sql, (request.user and request.user.User_ID), external_system_code)
+            cursor = conn.execute('EXEC sp_Community_l ?, ?', (request.user and request.user.User_ID), external_system_code)
 
             communities = cursor.fetchall()
 
-            cursor.nextset()
-
-            external_systems = list(map(tuple, cursor.fetchall()))
-
             cursor.close()
 
+        external_systems = [(x.SystemCode, x.SystemName) for x in externalsystems.registry.list(request)]
+
         communities = {k: list(g) for k, g in groupby(communities, attrgetter('ParentCommunity'))}
 
         request.model_state.form.data['ExternalSystem'] = external_system_code
@@ -66,7 +70,8 @@ class Communities(ViewBase):
         communities = []
         if model_state.validate():
             with request.connmgr.get_connection() as conn:
-                communities = conn.execute('EXEC sp_Community_ls ?,?', (request.user and request.user.User_ID), model_state.value('terms'))
+                terms = model_state.value('terms')
+                communities = conn.execute('EXEC sp_Community_ls ?,?,?', (request.user and request.user.User_ID), terms, contains_condition(terms))
 
         return {'communities': communities}
 
@@ -88,15 +93,15 @@ class Communities(ViewBase):
         if not community:
             return {'fail': True, 'reason': _('Community Not Found.')}
 
-        pcn = xml_to_dict_list(community.ParentCommunityName)
+        pcn = to_dict_list(community.ParentCommunityName)
         if pcn:
             pcn = pcn[0]
         community.ParentCommunityName = pcn
 
-        community.OtherNames = xml_to_dict_list(community.OtherNames)
-        community.ChildCommunities = xml_to_dict_list(community.ChildCommunities)
-        community.SearchCommunities = xml_to_dict_list(community.SearchCommunities)
-        community.Managers = xml_to_dict_list(community.Managers)
+        community.OtherNames = to_dict_list(community.OtherNames)
+        community.ChildCommunities = to_dict_list(community.ChildCommunities)
+        community.SearchCommunities = to_dict_list(community.SearchCommunities)
+        community.Managers = to_dict_list(community.Managers)
 
         community_info = render('community_more_details.mak', {'community': community}, request)
         if community.ParentCommunityName:
@@ -105,3 +110,94 @@ class Communities(ViewBase):
             cm_title = community.Name
 
         return {'fail': False, 'community_info': community_info, 'community_name': cm_title}
+
+    @view_config(route_name="json_community_details", renderer='json', permission='view')
+    def json_community_details(self):
+        request = self.request
+
+        validator = validators.IntID()
+        cm_ids = set()
+        for value in request.params.getall('cmid'):
+            for cm_id in _id_list_split.split(value):
+                try:
+                    cm_id = validator.to_python(cm_id)
+                except validators.Invalid:
+                    continue
+
+                if cm_id:
+                    cm_ids.add(cm_id)
+
+        _ = request.translate
+        if not cm_ids:
+            return {'fail': True, 'reason': _('No communities requested.')}
+
+        if len(cm_ids) > MAX_DETAILS_BATCH:
+            return {'fail': True, 'reason': _('Too many communities requested.')}
+
+        with request.connmgr.get_connection() as conn:
+            cursor = conn.execute('EXEC sp_Community_l_MoreInfo ?', ','.join(map(str, sorted(cm_ids))))
+
+            communities = cursor.fetchall()
+
+            cursor.nextset()
+
+            other_names = cursor.fetchall()
+
+            cursor.nextset()
+
+            children = cursor.fetchall()
+
+            cursor.nextset()
+
+            search_communities = cursor.fetchall()
+
+            cursor.nextset()
+
+            managers = cursor.fetchall()
+
+            cursor.close()
+
+        def by_community(rows, fn):
+            return {k: [fn(x) for x in g] for k, g in groupby(rows, attrgetter('CM_ID'))}
+
+        other_names = by_community(other_names, attrgetter('Name'))
+        children = by_community(children, lambda x: {'cmid': x.Child_CM_ID, 'name': x.Name})
+        search_communities = by_community(search_communities, lambda x: {'cmid': x.Search_CM_ID, 'name': x.Name})
+        managers = by_community(managers, attrgetter('UserName'))
+
+        in_tmpl = _('%s (in %s)')
+
+        def change_info(date, by):
+            date = request.format_date(date) if date else ''
+            if date and by:
+                return '%s (%s)' % (date, by)
+            return date or by or None
+
+        details = {}
+        for community in communities:
+            cm_id = community.CM_ID
+            if community.ParentCommunityName:
+                parent = {'cmid': community.ParentCommunity, 'name': community.ParentCommunityName}
+                title = in_tmpl % (community.Name, community.ParentCommunityName)
+            else:
+                parent = None
+                title = community.Name
+
+            details[str(cm_id)] = {
+                'cmid': cm_id,
+                'name': community.Name,
+                'title': title,
+                'alternative_area': bool(community.AlternativeArea),
+                'province_state': community.ProvinceStateCountry,
+                'parent': parent,
+                'other_names': other_names.get(cm_id, []),
+                'children': children.get(cm_id, []),
+                'search_communities': search_communities.get(cm_id, []),
+                'managers': managers.get(cm_id, []),
+                'created': change_info(community.CREATED_DATE, community.CREATED_BY),
+                'modified': change_info(community.MODIFIED_DATE, community.MODIFIED_BY),
+            }
+
+        missing = sorted(x for x in cm_ids if str(x) not in details)
+
+        return {'fail': False, 'communities': details, 'missing': missing}
@@ -14,9 +14,6 @@
 #  limitations under the License.
 # =========================================================================================
 
-# std lib
-import xml.etree.cElementTree as ET
-
 # 3rd party
 from pyramid.view import view_config
 from pyramid.httpexceptions import HTTPNotFound, HTTPFound
@@ -26,8 +23,10 @@ from markupsafe import Markup
 from formencode.variabledecode import variable_decode
 
 # this app
-from communitymanager.views.base import ViewBase, xml_to_dict_list
-from communitymanager.lib import validators
+from communitymanager.views.base import ViewBase, to_dict_list
+from communitymanager.lib import referencedata, validators
+from communitymanager.lib.communitysave import CommunitySave
+from communitymanager.lib.fulltext import contains_condition
 
 import logging
 log = logging.getLogger('communitymanager.views.community')
@@ -171,57 +170,14 @@ class Community(ViewBase):
         if model_state.validate():
             data = model_state.form.data
             cm_data = data.get('community', {})
-            args = [cm_id if cm_id != 'new' else None,
-                    request.user.User_ID, is_alt_area, cm_data.get('ParentCommunity'),
-                    cm_data.get('ProvinceState'), data.get('ReasonForChange')]
-
-            root = ET.Element('DESCS')
-
-            for culture, description in model_state.form.data['descriptions'].items():
-
-                desc = ET.SubElement(root, 'DESC')
-                ET.SubElement(desc, "Culture").text = culture.replace('_', '-')
-                for name, value in description.items():
-                    if value:
-                        ET.SubElement(desc, name).text = value
-
-            args.append(ET.tostring(root))
-
-            root = ET.Element('NAMES')
-
-            for name in model_state.form.data.get('alt_names') or []:
-                if name.get('Delete') or not name.get('AltName'):
-                    continue
-
-                desc = ET.SubElement(root, 'Name')
-                ET.SubElement(desc, 'Culture').text = name['Culture']
-                ET.SubElement(desc, 'AltName').text = name['AltName']
-
-            args.append(ET.tostring(root))
-
-            if is_alt_area:
-                root = ET.Element('ALTAREAS')
-                for area in data.get('alt_areas') or []:
-                    ET.SubElement(root, 'CM_ID').text = str(area)
-
-                args.append(ET.tostring(root))
-
-            else:
-                args.append(None)
-
-            sql = '''
-                DECLARE @RC int, @CM_ID int, @ErrMsg nvarchar(500)
-
-                SET @CM_ID = ?
-
-                EXEC @RC = sp_Community_u @CM_ID OUTPUT, %s, @ErrMsg OUTPUT
-
-                SELECT @RC AS [Return], @CM_ID AS CM_ID, @ErrMsg AS ErrMsg
-
-                ''' % (', '.join('?' * (len(args) - 1)))
+            save = CommunitySave(cm_id if cm_id != 'new' else None,
+                                 request.user.User_ID, is_alt_area, cm_data.get('ParentCommunity'),
+                                 cm_data.get('ProvinceState'), data.get('ReasonForChange'),
+                                 data['descriptions'], data.get('alt_names') or [],
+                                 data.get('alt_areas') or [])
 
             with request.connmgr.get_connection() as conn:
-                result = conn.execute(sql, args).fetchone()
+                result = save.execute(conn)
 
             if not result.Return:
                 _ = request.translate
@@ -251,17 +207,15 @@ class Community(ViewBase):
         if cm_id != 'new':
             is_alt_area = community.AlternativeArea
 
-        prov_state = []
+        prov_state = referencedata.province_states(request)
         alt_area_name_map = {}
-        with request.connmgr.get_connection() as conn:
-            prov_state = list(map(tuple, conn.execute('SELECT ProvID, ProvinceStateCountry FROM dbo.vw_ProvinceStateCountry ORDER BY DisplayOrder, ProvinceStateCountry').fetchall()))
-
-            if is_alt_area:
+        if is_alt_area:
+            with request.connmgr.get_connection() as conn:
                 alt_area_name_map = {str(x[0]): x[1] for x in conn.execute('EXEC sp_Community_ls_Names ?', ','.join(str(x) for x in alt_areas)).fetchall()}
 
         if community:
-            community.ChildCommunities = xml_to_dict_list(community.ChildCommunities)
-            community.AltSearchArea = xml_to_dict_list(community.AltSearchArea)
+            community.ChildCommunities = to_dict_list(community.ChildCommunities)
+            community.AltSearchArea = to_dict_list(community.AltSearchArea)
 
         log.debug('errors:', model_state.form.errors)
 
@@ -285,13 +239,11 @@ class Community(ViewBase):
         if cm_id != 'new':
             is_alt_area = community.AlternativeArea
 
-        prov_state = []
-        with request.connmgr.get_connection() as conn:
-            prov_state = list(map(tuple, conn.execute('SELECT ProvID, ProvinceStateCountry FROM dbo.vw_ProvinceStateCountry ORDER BY DisplayOrder, ProvinceStateCountry').fetchall()))
+        prov_state = referencedata.province_states(request)
 
         if community:
-            community.ChildCommunities = xml_to_dict_list(community.ChildCommunities)
-            community.AltSearchArea = xml_to_dict_list(community.AltSearchArea)
+            community.ChildCommunities = to_dict_list(community.ChildCommunities)
+            community.AltSearchArea = to_dict_list(community.AltSearchArea)
 
         data = request.model_state.form.data
         data['community'] = community
@@ -415,11 +367,11 @@ class Community(ViewBase):
         search_areas = request.matched_route.name == 'json_search_areas'
         with request.connmgr.get_connection() as conn:
             if search_areas:
-                cursor = conn.execute('EXEC sp_Community_ls_SearchAreaSelector ?, ?, ?, ?',
-                                      request.user.User_ID, cur_cm_id, cur_parent, terms)
+                cursor = conn.execute('EXEC sp_Community_ls_SearchAreaSelector ?, ?, ?, ?, ?',
+                                      request.user.User_ID, cur_cm_id, cur_parent, terms, contains_condition(terms))
             else:
-                cursor = conn.execute('EXEC sp_Community_ls_ParentSelector ?, ?, ?',
-                                      request.user.User_ID, cur_parent, terms)
+                cursor = conn.execute('EXEC sp_Community_ls_ParentSelector ?, ?, ?, ?',
+                                      request.user.User_ID, cur_parent, terms, contains_condition(terms))
 
             cols = ['chkid', 'value', 'label']
 
@@ -16,20 +16,18 @@
 
 # std lib
 import os
-from glob import glob
 from itertools import tee, takewhile, zip_longest, chain, repeat
-import zipfile
-from xml.sax.saxutils import quoteattr
 
 # 3rd party
-import isodate
-from pyramid.response import Response
 from pyramid.view import view_config
 from pyramid.httpexceptions import HTTPFound, HTTPNotFound
 
 # this app
 from communitymanager.views.base import ViewBase
-from communitymanager.lib import const
+from communitymanager.lib import publish, validators
+from communitymanager.lib.compression import Compression
+from communitymanager.lib.fileresponse import file_response
+from communitymanager.lib.manifest import get_manifest, find_output
 
 import logging
 log = logging.getLogger('communitymanager.views.downloads')
@@ -108,18 +106,79 @@ def files_with_logs(files, logs):
 bad_filename_contents = ['/', '\\', '..', ':']
 
 
+# number of snapshots shown with their change logs on the downloads page
+RECENT_DOWNLOADS = 10
+
+CHANGES_PAGE_SIZE = 100
+
+
 class Downloads(ViewBase):
     @view_config(route_name="downloads", renderer='downloads.mak', permission='view')
     def index(self):
         request = self.request
 
+        manifest_files = get_manifest().files()
+        recent = manifest_files[:RECENT_DOWNLOADS]
+        older = manifest_files[RECENT_DOWNLOADS:]
+
+        # only fetch the history covered by the snapshots we show
+        newer_than = older[0].date if older else None
         with request.connmgr.get_connection() as conn:
-            logentries = conn.execute('EXEC sp_Community_ChangeHistory_l').fetchall()
+            logentries = conn.execute('EXEC sp_Community_ChangeHistory_l ?', newer_than).fetchall()
 
-        files = self._get_files()
+        files = ((f.date, f.filename) for f in recent)
         files = list(files_with_logs(files, logentries))
 
-        return {'files': files}
+        outputs = {f.filename: [o for o in f.outputs if o.format != 'xml'] for f in manifest_files}
+
+        return {'files': files, 'older_files': older, 'outputs': outputs}
+
+    @view_config(route_name="download_changes", renderer='download_changes.mak', permission='view')
+    @view_config(route_name="download_changes", renderer='download_changes_fragment.mak', permission='view', xhr=True)
+    def changes(self):
+        request = self.request
+
+        manifest = get_manifest()
+        entry, output = manifest.get(request.matchdict.get('filename'))
+        if entry is None:
+            raise HTTPNotFound()
+
+        validator = validators.IntID()
+        try:
+            cursor = validator.to_python(request.params.get('before'))
+        except validators.Invalid:
+            raise HTTPNotFound()
+
+        files = manifest.files()
+        index = files.index(entry)
+        older = files[index + 1] if index + 1 < len(files) else None
+
+        # files published before the manifest only know their dates
+        newer_than = older_than = after_id = before_id = None
+        if entry.first_hst_id is not None:
+            after_id = entry.first_hst_id - 1
+        elif older is not None:
+            newer_than = older.date
+
+        if entry.last_hst_id is not None:
+            before_id = entry.last_hst_id + 1
+        else:
+            older_than = entry.date
+
+        if cursor is not None:
+            before_id = min(before_id, cursor) if before_id is not None else cursor
+
+        with request.connmgr.get_connection() as conn:
+            logentries = conn.execute('EXEC sp_Community_ChangeHistory_l ?, ?, ?, ?, ?',
+                                      newer_than, older_than, after_id, before_id,
+                                      CHANGES_PAGE_SIZE + 1).fetchall()
+
+        more_url = None
+        if len(logentries) > CHANGES_PAGE_SIZE:
+            logentries = logentries[:CHANGES_PAGE_SIZE]
+            more_url = request.current_route_path(_query=[('before', logentries[-1].HST_ID)])
+
+        return {'entry': entry, 'logentries': logentries, 'more_url': more_url}
 
     @view_config(route_name="download", permission='view')
     def downloadfile(self):
@@ -127,89 +186,51 @@ class Downloads(ViewBase):
 
         filename = request.matchdict.get('filename')
 
-        if not filename.endswith('.xml.zip'):
+        fmt = publish.format_for_filename(filename)
+        if fmt is None:
             raise HTTPNotFound()
 
-        if filename == 'latest.xml.zip':
-            try:
-                filename = next(self._get_files())[1]
-            except StopIteration:
+        manifest = get_manifest()
+        if filename == 'latest' + publish.FORMAT_EXTENSIONS[fmt]:
+            latest = manifest.latest()
+            output = latest and find_output(latest, fmt)
+            if output is None:
                 raise HTTPNotFound()
 
+            # the dated file is immutable, so send clients there and let
+            # only this small redirect be revalidated
+            res = HTTPFound(location=request.route_url('download', filename=output.filename))
+            res.cache_control.no_cache = True
+            return res
+
+        entry, output = manifest.get(filename)
+        if output is None:
+            raise HTTPNotFound()
+
         # this should not happend because the routing engine will not match, but lets be sure
         if any(x in filename for x in bad_filename_contents):
             raise HTTPNotFound()
 
-        fullpath = os.path.join(const.publish_dir, filename)
+        storage = manifest.storage
+        fullpath = storage.path(filename, output.sha256)
 
-        relativepath = os.path.relpath(fullpath, const.publish_dir)
+        # shared storage keeps files in subdirectories, only refuse paths
+        # that escape the storage root
+        relativepath = os.path.relpath(fullpath, storage.root)
 
-        if any(x in relativepath for x in bad_filename_contents):
+        if relativepath.startswith(os.pardir) or os.path.isabs(relativepath):
             raise HTTPNotFound()
 
-        xmlfile = open(fullpath, 'rb')
-        res = Response(content_type='application/zip', app_iter=xmlfile)
-        res.headers['Content-Disposition'] = 'attachment;filename=%s' % filename
-        return res
+        content_type = publish.CONTENT_TYPES[publish.FORMAT_EXTENSIONS[fmt]]
+        return file_response(request, fullpath, filename, content_type=content_type,
+                             etag=output.sha256, immutable=True)
 
     @view_config(route_name="publish", request_method='POST', renderer='publish.mak', permission='edit')
     def publish_post(self):
         request = self.request
 
-        # TODO Add Schema?
-        data = [
-            '''\
-<?xml version="1.0" encoding="UTF-8"?><community_information source=%s>
-<!--
-    All user geography data contributed to the CIOC Community Repository is cc-by 4.0 licensed.
-    For details of the license see: https://creativecommons.org/licenses/by/4.0/
-
-    Our cc-by 4.0 licensing, while intentionally permissive, does *require attribution*:
-
-    "Attribution - You must give appropriate credit, provide a link to the
-            license, and indicate if changes were made. You may do so in any
-            reasonable manner, but not in any way that suggests the licensor
-            endorses you or your use."
-
-    Specifically the attribution requirements are as follows:
-
-      1.  Visually display or otherwise indicate the source of the content as
-          coming from the CIOC Community Repository. This requirement is
-          satisfied with a discreet text blurb, or some other unobtrusive but
-          clear visual indication.
-
-      2.  Ensure that any Internet use of the content includes a hyperlink directly
-          to the CIOC Community Repository (https://community-repository.cioc.ca/) in
-          standard HTML (i.e. not through a Tinyurl or other such indirect hyperlink,
-          form of obfuscation or redirection), without any "nofollow" command or any
-          other such means of avoiding detection by search engines, and visible even
-          with JavaScript disabled.
-
-    Change suggestions can be submitted to https://community-repository.cioc.ca/suggest.
--->
-            ''' % quoteattr(request.host)]
-        with self.request.connmgr.get_connection() as conn:
-            cursor = conn.execute('''
-                                  SELECT CAST(data AS nvarchar(max)) AS data  FROM dbo.vw_CommunityXml
-                                  SELECT GETDATE() AS currentdate
-                                  ''')
-
-            tmp = cursor.fetchall()
-            log.debug('length of tmp: %d', len(tmp))
-            data.extend(x.data for x in tmp)
-
-            cursor.nextset()
-
-            date = cursor.fetchone()[0]
-
-            cursor.close()
-
-        data.append('</community_information>')
-
-        fname = date.isoformat().replace(':', '_') + '.xml'
-        with open(os.path.join(const.publish_dir, fname + '.zip'), 'wb') as f:
-            with zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as zip:
-                zip.writestr(fname, ''.join(data).encode('utf-8'))
+        with request.connmgr.get_connection() as conn:
+            publish.publish_repository(conn, get_manifest(), request.host, request.config.derived('compression', Compression.from_config))
 
         _ = request.translate
         request.session.flash(_('Download Successfully Published'))
@@ -217,15 +238,16 @@ class Downloads(ViewBase):
 
     @view_config(route_name="publish", renderer='publish.mak', permission='edit')
     def publish_get(self):
-        files = list(self._get_files())
-        with self.request.connmgr.get_connection() as conn:
-            logentries = conn.execute('EXEC sp_Community_ChangeHistory_l ?', files[0][0] if files else None).fetchall()
+        latest = get_manifest().latest()
 
-        return {'logentries': logentries}
-
-    def _get_files(self):
-        files = reversed(sorted(glob(os.path.join(const.publish_dir, '*.xml.zip'))))
+        newer_than = after_id = None
+        if latest is not None:
+            if latest.last_hst_id is not None:
+                after_id = latest.last_hst_id
+            else:
+                newer_than = latest.date
 
-        files = (os.path.basename(f) for f in files)
+        with self.request.connmgr.get_connection() as conn:
+            logentries = conn.execute('EXEC sp_Community_ChangeHistory_l ?, NULL, ?', newer_than, after_id).fetchall()
 
-        return ((isodate.parse_datetime(f.rsplit('.', 2)[0].replace('_', ':')), f) for f in files)
+        return {'logentries': logentries}
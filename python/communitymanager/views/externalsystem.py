@@ -14,22 +14,17 @@
 #  limitations under the License.
 # =========================================================================================
 
-# std lib
-from xml.sax.saxutils import quoteattr
-from datetime import datetime
-import tempfile
-import zipfile
-
 # 3rd party
 from pyramid.httpexceptions import HTTPNotFound, HTTPFound
 from pyramid.view import view_config, view_defaults
 from pyramid.security import Allow, DENY_ALL, Everyone
-from pyramid.response import FileIter
 from markupsafe import Markup
 
 # this app
-from communitymanager.lib import validators
-from communitymanager.views.base import ViewBase
+from communitymanager.lib import externalexport, externalsystems, referencedata, validators
+from communitymanager.lib.compression import Compression
+from communitymanager.lib.fulltext import contains_condition
+from communitymanager.views.base import ViewBase, KeysetPager
 
 
 import logging
@@ -44,12 +39,7 @@ class ExternalSystemRoot(object):
         except validators.Invalid:
             raise HTTPNotFound
 
-        with request.connmgr.get_connection() as conn:
-            cursor = conn.execute('EXEC sp_External_System_s ?', system_code)
-
-            self.external_system = cursor.fetchone()
-
-            cursor.close()
+        self.external_system = externalsystems.registry.get(request, system_code)
 
         if self.external_system is None:
             raise HTTPNotFound
@@ -96,6 +86,33 @@ class ExternalCommunitySchema(validators.Schema):
     external_community = ExternalCommunityBaseSchema()
 
 
+EXTERNAL_COMMUNITIES_PAGE_SIZE = 200
+
+# largest page the json listing returns with limit
+EXTERNAL_COMMUNITIES_MAX_LIMIT = 5000
+
+EXTERNAL_COMMUNITY_SORT_OPTIONS = ['hierarchy', 'name', 'parent', 'mapped']
+
+# parameters kept when following the sort and page links
+_list_query_params = ['filter', 'mapped', 'sort', 'desc', 'limit']
+
+
+class ExternalCommunityListSchema(validators.Schema):
+    allow_extra_fields = True
+    filter_extra_fields = True
+    if_key_missing = None
+
+    filter = validators.UnicodeString(max=100)
+    mapped = validators.OneOf(['0', '1'])
+    sort = validators.OneOf(EXTERNAL_COMMUNITY_SORT_OPTIONS)
+    desc = validators.Bool()
+    limit = validators.Int(min=1, max=EXTERNAL_COMMUNITIES_MAX_LIMIT)
+
+    # SortKey and EXT_ID of the last community on the previous page
+    after = validators.UnicodeString(max=450, strip=False)
+    after_id = validators.IntID()
+
+
 @view_defaults(route_name="external_community")
 class ExternalCommunties(ViewBase):
 
@@ -103,18 +120,51 @@ class ExternalCommunties(ViewBase):
     def system_list(self):
         request = self.request
 
+        return {'external_systems': externalsystems.registry.list(request)}
+
+    def _list_params(self):
+        """Return the validated list parameters, or None if they are invalid."""
+        model_state = self.request.model_state
+        model_state.schema = ExternalCommunityListSchema()
+        model_state.method = None
+
+        if model_state.validate():
+            return model_state.data
+
+        return None
+
+    def _list_page(self, params, page_size):
+        """
+        Return one page of the external communities matching params, with the
+        links to the other pages and sort orders.
+        """
+        request = self.request
+        external_system = request.context.external_system
+
+        pager = KeysetPager(request, params, EXTERNAL_COMMUNITY_SORT_OPTIONS, _list_query_params,
+                            params.get('limit') or page_size)
+
+        mapped = params.get('mapped')
+        if mapped is not None:
+            mapped = mapped == '1'
+
         with request.connmgr.get_connection() as conn:
-            external_systems = conn.execute('EXEC sp_External_System_l').fetchall()
+            external_communities = conn.execute('EXEC sp_External_Community_l ?, ?, ?, ?, ?, ?, ?, ?',
+                                                external_system.SystemCode, params.get('filter'), mapped,
+                                                pager.sort, pager.descending, pager.after, pager.after_id,
+                                                pager.page_size + 1).fetchall()
 
-        return {'external_systems': external_systems}
+        external_communities, paging = pager.page(external_communities, 'EXT_ID')
+
+        paging['external_communities'] = external_communities
+        return paging
 
     @view_config(route_name="external_community_list", renderer='externalcommunities.mak', permission='view')
     def list(self):
         request = self.request
         external_system = request.context.external_system
 
-        with request.connmgr.get_connection() as conn:
-            external_communities = conn.execute('EXEC sp_External_Community_l ?', external_system.SystemCode).fetchall()
+        retval = self._list_page(self._list_params() or {}, EXTERNAL_COMMUNITIES_PAGE_SIZE)
 
         can_edit = False
 
@@ -124,7 +174,36 @@ class ExternalCommunties(ViewBase):
         if (user and user.Admin) or external_system.SystemCode in ManageExternalSystemList:
             can_edit = True
 
-        return {'external_communities': external_communities, 'external_system': external_system, 'can_edit': can_edit}
+        retval.update(external_system=external_system, can_edit=can_edit)
+        return retval
+
+    @view_config(route_name="json_external_community_list", renderer='json', permission='view')
+    def json_list(self):
+        request = self.request
+
+        params = self._list_params()
+        if params is None:
+            return {'fail': True, 'errors': request.model_state.errors()}
+
+        page = self._list_page(params, EXTERNAL_COMMUNITIES_PAGE_SIZE)
+
+        communities = [
+            {
+                'ext_id': x.EXT_ID,
+                'area_name': x.AreaName,
+                'external_id': x.ExternalID,
+                'parent_name': x.ParentName,
+                'primary_area_type': x.PrimaryAreaTypeName,
+                'province_state': x.ProvinceStateCountry,
+                'airs_export_type': x.AIRSExportType,
+                'cm_id': x.MappedCM_ID,
+                'mapped_community': x.MappedCommunityName,
+                'mapped_parent': x.MappedParentCommunityName,
+                'duplicate_mapping': x.DuplicateWarning,
+            } for x in page['external_communities']
+        ]
+
+        return {'fail': False, 'communities': communities, 'next': page['next_url'] and request.host_url + page['next_url']}
 
     @view_config(route_name='external_community_add', request_method='POST', renderer='externalcommunity.mak', permission='edit')
     @view_config(match_param='action=edit', request_method='POST', renderer='externalcommunity.mak', permission='edit')
@@ -198,41 +277,26 @@ class ExternalCommunties(ViewBase):
         EXTID = None
 
         external_community = None
-        area_types = []
-        prov_state = []
-        with request.connmgr.get_connection() as conn:
-            if not is_add:
-                EXTID = request.context.EXTID
+        if not is_add:
+            EXTID = request.context.EXTID
 
+            with request.connmgr.get_connection() as conn:
                 cursor = conn.execute('EXEC sp_External_Community_s ?, ?', external_system.SystemCode, EXTID)
 
                 external_community = cursor.fetchone()
 
-                if not external_community:
-                    cursor.close()
-                    raise HTTPNotFound
-
                 cursor.close()
 
-            cursor = conn.execute('EXEC sp_External_Community_s_FormLists')
+            if not external_community:
+                raise HTTPNotFound
 
-            area_types = cursor.fetchall()
-
-            cursor.nextset()
-
-            prov_state = cursor.fetchall()
-
-            cursor.nextset()
-
-            airs_export_types = cursor.fetchall()
-
-            cursor.close()
+        form_lists = referencedata.external_form_lists(request)
 
         return {
             'external_community': external_community,
-            'area_types': list(map(tuple, area_types)),
-            'prov_state': list(map(tuple, prov_state)),
-            'airs_export_types': [x[0] for x in airs_export_types],
+            'area_types': form_lists['area_types'],
+            'prov_state': form_lists['prov_state'],
+            'airs_export_types': form_lists['airs_export_types'],
             'is_add': is_add
         }
 
@@ -311,7 +375,7 @@ class ExternalCommunties(ViewBase):
             except validators.Invalid:
                 ext_id = None
 
-            cursor = conn.execute('EXEC sp_External_Community_ls_ParentSelector ?, ?, ?', SystemCode, ext_id, terms)
+            cursor = conn.execute('EXEC sp_External_Community_ls_ParentSelector ?, ?, ?, ?', SystemCode, ext_id, terms, contains_condition(terms))
 
             cols = ['chkid', 'value', 'label']
 
@@ -336,7 +400,7 @@ class ExternalCommunties(ViewBase):
 
         retval = []
         with request.connmgr.get_connection() as conn:
-            cursor = conn.execute('EXEC sp_Community_ls_Autocomplete ?', terms)
+            cursor = conn.execute('EXEC sp_Community_ls_Autocomplete ?, ?', terms, contains_condition(terms))
 
             cols = ['chkid', 'value', 'label']
 
@@ -353,58 +417,7 @@ class ExternalCommunties(ViewBase):
         request = self.request
         external_system = request.context.external_system
 
-        names = ['SystemCode', 'SystemName', 'CopyrightHolder1', 'CopyrightHolder2', 'ContactEmail']
-        root_parameters = [getattr(external_system, x) for x in names]
-
-        isodate = datetime.now().replace(microsecond=0).isoformat()
-        names.append('date')
-        root_parameters.append(isodate)
-
-        isodate = isodate.replace(':', '-')
-
-        values = [quoteattr(str(x) if x is not None else '') for x in root_parameters]
-        root_parameters = ' '.join('='.join(x) for x in zip(names, values))
-
-        fname = "CommunityMap-%s-%s.xml" % (external_system.SystemCode, isodate)
-
-        file = tempfile.TemporaryFile()
-        with zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED) as zf:
-            with request.connmgr.get_connection() as conn:
-                cursor = conn.execute('EXEC sp_External_Community_l_xml ?', external_system.SystemCode)
-
-                _write_xml_data(root_parameters, cursor, zf, fname)
-
-        length = file.tell()
-        file.seek(0)
-        res = request.response
-        res.content_type = 'application/zip'
-        res.charset = None
-        res.app_iter = FileIter(file)
-        res.content_length = length
-        res.headers['Content-Disposition'] = 'attachment;filename=%s.zip' % fname[:-4]
-        return res
-
-
-def _write_xml_data(root_parameters, cursor, zipfile, fname):
-
-    with zipfile.open(fname, 'w') as file:
-        file.write('<?xml version="1.0" encoding="UTF-8"?>\n'.encode('utf-8'))
-        file.write(('<ExternalSystem %s>\n' % root_parameters).encode('utf-8'))
-
-        for nextset, tagname in enumerate(['ExternalCommunities', 'CommunityMapping']):
-            if nextset:
-                cursor.nextset()
-
-            file.write(('<%s>' % tagname).encode('utf-8'))
-
-            while True:
-                rows = cursor.fetchmany(2000)
-                if not rows:
-                    break
-
-                rows = '\n'.join(x[0] for x in rows) + '\n'
-                file.write(rows.encode('utf-8'))
-
-            file.write(('</%s>' % tagname).encode('utf-8'))
+        with request.connmgr.get_connection() as conn:
+            watermark = conn.execute('EXEC sp_External_Community_s_Watermark ?', external_system.SystemCode).fetchone()
 
-        file.write('</ExternalSystem>\n'.encode('utf-8'))
+        return externalexport.export_response(request, external_system, watermark, request.config.derived('compression', Compression.from_config))
@@ -26,7 +26,7 @@ from formencode import Schema
 from communitymanager.lib.security import check_credentials
 from communitymanager.views.base import ViewBase
 from communitymanager.lib import validators
-from communitymanager.lib.syslanguage import _culture_list, default_culture
+from communitymanager.lib.syslanguage import cultures, default_culture
 
 
 class LoginSchema(Schema):
@@ -65,7 +65,7 @@ class Login(ViewBase):
             return {}
 
         headers = remember(request, user.UserName)
-        start_ln = [x.Culture for x in _culture_list if x.LangID == user.StartLanguage and x.Active]
+        start_ln = [x.Culture for x in cultures() if x.LangID == user.StartLanguage and x.Active]
         if not start_ln:
             start_ln = [default_culture()]
 
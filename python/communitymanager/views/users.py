@@ -24,8 +24,8 @@ from pyramid.view import view_config
 from pyramid.security import NO_PERMISSION_REQUIRED, ALL_PERMISSIONS, Allow, Deny, DENY_ALL
 
 # this app
-from communitymanager.lib import validators, security, email
-from communitymanager.views.base import ViewBase, xml_to_dict_list
+from communitymanager.lib import validators, security, email, externalsystems
+from communitymanager.views.base import ViewBase, KeysetPager
 from communitymanager.lib.request import get_translate_fn
 
 
@@ -111,6 +111,31 @@ TomorrowsDateValidator = validators.Pipe(
     validators.TomorrowsDate(not_empty=True))
 
 
+USERS_PAGE_SIZE = 100
+
+USER_SORT_OPTIONS = ['username', 'name', 'organization']
+
+# parameters kept when following the sort and page links
+_user_list_params = ['name', 'organization', 'admin', 'inactive', 'sort', 'desc', 'show_rejected']
+
+
+class UserListValidator(validators.Schema):
+    allow_extra_fields = True
+    filter_extra_fields = True
+    if_key_missing = None
+
+    name = validators.UnicodeString(max=100)
+    organization = validators.UnicodeString(max=200)
+    admin = validators.OneOf(['0', '1'])
+    inactive = validators.OneOf(['0', '1'])
+    sort = validators.OneOf(USER_SORT_OPTIONS)
+    desc = validators.Bool()
+
+    # SortKey and User_ID of the last user on the previous page
+    after = validators.UnicodeString(max=200, strip=False)
+    after_id = validators.IntID()
+
+
 class ManageUserAddUserWrapper(validators.Schema):
     allow_extra_fields = True
     filter_extra_fields = True
@@ -162,9 +187,43 @@ class Users(ViewBase):
     def index(self):
         request = self.request
 
+        model_state = request.model_state
+        model_state.schema = UserListValidator()
+        model_state.method = None
+
+        if model_state.validate():
+            filters = model_state.data
+        else:
+            filters = {}
+
+        def flag(name):
+            value = filters.get(name)
+            return None if value is None else value == '1'
+
+        pager = KeysetPager(request, filters, USER_SORT_OPTIONS, _user_list_params, USERS_PAGE_SIZE)
+
         rejected_requests = None
         with request.connmgr.get_connection() as conn:
-            users = conn.execute('EXEC sp_Users_l').fetchall()
+            cursor = conn.execute('EXEC sp_Users_l ?, ?, ?, ?, ?, ?, ?, ?, ?',
+                                  filters.get('name'), filters.get('organization'),
+                                  flag('admin'), flag('inactive'), pager.sort, pager.descending,
+                                  pager.after, pager.after_id, USERS_PAGE_SIZE + 1)
+
+            users = cursor.fetchall()
+
+            cursor.nextset()
+
+            manage_communities = {}
+            for row in cursor.fetchall():
+                manage_communities.setdefault(row.User_ID, []).append(row.Name)
+
+            cursor.nextset()
+
+            manage_external = {}
+            for row in cursor.fetchall():
+                manage_external.setdefault(row.User_ID, []).append(row.Name)
+
+            cursor.close()
 
             show_rejected = not not request.params.get('show_rejected')
 
@@ -178,11 +237,14 @@ class Users(ViewBase):
 
             cursor.close()
 
-        for user in users:
-            user.ManageCommunities = [x['Name'] for x in xml_to_dict_list(user.ManageCommunities)]
-            user.ManageExternalSystems = [x['Name'] for x in xml_to_dict_list(user.ManageExternalSystems)]
+        users, paging = pager.page(users, 'User_ID')
 
-        return {'users': users, 'user_requests': user_requests, 'rejected_requests': rejected_requests}
+        retval = {
+            'users': users, 'manage_communities': manage_communities, 'manage_external': manage_external,
+            'user_requests': user_requests, 'rejected_requests': rejected_requests,
+        }
+        retval.update(paging)
+        return retval
 
     @view_config(route_name="user_new", renderer='user.mak', request_method='POST', permission='edit')
     @view_config(route_name="user", renderer='user.mak', request_method='POST', permission='edit')
@@ -433,15 +495,13 @@ class Users(ViewBase):
         if not is_request:
             if is_new:
                 with request.connmgr.get_connection() as conn:
-                    cursor = conn.execute('EXEC sp_Users_AccountRequest_s ?; EXEC sp_External_System_l', reqid)
+                    cursor = conn.execute('EXEC sp_Users_AccountRequest_s ?', reqid)
                     account_request = cursor.fetchone()
 
-                    cursor.nextset()
-
-                    external_systems = cursor.fetchall()
-
                     cursor.close()
 
+                external_systems = externalsystems.registry.list(request)
+
             else:
                 if is_account:
                     with request.connmgr.get_connection() as conn:
@@ -455,12 +515,7 @@ class Users(ViewBase):
                         ex_tmp = cursor.fetchall()
                         cursor.close()
                 else:
-                    with request.connmgr.get_connection() as conn:
-                        cursor = conn.execute('EXEC sp_External_System_l')
-
-                        external_systems = cursor.fetchall()
-
-                        cursor.close()
+                    external_systems = externalsystems.registry.list(request)
 
                     user = request.context.user
                     cm_tmp = request.context.manage_areas
@@ -54,6 +54,10 @@ setup(
     entry_points="""\
       [paste.app_factory]
       main = communitymanager:main
+
+      [console_scripts]
+      communitymanager-export-external = communitymanager.scripts.exportexternal:main
+      communitymanager-publish = communitymanager.scripts.publish:main
       """,
     license="Apache 2.0",
     paster_plugins=["pyramid"],
@@ -0,0 +1,20 @@
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+CREATE FUNCTION [dbo].[fn_HasFullTextIndex](
+	@TableName nvarchar(256)
+)
+RETURNS bit WITH EXECUTE AS CALLER
+AS 
+BEGIN
+
+-- the CommunityNames catalog is optional, procedures searching names use
+-- LIKE when the instance or table has no active full-text index
+RETURN CASE
+	WHEN FULLTEXTSERVICEPROPERTY('IsFullTextInstalled')=1
+		AND OBJECTPROPERTY(OBJECT_ID(@TableName), 'TableHasActiveFulltextIndex')=1
+	THEN 1 ELSE 0 END
+END
+
+GO
@@ -0,0 +1,41 @@
+/*
+	Optional full-text search for the community name procedures.
+
+	Not part of the source controlled schema: run this once against the
+	database on instances with Full-Text Search installed. It creates the
+	CommunityNames catalog and the full-text indexes over Community_Name,
+	Community_AltName and External_Community, keyed on the FT_ID columns
+	and PK_External_Community. Until the indexes exist, fn_HasFullTextIndex
+	returns 0 and the procedures search with LIKE. Safe to run again.
+*/
+
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+IF FULLTEXTSERVICEPROPERTY('IsFullTextInstalled')=1 BEGIN
+	IF NOT EXISTS(SELECT * FROM sys.fulltext_catalogs WHERE name='CommunityNames') BEGIN
+		EXEC('CREATE FULLTEXT CATALOG [CommunityNames]
+			WITH ACCENT_SENSITIVITY = OFF
+			AUTHORIZATION [dbo]')
+	END
+
+	IF NOT EXISTS(SELECT * FROM sys.fulltext_indexes WHERE object_id=OBJECT_ID('dbo.Community_Name')) BEGIN
+		EXEC('CREATE FULLTEXT INDEX ON [dbo].[Community_Name] ([Name] LANGUAGE 0)
+			KEY INDEX [IX_Community_Name_FTID] ON [CommunityNames] WITH STOPLIST OFF')
+	END
+
+	IF NOT EXISTS(SELECT * FROM sys.fulltext_indexes WHERE object_id=OBJECT_ID('dbo.Community_AltName')) BEGIN
+		EXEC('CREATE FULLTEXT INDEX ON [dbo].[Community_AltName] ([AltName] LANGUAGE 0)
+			KEY INDEX [IX_Community_AltName_FTID] ON [CommunityNames] WITH STOPLIST OFF')
+	END
+
+	IF NOT EXISTS(SELECT * FROM sys.fulltext_indexes WHERE object_id=OBJECT_ID('dbo.External_Community')) BEGIN
+		EXEC('CREATE FULLTEXT INDEX ON [dbo].[External_Community] ([AreaName] LANGUAGE 0)
+			KEY INDEX [PK_External_Community] ON [CommunityNames] WITH STOPLIST OFF')
+	END
+END ELSE BEGIN
+	PRINT 'Full-Text Search is not installed, community name searches will use LIKE'
+END
+GO
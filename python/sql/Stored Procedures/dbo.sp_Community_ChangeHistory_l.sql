@@ -4,15 +4,35 @@ SET ANSI_NULLS ON
 GO
 
 CREATE PROCEDURE [dbo].[sp_Community_ChangeHistory_l]
-	@NewerThan smalldatetime = NULL
+	@NewerThan datetime = NULL,
+	@OlderThan datetime = NULL,
+	@AfterHST_ID int = NULL,
+	@BeforeHST_ID int = NULL,
+	@PageSize int = NULL
 AS BEGIN
 
 SET NOCOUNT ON
 
-SELECT * 
+/*
+	Keyset paging: pass the HST_ID of the last row of the previous page
+	as @BeforeHST_ID to get the next (older) page.
+*/
+SELECT TOP (ISNULL(@PageSize, 2147483647))
+	HST_ID,
+	CM_ID,
+	FormerName,
+	CurrentName,
+	ChangeComment,
+	MODIFIED_BY,
+	MODIFIED_DATE,
+	TypeOfChange
 FROM Community_ChangeHistory 
-WHERE @NewerThan IS NULL OR @NewerThan <= MODIFIED_DATE
-ORDER BY MODIFIED_DATE DESC
+WHERE (@NewerThan IS NULL OR MODIFIED_DATE >= @NewerThan)
+	AND (@OlderThan IS NULL OR MODIFIED_DATE < @OlderThan)
+	AND (@AfterHST_ID IS NULL OR HST_ID > @AfterHST_ID)
+	AND (@BeforeHST_ID IS NULL OR HST_ID < @BeforeHST_ID)
+ORDER BY HST_ID DESC
+OPTION (RECOMPILE)
 
 SET NOCOUNT OFF
 
@@ -0,0 +1,57 @@
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+CREATE PROCEDURE [dbo].[sp_Community_DisplayName_u]
+	@CMList [dbo].[IntID_Rows] READONLY,
+	@AllCommunities bit = 0
+WITH EXECUTE AS CALLER
+AS
+BEGIN
+	SET NOCOUNT ON
+
+	/* Community_DisplayName has the name each community is listed under
+		in each language: the Community_Name in that language, or else the
+		one with the lowest LangID. DuplicateName is set when another
+		community has a Community_Name (in any language) that is the same.
+		Run with @AllCommunities=1 to rebuild it. */
+
+	WITH DisplayName (LangID, CM_ID, Name_LangID, Name, DuplicateName) AS
+	(
+		SELECT l.LangID, cm.CM_ID, cmn.LangID, cmn.Name,
+			CAST(CASE WHEN EXISTS(SELECT * FROM Community_Name cmn2 WHERE cmn2.CM_ID<>cm.CM_ID AND cmn2.Name=cmn.Name) THEN 1 ELSE 0 END AS bit)
+		FROM Community cm
+		CROSS JOIN Language l
+		CROSS APPLY (SELECT TOP 1 LangID, Name
+				FROM Community_Name
+				WHERE CM_ID=cm.CM_ID
+				ORDER BY CASE WHEN LangID=l.LangID THEN 0 ELSE 1 END, LangID) cmn
+		WHERE @AllCommunities=1 OR EXISTS(SELECT * FROM @CMList t WHERE t.ID=cm.CM_ID)
+	),
+	Target AS
+	(
+		SELECT cmd.LangID, cmd.CM_ID, cmd.Name_LangID, cmd.Name, cmd.DuplicateName
+		FROM Community_DisplayName cmd
+		WHERE @AllCommunities=1 OR EXISTS(SELECT * FROM @CMList t WHERE t.ID=cmd.CM_ID)
+	)
+	MERGE INTO Target cmd
+	USING DisplayName nt
+		ON cmd.LangID=nt.LangID AND cmd.CM_ID=nt.CM_ID
+	WHEN MATCHED AND (cmd.Name_LangID<>nt.Name_LangID OR cmd.Name<>nt.Name COLLATE Latin1_General_100_CS_AS
+			OR cmd.DuplicateName<>nt.DuplicateName)
+		THEN UPDATE SET Name_LangID=nt.Name_LangID, Name=nt.Name, DuplicateName=nt.DuplicateName
+	WHEN NOT MATCHED BY TARGET
+		THEN INSERT (LangID, CM_ID, Name_LangID, Name, DuplicateName)
+			VALUES (nt.LangID, nt.CM_ID, nt.Name_LangID, nt.Name, nt.DuplicateName)
+	WHEN NOT MATCHED BY SOURCE
+		THEN DELETE
+		;
+
+	SET NOCOUNT OFF
+END
+
+
+GO
+GRANT EXECUTE ON  [dbo].[sp_Community_DisplayName_u] TO [web_user]
+GO
@@ -0,0 +1,75 @@
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+CREATE PROCEDURE [dbo].[sp_Community_SortCode_u]
+	@Parents [dbo].[IntID_Rows] READONLY,
+	@TopLevel bit = 0
+WITH EXECUTE AS CALLER
+AS
+BEGIN
+	SET NOCOUNT ON
+
+	/* Re-rank the children of @Parents (and the communities without a
+		parent when @TopLevel=1) by their LangID=0 name, and update SortCode
+		for those whose rank changed and their subtrees. Communities without
+		a LangID=0 name yet are left for the name trigger to rank. */
+
+	DECLARE @Ranked TABLE (
+		CM_ID int NOT NULL PRIMARY KEY,
+		SortCode varchar(max) NOT NULL
+	)
+
+	INSERT INTO @Ranked (CM_ID, SortCode)
+	SELECT cm.CM_ID,
+		ISNULL(parent.SortCode + '-', '') + CAST(RIGHT('0000000' + CAST(RANK() OVER (PARTITION BY cm.ParentCommunity ORDER BY cmn.Name) AS VARCHAR(3)), 3) AS varchar(MAX))
+	FROM Community cm
+	INNER JOIN Community_Name cmn
+		ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=0
+	LEFT JOIN Community parent
+		ON parent.CM_ID=cm.ParentCommunity
+	WHERE EXISTS(SELECT * FROM @Parents p WHERE p.ID=cm.ParentCommunity)
+		OR (@TopLevel=1 AND cm.ParentCommunity IS NULL)
+
+	-- siblings that kept their rank keep their subtree's SortCode
+	DELETE r
+	FROM @Ranked r
+	INNER JOIN Community cm
+		ON cm.CM_ID=r.CM_ID
+	WHERE cm.SortCode=r.SortCode
+
+	-- start from the topmost changed community of each subtree
+	DELETE r
+	FROM @Ranked r
+	WHERE EXISTS(SELECT *
+		FROM Community_ParentList cmpl
+		INNER JOIN @Ranked r2
+			ON r2.CM_ID=cmpl.Parent_CM_ID
+		WHERE cmpl.CM_ID=r.CM_ID);
+
+	WITH SiblingRank(CM_ID, SortCode) AS 
+	(
+		SELECT CM_ID, SortCode
+		FROM @Ranked
+		UNION ALL
+		SELECT cm.CM_ID, s.SortCode + '-' + CAST(RIGHT('0000000' + CAST(RANK() OVER (ORDER BY cmn.Name) AS VARCHAR(3)), 3) AS varchar(MAX))
+		FROM Community cm
+		INNER JOIN Community_Name cmn
+			ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=0
+		INNER JOIN SiblingRank s
+			ON s.CM_ID=cm.ParentCommunity
+	)
+	UPDATE cm
+		SET SortCode = s.SortCode
+	FROM Community cm
+	INNER JOIN SiblingRank s
+		ON cm.CM_ID=s.CM_ID
+	WHERE cm.SortCode IS NULL OR cm.SortCode<>s.SortCode
+
+	SET NOCOUNT OFF
+END
+
+GO
+GRANT EXECUTE ON  [dbo].[sp_Community_SortCode_u] TO [web_user]
+GO
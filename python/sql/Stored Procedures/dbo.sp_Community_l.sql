@@ -23,8 +23,8 @@ SELECT cm.CM_ID, cmn.Name, cm.AlternativeArea, cm.ParentCommunity,
 		) THEN 1 ELSE 0 END AS CanEdit,
 	CAST(CASE WHEN EXISTS(SELECT * FROM External_Community ec WHERE ec.CM_ID=cm.CM_ID AND ec.SystemCode=@SystemCode) THEN 1 ELSE 0 END AS bit) AS ExternalSystemMatch
 FROM Community cm
-INNER JOIN Community_Name cmn
-	ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cm.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+INNER JOIN Community_DisplayName cmn
+	ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=@@LANGID
 ORDER BY ParentCommunity, cmn.Name
 
 SET NOCOUNT OFF
@@ -0,0 +1,85 @@
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+CREATE PROCEDURE [dbo].[sp_Community_l_MoreInfo]
+	@CMList varchar(MAX)
+WITH EXECUTE AS CALLER
+AS
+BEGIN
+	SET NOCOUNT ON
+
+	DECLARE @Communities TABLE (
+		CM_ID int NOT NULL PRIMARY KEY
+	)
+
+	INSERT INTO @Communities (CM_ID)
+	SELECT DISTINCT cm.CM_ID
+		FROM Community cm
+		INNER JOIN dbo.fn_ParseIntIDList(@CMList, ',') t
+			ON cm.CM_ID=t.ItemID
+
+	-- Communities
+	SELECT	cm.CM_ID, cm.CREATED_DATE, cm.CREATED_BY, cm.MODIFIED_DATE, cm.MODIFIED_BY,
+			cmn.Name, cm.AlternativeArea, pst.ProvinceStateCountry,
+			cm.ParentCommunity, parent.Name AS ParentCommunityName
+	FROM @Communities t
+	INNER JOIN Community cm
+		ON cm.CM_ID=t.CM_ID
+	INNER JOIN Community_Name cmn
+		ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cm.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+	LEFT JOIN Community_Name parent
+		ON parent.CM_ID=cm.ParentCommunity AND parent.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=parent.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+	LEFT JOIN vw_ProvinceStateCountry pst
+		ON cm.ProvinceState=pst.ProvID AND pst.LangID=(SELECT TOP 1 LangID FROM vw_ProvinceStateCountry WHERE ProvID=pst.ProvID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+
+	-- Other Names
+	SELECT DISTINCT nm.CM_ID, nm.Name
+	FROM (
+			SELECT alt.CM_ID, alt.AltName AS Name
+				FROM Community_AltName alt
+				INNER JOIN @Communities t
+					ON alt.CM_ID=t.CM_ID
+			UNION ALL SELECT cmn.CM_ID, cmn.Name
+				FROM Community_Name cmn
+				INNER JOIN @Communities t
+					ON cmn.CM_ID=t.CM_ID
+			WHERE cmn.Name<>(SELECT TOP 1 Name FROM Community_Name WHERE CM_ID=cmn.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+		) nm
+	ORDER BY nm.CM_ID, nm.Name
+
+	-- Child Communities
+	SELECT child.ParentCommunity AS CM_ID, child.CM_ID AS Child_CM_ID, cmn.Name
+	FROM Community child
+	INNER JOIN @Communities t
+		ON child.ParentCommunity=t.CM_ID
+	INNER JOIN Community_Name cmn
+		ON child.CM_ID=cmn.CM_ID AND cmn.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=child.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+	ORDER BY child.ParentCommunity, cmn.Name
+
+	-- Search Communities
+	SELECT aas.CM_ID, aas.Search_CM_ID, cmn.Name
+	FROM Community_AltAreaSearch aas
+	INNER JOIN @Communities t
+		ON aas.CM_ID=t.CM_ID
+	INNER JOIN Community_Name cmn
+		ON aas.Search_CM_ID=cmn.CM_ID AND cmn.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=aas.Search_CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+	ORDER BY aas.CM_ID, cmn.Name
+
+	-- Managers
+	SELECT t.CM_ID, u.UserName, u.Initials
+	FROM @Communities t
+	INNER JOIN Users u
+		ON u.Admin=1
+			OR EXISTS(SELECT * FROM Users_ManageArea uma
+				WHERE u.[User_ID]=uma.[User_ID] AND (uma.CM_ID=t.CM_ID OR EXISTS(SELECT * FROM Community_ParentList cmpl WHERE cmpl.Parent_CM_ID=uma.CM_ID AND cmpl.CM_ID=t.CM_ID)))
+	ORDER BY t.CM_ID, u.UserName
+
+	SET NOCOUNT OFF
+END
+
+
+GO
+GRANT EXECUTE ON  [dbo].[sp_Community_l_MoreInfo] TO [web_user]
+GO
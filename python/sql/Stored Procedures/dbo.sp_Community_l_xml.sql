@@ -0,0 +1,109 @@
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+
+
+CREATE PROCEDURE [dbo].[sp_Community_l_xml]
+AS
+BEGIN
+
+/*
+	The repository export, one record element per row so it can be streamed
+	with fetchmany. Result sets are the province_states, communities and
+	alt_search_areas sections in document order.
+*/
+
+SET NOCOUNT ON
+
+SELECT
+	(SELECT
+		[@id] = ps.ProvID,
+		[@name_or_code] = ps.NameOrCode,
+		[@country] = ps.Country,
+		[names] = (SELECT
+					psn.Name [@value],
+					sl.Culture [@culture]
+				FROM ProvinceState_Name psn
+				INNER JOIN Language sl
+					ON psn.LangID=sl.LangID
+				WHERE ps.ProvID = psn.ProvID
+				FOR XML PATH('name'), TYPE)
+	FOR XML PATH('province_state')) AS row
+FROM ProvinceState ps
+ORDER BY ps.ProvID
+
+SELECT
+	(SELECT
+		[@id] = cm.CM_ID,
+		[@parent_id] = cm.ParentCommunity,
+		[@created_date] = cm.CREATED_DATE,
+		[@modified_date] = cm.MODIFIED_DATE,
+		[@guid] = cm.CM_GUID,
+		[@prov_state] = cm.ProvinceState,
+		[names] = (SELECT
+					cmn.Name [@value],
+					sl.Culture [@culture]
+				FROM Community_Name cmn
+				INNER JOIN Language sl
+					ON cmn.LangID=sl.LangID
+				WHERE cmn.CM_ID = cm.CM_ID
+				FOR XML PATH('name'), TYPE),
+		[alt_names] = (SELECT
+					an.AltName [@value],
+					sl.Culture [@culture]
+				FROM Community_AltName an
+				INNER JOIN Language sl
+					ON an.LangID=sl.LangID
+				WHERE an.CM_ID = cm.CM_ID
+				FOR XML PATH('name'), TYPE)
+	FOR XML PATH('community')) AS row
+FROM Community cm
+WHERE cm.AlternativeArea=0
+ORDER BY cm.Depth, cm.CM_ID
+
+SELECT
+	(SELECT
+		[@id] = cm.CM_ID,
+		[@parent_id] = cm.ParentCommunity,
+		[@created_date] = cm.CREATED_DATE,
+		[@modified_date] = cm.MODIFIED_DATE,
+		[@guid] = cm.CM_GUID,
+		[names] = (SELECT
+					cmn.Name [@value],
+					sl.Culture [@culture]
+				FROM Community_Name cmn
+				INNER JOIN Language sl
+					ON cmn.LangID=sl.LangID
+				WHERE cm.CM_ID = cmn.CM_ID
+				FOR XML PATH('name'), TYPE),
+		[alt_names] = (SELECT
+					an.AltName [@value],
+					sl.Culture [@culture]
+				FROM Community_AltName an
+				INNER JOIN Language sl
+					ON an.LangID=sl.LangID
+				WHERE an.CM_ID = cm.CM_ID
+				FOR XML PATH('name'), TYPE),
+		[search_areas] = (SELECT
+					Search_CM_ID AS [@value]
+				FROM Community_AltAreaSearch aas
+				WHERE aas.CM_ID=cm.CM_ID
+				FOR XML PATH('cm_id'), TYPE)
+	FOR XML PATH('alt_search_area')) AS row
+FROM Community cm
+WHERE cm.AlternativeArea=1
+ORDER BY cm.CM_ID
+
+SET NOCOUNT OFF
+
+END
+
+
+
+GO
+
+
+GRANT EXECUTE ON  [dbo].[sp_Community_l_xml] TO [web_user]
+GO
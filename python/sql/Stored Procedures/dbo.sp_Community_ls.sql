@@ -5,15 +5,30 @@ GO
 
 CREATE PROCEDURE [dbo].[sp_Community_ls]
 	@User_ID int,
-	@searchStr nvarchar(100)
+	@searchStr nvarchar(100),
+	@searchCondition nvarchar(4000) = NULL
 WITH EXECUTE AS CALLER
 AS
 SET NOCOUNT ON
 
+DECLARE @FullText bit = 0
+DECLARE @Matches TABLE (CM_ID int NOT NULL, AltName nvarchar(200) NULL)
+
+IF @searchCondition IS NOT NULL
+		AND dbo.fn_HasFullTextIndex('dbo.Community_Name')=1
+		AND dbo.fn_HasFullTextIndex('dbo.Community_AltName')=1 BEGIN
+	INSERT INTO @Matches (CM_ID, AltName)
+	EXEC sp_Community_ls_FullText @searchCondition
+
+	SET @FullText=1
+END
+
 SELECT DISTINCT cmn.CM_ID, cm.AlternativeArea,
 		cmn.Name
-			+ CASE WHEN cmn.Name LIKE '%' + @searchStr + '%' THEN '' ELSE ' [' + anm.AltName + ']' END
-			+ CASE WHEN EXISTS(SELECT * FROM Community_Name cmn3 WHERE cmn3.CM_ID<>cm.CM_ID AND cmn.Name=cmn3.Name) AND pst.ProvinceStateCountry IS NOT NULL THEN ', ' + pst.ProvinceStateCountry ELSE '' END AS Display,
+			+ CASE WHEN (@FullText=0 AND cmn.Name LIKE '%' + @searchStr + '%')
+					OR (@FullText=1 AND EXISTS(SELECT * FROM @Matches m WHERE m.CM_ID=cm.CM_ID AND m.AltName IS NULL))
+				THEN '' ELSE ' [' + anm.AltName + ']' END
+			+ CASE WHEN cmn.DuplicateName=1 AND pst.ProvinceStateCountry IS NOT NULL THEN ', ' + pst.ProvinceStateCountry ELSE '' END AS Display,
 		cmn2.Name AS ParentCommunityName,
 	CASE WHEN EXISTS(SELECT * FROM Users u
 			WHERE u.[User_ID]=@User_ID AND (
@@ -24,21 +39,22 @@ SELECT DISTINCT cmn.CM_ID, cm.AlternativeArea,
 			)
 		) THEN 1 ELSE 0 END AS CanEdit
 	FROM Community cm
-	INNER JOIN Community_Name cmn
+	INNER JOIN Community_DisplayName cmn
 		ON cm.CM_ID=cmn.CM_ID
-			AND cmn.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cm.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+			AND cmn.LangID=@@LANGID
 	LEFT JOIN Community cm2
 		ON cm.ParentCommunity = cm2.CM_ID
-	LEFT JOIN Community_Name cmn2
+	LEFT JOIN Community_DisplayName cmn2
 		ON cm2.CM_ID=cmn2.CM_ID
-			AND cmn2.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cm2.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+			AND cmn2.LangID=@@LANGID
 	LEFT JOIN Community_AltName anm
 		ON cm.CM_ID=anm.CM_ID AND anm.LangID=@@LANGID
 	LEFT JOIN vw_ProvinceStateCountry pst
-		ON cm.ProvinceState=pst.ProvID AND pst.LangID=(SELECT TOP 1 LangID FROM vw_ProvinceStateCountry WHERE ProvID=pst.ProvID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
-WHERE cmn.Name LIKE '%' + @searchStr + '%'
-	OR anm.AltName LIKE '%' + @searchStr + '%'
+		ON cm.ProvinceState=pst.ProvID AND pst.LangID IS NOT NULL
+WHERE (@FullText=0 AND (cmn.Name LIKE '%' + @searchStr + '%' OR anm.AltName LIKE '%' + @searchStr + '%'))
+	OR (@FullText=1 AND EXISTS(SELECT * FROM @Matches m WHERE m.CM_ID=cm.CM_ID AND (m.AltName IS NULL OR m.AltName=anm.AltName)))
 ORDER BY Display
+OPTION (RECOMPILE)
 
 SET NOCOUNT OFF
 
@@ -7,36 +7,52 @@ GO
 
 
 CREATE PROCEDURE [dbo].[sp_Community_ls_Autocomplete] (
-	@searchStr nvarchar(100)
+	@searchStr nvarchar(100),
+	@searchCondition nvarchar(4000) = NULL
 )
 AS BEGIN
 
 SET NOCOUNT ON
 
+DECLARE @FullText bit = 0
+DECLARE @Matches TABLE (CM_ID int NOT NULL, AltName nvarchar(200) NULL)
+
+IF @searchCondition IS NOT NULL
+		AND dbo.fn_HasFullTextIndex('dbo.Community_Name')=1
+		AND dbo.fn_HasFullTextIndex('dbo.Community_AltName')=1 BEGIN
+	INSERT INTO @Matches (CM_ID, AltName)
+	EXEC sp_Community_ls_FullText @searchCondition
+
+	SET @FullText=1
+END
+
 SELECT	DISTINCT cm.CM_ID, 
 		cmn.Name,
 		cmn.Name
-			+ CASE WHEN cmn.Name LIKE '%' + @searchStr + '%' THEN '' ELSE ' [' + anm.AltName + ']' END
-			+ CASE WHEN EXISTS(SELECT * FROM Community_Name cmn3 WHERE cmn3.CM_ID<>cm.CM_ID AND cmn.Name=cmn3.Name) AND pst.ProvinceStateCountry IS NOT NULL THEN ', ' + pst.ProvinceStateCountry ELSE '' END AS Display,
+			+ CASE WHEN (@FullText=0 AND cmn.Name LIKE '%' + @searchStr + '%')
+					OR (@FullText=1 AND EXISTS(SELECT * FROM @Matches m WHERE m.CM_ID=cm.CM_ID AND m.AltName IS NULL))
+				THEN '' ELSE ' [' + anm.AltName + ']' END
+			+ CASE WHEN cmn.DuplicateName=1 AND pst.ProvinceStateCountry IS NOT NULL THEN ', ' + pst.ProvinceStateCountry ELSE '' END AS Display,
 		cmn2.Name AS ParentCommunityName
 FROM Community cm
-INNER JOIN Community_Name cmn
-	ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cm.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+INNER JOIN Community_DisplayName cmn
+	ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=@@LANGID
 LEFT JOIN Community cm2
 	ON cm.ParentCommunity = cm2.CM_ID
-LEFT JOIN Community_Name cmn2
+LEFT JOIN Community_DisplayName cmn2
 	ON cm2.CM_ID=cmn2.CM_ID
-		AND cmn2.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cm2.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+		AND cmn2.LangID=@@LANGID
 LEFT JOIN Community_AltName anm
 		ON cm.CM_ID=anm.CM_ID AND anm.LangID=@@LANGID
 LEFT JOIN vw_ProvinceStateCountry pst
-		ON cm.ProvinceState=pst.ProvID AND pst.LangID=(SELECT TOP 1 LangID FROM vw_ProvinceStateCountry WHERE ProvID=pst.ProvID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+		ON cm.ProvinceState=pst.ProvID AND pst.LangID IS NOT NULL
 WHERE cm.AlternativeArea=0
 	AND (
-		cmn.Name LIKE '%' + @searchStr + '%'
-		OR anm.AltName LIKE '%' + @searchStr + '%'
+		(@FullText=0 AND (cmn.Name LIKE '%' + @searchStr + '%' OR anm.AltName LIKE '%' + @searchStr + '%'))
+		OR (@FullText=1 AND EXISTS(SELECT * FROM @Matches m WHERE m.CM_ID=cm.CM_ID AND (m.AltName IS NULL OR m.AltName=anm.AltName)))
 	)
 ORDER BY Display
+OPTION (RECOMPILE)
 
 SET NOCOUNT OFF
 
@@ -0,0 +1,36 @@
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+CREATE PROCEDURE [dbo].[sp_Community_ls_FullText] (
+	@searchCondition nvarchar(4000)
+)
+AS BEGIN
+
+/*
+	Communities whose display name or alternate name in the current language
+	match a CONTAINS search condition. AltName is NULL for a display name
+	match. Only called by the sp_Community_ls procedures once
+	fn_HasFullTextIndex has confirmed the indexes exist.
+*/
+
+SET NOCOUNT ON
+
+SELECT cmd.CM_ID, CAST(NULL AS nvarchar(200)) AS AltName
+FROM Community_Name cmn
+INNER JOIN Community_DisplayName cmd
+	ON cmd.CM_ID=cmn.CM_ID AND cmd.LangID=@@LANGID AND cmd.Name_LangID=cmn.LangID
+WHERE CONTAINS(cmn.Name, @searchCondition)
+UNION ALL
+SELECT anm.CM_ID, anm.AltName
+FROM Community_AltName anm
+WHERE anm.LangID=@@LANGID AND CONTAINS(anm.AltName, @searchCondition)
+
+SET NOCOUNT OFF
+
+END
+
+GO
+GRANT EXECUTE ON  [dbo].[sp_Community_ls_FullText] TO [web_user]
+GO
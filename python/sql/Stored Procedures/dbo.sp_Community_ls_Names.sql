@@ -13,13 +13,13 @@ SET NOCOUNT ON
 SELECT DISTINCT cm.CM_ID,
 		cmn.Name,
 		cmn.Name
-			+ CASE WHEN EXISTS(SELECT * FROM Community_Name cmn3 WHERE cmn3.CM_ID<>cm.CM_ID AND cmn.Name=cmn3.Name) AND pst.ProvinceStateCountry IS NOT NULL THEN ', ' + pst.ProvinceStateCountry ELSE '' END AS Display
+			+ CASE WHEN cmn.DuplicateName=1 AND pst.ProvinceStateCountry IS NOT NULL THEN ', ' + pst.ProvinceStateCountry ELSE '' END AS Display
 	FROM Community cm
-	INNER JOIN Community_Name cmn
+	INNER JOIN Community_DisplayName cmn
 		ON cm.CM_ID=cmn.CM_ID
-			AND cmn.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cm.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+			AND cmn.LangID=@@LANGID
 	LEFT JOIN vw_ProvinceStateCountry pst
-		ON cm.ProvinceState=pst.ProvID AND pst.LangID=(SELECT TOP 1 LangID FROM vw_ProvinceStateCountry WHERE ProvID=pst.ProvID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
+		ON cm.ProvinceState=pst.ProvID AND pst.LangID IS NOT NULL
 	INNER JOIN dbo.fn_ParseIntIDList(@CMList, ',') t
 		ON cm.CM_ID=t.ItemID
 ORDER BY Display
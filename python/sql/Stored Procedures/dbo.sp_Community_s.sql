@@ -18,7 +18,7 @@ BEGIN
 		INNER JOIN Community_Name cmn
 			ON cm2.CM_ID=cmn.CM_ID AND LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cmn.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
 			WHERE ParentCommunity=@CM_ID
-		FOR XML AUTO, TYPE) AS ChildCommunities,
+		FOR JSON PATH) AS ChildCommunities,
 		(SELECT cmn.Name
 		 FROM Community_Name cmn
 		 WHERE CM_ID=ParentCommunity AND 
@@ -30,7 +30,7 @@ BEGIN
 		INNER JOIN Community_Name cmn
 			ON cm2.CM_ID=cmn.CM_ID AND LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cmn.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
 			WHERE Search_CM_ID=@CM_ID
-		FOR XML AUTO, TYPE) AS AltSearchArea
+		FOR JSON PATH) AS AltSearchArea
 		FROM Community cm
 		WHERE CM_ID=@CM_ID
 		
@@ -15,7 +15,7 @@ BEGIN
 				FROM Community_Name parent
 				WHERE parent.CM_ID=cm.ParentCommunity
 					AND parent.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=parent.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
-				FOR XML AUTO, TYPE) AS ParentCommunityName,
+				FOR JSON PATH) AS ParentCommunityName,
 			(SELECT DISTINCT nm.Name
 				FROM (
 						SELECT alt.AltName AS Name
@@ -26,26 +26,26 @@ BEGIN
 						WHERE CM_ID=cm.CM_ID AND Name<>cmn.Name
 					) nm
 				ORDER BY nm.Name
-				FOR XML AUTO, TYPE) AS OtherNames,
+				FOR JSON PATH) AS OtherNames,
 			(SELECT CM_ID, Name
 				FROM Community_Name child
 				WHERE LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=child.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
 					AND EXISTS(SELECT * FROM Community WHERE CM_ID=child.CM_ID AND ParentCommunity=cm.CM_ID)
 				ORDER BY Name
-				FOR XML AUTO, TYPE) AS ChildCommunities,
+				FOR JSON PATH) AS ChildCommunities,
 			(SELECT CM_ID, Name
 				FROM Community_Name search
 				WHERE LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=search.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
 					AND EXISTS(SELECT * FROM Community_AltAreaSearch WHERE CM_ID=cm.CM_ID AND Search_CM_ID=search.CM_ID)
 				ORDER BY Name
-				FOR XML AUTO, TYPE) AS SearchCommunities,
+				FOR JSON PATH) AS SearchCommunities,
 			(SELECT UserName, Initials
 				FROM Users u
 				WHERE u.Admin=1
 					OR EXISTS(SELECT * FROM Users_ManageArea uma
 						WHERE u.[User_ID]=uma.[User_ID] AND (uma.CM_ID=cm.CM_ID OR EXISTS(SELECT * FROM Community_ParentList cmpl WHERE cmpl.Parent_CM_ID=uma.CM_ID AND cmpl.CM_ID=cm.CM_ID)))
 				ORDER BY UserName
-				FOR XML AUTO, TYPE) AS Managers
+				FOR JSON PATH) AS Managers
 	FROM Community cm
 	INNER JOIN Community_Name cmn
 		ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cm.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
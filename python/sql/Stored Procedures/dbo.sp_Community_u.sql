@@ -13,7 +13,10 @@ CREATE PROCEDURE [dbo].[sp_Community_u]
 	@Descriptions [xml],
 	@AltNames [xml],
 	@AltSearchAreas [xml],
-	@ErrMsg [nvarchar](500) OUTPUT
+	@ErrMsg [nvarchar](500) OUTPUT,
+	@DescriptionRows [dbo].[Community_Description_Rows] READONLY,
+	@AltNameRows [dbo].[Community_AltName_Rows] READONLY,
+	@AltSearchAreaRows [dbo].[IntID_Rows] READONLY
 WITH EXECUTE AS CALLER
 AS
 SET NOCOUNT ON
@@ -70,6 +73,11 @@ SELECT
 	N.value('Name[1]', 'nvarchar(200)') AS Name/*,
 	N.value('Display[1]', 'nvarchar(200)') AS Display*/
 FROM @Descriptions.nodes('//DESC') as T(N)
+UNION ALL SELECT
+	d.Culture,
+	(SELECT LangID FROM Language sl WHERE sl.Culture = d.Culture AND Active/*Record*/=1) AS LangID,
+	d.Name
+FROM @DescriptionRows d
 
 SELECT @UsedNames = COALESCE(@UsedNames + cioc_shared.dbo.fn_SHR_STP_ObjectName(' ; '),'') + Name
 FROM @DescTable nt
@@ -89,6 +97,11 @@ SELECT DISTINCT
 	(SELECT LangID FROM Language sl WHERE sl.Culture = N.value('Culture[1]', 'varchar(5)') AND Active/*Record*/=1) AS LangID,
 	N.value('AltName[1]', 'nvarchar(200)') AS AltName
 FROM @AltNames.nodes('//Name') as T(N)
+UNION SELECT
+	n.Culture,
+	(SELECT LangID FROM Language sl WHERE sl.Culture = n.Culture AND Active/*Record*/=1) AS LangID,
+	n.AltName
+FROM @AltNameRows n
 
 SELECT @BadAltNameCultures = COALESCE(@BadAltNameCultures + cioc_shared.dbo.fn_SHR_STP_ObjectName(' ; '),'') + ISNULL(Culture,cioc_shared.dbo.fn_SHR_STP_ObjectName('Unknown'))
 FROM @AltNamesTable nt
@@ -101,6 +114,8 @@ IF @AlternativeArea = 1 BEGIN
 	SELECT DISTINCT
 	N.value('.', 'int') AS CM_ID
 	FROM @AltSearchAreas.nodes('//CM_ID') AS T(N)
+	UNION SELECT ID
+	FROM @AltSearchAreaRows
 END
 
 IF @CM_ID IS NOT NULL AND NOT EXISTS (SELECT * FROM Community WHERE CM_ID=@CM_ID) BEGIN
@@ -6,53 +6,89 @@ GO
 
 
 CREATE PROCEDURE [dbo].[sp_External_Community_l] 
-	@SystemCode varchar(30)
+	@SystemCode varchar(30),
+	@Filter nvarchar(100) = NULL,
+	@Mapped bit = NULL,
+	@SortBy varchar(20) = NULL,
+	@Descending bit = 0,
+	@AfterKey nvarchar(450) = NULL,
+	@AfterEXT_ID int = NULL,
+	@PageSize int = NULL
 AS
 BEGIN
 	SET NOCOUNT ON
 
+	/*
+		Keyset paging: pass the SortKey and EXT_ID of the last row of the
+		previous page as @AfterKey and @AfterEXT_ID to get the next page.
+		@SortBy is 'name', 'parent', 'mapped' or NULL for the hierarchy.
+	*/
+
+	DECLARE @Page TABLE (
+		RowNum int IDENTITY(1, 1) PRIMARY KEY,
+		EXT_ID int NOT NULL,
+		SortKey nvarchar(450) NOT NULL
+	)
+
+	INSERT INTO @Page (EXT_ID, SortKey)
+	SELECT TOP (ISNULL(@PageSize, 2147483647)) excm.EXT_ID, s.SortKey
+	FROM External_Community excm
+	LEFT JOIN External_Community excm2
+		ON excm2.EXT_ID=excm.Parent_ID
+	LEFT JOIN Community_DisplayName cmn
+		ON cmn.CM_ID=excm.CM_ID AND cmn.LangID=@@LANGID
+	CROSS APPLY (SELECT CAST(CASE @SortBy
+			WHEN 'name' THEN excm.AreaName
+			WHEN 'parent' THEN ISNULL(excm2.AreaName, '')
+			WHEN 'mapped' THEN ISNULL(cmn.Name, '')
+			ELSE ISNULL(excm.SortCode, '')
+		END AS nvarchar(450)) AS SortKey) s
+	WHERE excm.SystemCode=@SystemCode
+		AND (@Filter IS NULL
+			OR excm.AreaName LIKE '%' + @Filter + '%'
+			OR excm.ExternalID=@Filter
+			OR cmn.Name LIKE '%' + @Filter + '%')
+		AND (@Mapped IS NULL OR (@Mapped=1 AND excm.CM_ID IS NOT NULL) OR (@Mapped=0 AND excm.CM_ID IS NULL))
+		AND (@AfterEXT_ID IS NULL
+			OR (@Descending=0 AND (s.SortKey > @AfterKey OR (s.SortKey=@AfterKey AND excm.EXT_ID > @AfterEXT_ID)))
+			OR (@Descending=1 AND (s.SortKey < @AfterKey OR (s.SortKey=@AfterKey AND excm.EXT_ID < @AfterEXT_ID))))
+	ORDER BY
+		CASE WHEN @Descending=0 THEN s.SortKey END,
+		CASE WHEN @Descending=0 THEN excm.EXT_ID END,
+		CASE WHEN @Descending=1 THEN s.SortKey END DESC,
+		CASE WHEN @Descending=1 THEN excm.EXT_ID END DESC
+	OPTION (RECOMPILE)
+
 	SELECT	excm.EXT_ID,
 			excm.AreaName,
 		    excm.ExternalID,
 			patn.Name AS PrimaryAreaTypeName,
-			-- satn.Name AS SubAreaTypeName,
 			psc.ProvinceStateCountry,
+			excm.CM_ID AS MappedCM_ID,
 			cmn.Name AS MappedCommunityName,
-			--pst.ProvinceStateCountry AS MappedProvinceStateCountry,
 			cmn2.Name AS MappedParentCommunityName,
 			excm2.AreaName AS ParentName,
 			excm.AIRSExportType,
-			CAST(CASE WHEN EXISTS(SELECT * FROM dbo.External_Community ec2 WHERE excm.EXT_ID<>ec2.EXT_ID AND excm.CM_ID=ec2.CM_ID) THEN 1 ELSE 0 END AS bit) AS DuplicateWarning
-	FROM External_Community excm
+			CAST(CASE WHEN EXISTS(SELECT * FROM dbo.External_Community ec2 WHERE excm.EXT_ID<>ec2.EXT_ID AND excm.CM_ID=ec2.CM_ID) THEN 1 ELSE 0 END AS bit) AS DuplicateWarning,
+			p.SortKey
+	FROM @Page p
+	INNER JOIN External_Community excm
+		ON excm.EXT_ID=p.EXT_ID
 	LEFT JOIN External_Community excm2
 		ON excm2.EXT_ID=excm.Parent_ID
 	LEFT JOIN Community_Type pat
 		ON pat.Code = excm.PrimaryAreaType
 	LEFT JOIN Community_Type_Name patn
 		ON patn.Code = pat.Code AND patn.LangID=(SELECT TOP 1 LangID FROM Community_Type_Name WHERE pat.Code=Code ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
-		/*
-	LEFT JOIN Community_Type sat
-		ON sat.Code = excm.SubAreaType
-	LEFT JOIN Community_Type_Name satn
-		ON satn.Code = sat.Code AND satn.LangID=(SELECT TOP 1 LangID FROM Community_Type_Name WHERE sat.Code=Code ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
-		*/
 	LEFT JOIN dbo.vw_ProvinceStateCountry psc
 		ON excm.ProvinceState=psc.ProvID
 	LEFT JOIN Community cm
 		ON cm.CM_ID = excm.CM_ID
-	LEFT JOIN Community_Name cmn
-		ON cmn.CM_ID = cm.CM_ID AND cmn.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE cm.CM_ID=CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
-	LEFT JOIN Community cm2
-		ON cm.ParentCommunity = cm2.CM_ID
-	LEFT JOIN Community_Name cmn2
-		ON cm2.CM_ID=cmn2.CM_ID
-			AND cmn2.LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE CM_ID=cm2.CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
-			/*
-	LEFT JOIN vw_ProvinceStateCountry pst
-		ON cm.ProvinceState=pst.ProvID AND pst.LangID=(SELECT TOP 1 LangID FROM vw_ProvinceStateCountry WHERE ProvID=pst.ProvID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
-		*/
-	WHERE excm.SystemCode=@SystemCode
-	ORDER BY excm.SortCode, AreaName
+	LEFT JOIN Community_DisplayName cmn
+		ON cmn.CM_ID = cm.CM_ID AND cmn.LangID=@@LANGID
+	LEFT JOIN Community_DisplayName cmn2
+		ON cmn2.CM_ID=cm.ParentCommunity AND cmn2.LangID=@@LANGID
+	ORDER BY p.RowNum
 
 	SET NOCOUNT OFF
 END
@@ -0,0 +1,30 @@
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+CREATE PROCEDURE [dbo].[sp_External_Community_ls_FullText] (
+	@SystemCode varchar(30),
+	@searchCondition nvarchar(4000)
+)
+AS BEGIN
+
+/*
+	External communities whose AreaName matches a CONTAINS search condition.
+	Only called by sp_External_Community_ls_ParentSelector once
+	fn_HasFullTextIndex has confirmed the index exists.
+*/
+
+SET NOCOUNT ON
+
+SELECT excm.EXT_ID
+FROM External_Community excm
+WHERE excm.SystemCode=@SystemCode AND CONTAINS(excm.AreaName, @searchCondition)
+
+SET NOCOUNT OFF
+
+END
+
+GO
+GRANT EXECUTE ON  [dbo].[sp_External_Community_ls_FullText] TO [web_user]
+GO
@@ -9,12 +9,23 @@ GO
 CREATE PROCEDURE [dbo].[sp_External_Community_ls_ParentSelector] (
 	@SystemCode varchar(30),
 	@EXT_ID int,
-	@searchStr nvarchar(100)
+	@searchStr nvarchar(100),
+	@searchCondition nvarchar(4000) = NULL
 )
 AS BEGIN
 
 SET NOCOUNT ON
 
+DECLARE @FullText bit = 0
+DECLARE @Matches TABLE (EXT_ID int NOT NULL PRIMARY KEY)
+
+IF @searchCondition IS NOT NULL AND dbo.fn_HasFullTextIndex('dbo.External_Community')=1 BEGIN
+	INSERT INTO @Matches (EXT_ID)
+	EXEC sp_External_Community_ls_FullText @SystemCode, @searchCondition
+
+	SET @FullText=1
+END
+
 SELECT excm.EXT_ID, 
 	excm.AreaName, 
 	excm.AreaName 
@@ -25,10 +36,15 @@ LEFT JOIN vw_ProvinceStateCountry pst
 		ON excm.ProvinceState=pst.ProvID AND pst.LangID=(SELECT TOP 1 LangID FROM vw_ProvinceStateCountry WHERE ProvID=pst.ProvID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
 LEFT JOIN External_Community excm2
 	ON excm2.EXT_ID=excm.Parent_ID
-WHERE excm.SystemCode = @SystemCode AND excm.AreaName LIKE '%' + @searchStr + '%'
+WHERE excm.SystemCode = @SystemCode
+AND (
+	(@FullText=0 AND excm.AreaName LIKE '%' + @searchStr + '%')
+	OR (@FullText=1 AND excm.EXT_ID IN (SELECT EXT_ID FROM @Matches))
+)
 AND (@EXT_ID IS NULL OR excm.EXT_ID<>@EXT_ID)
 
 ORDER BY excm.AreaName
+OPTION (RECOMPILE)
 
 SET NOCOUNT OFF
 
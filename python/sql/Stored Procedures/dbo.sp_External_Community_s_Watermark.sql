@@ -0,0 +1,43 @@
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+
+
+CREATE PROCEDURE [dbo].[sp_External_Community_s_Watermark] 
+	@SystemCode varchar(30)
+AS
+BEGIN
+
+SET NOCOUNT ON
+
+/*
+	Summarises everything the sp_External_Community_l_xml export depends on.
+	Every Community change is logged in Community_ChangeHistory, so its
+	last HST_ID covers the community side of the mapping. Any insert or
+	update raises a table's MAX(RowVersion) and a delete alone lowers its
+	count, so unlike a checksum these cannot miss a change.
+*/
+SELECT
+	(SELECT MAX(HST_ID) FROM dbo.Community_ChangeHistory) AS LastHST_ID,
+	(SELECT COUNT(*) FROM dbo.External_Community WHERE SystemCode=@SystemCode) AS ExternalCount,
+	(SELECT CAST(MAX([RowVersion]) AS bigint) FROM dbo.External_Community WHERE SystemCode=@SystemCode) AS ExternalVersion,
+	(SELECT CAST([RowVersion] AS bigint) FROM dbo.External_System WHERE SystemCode=@SystemCode) AS SystemVersion,
+	(SELECT COUNT(*) FROM dbo.ProvinceState) AS ProvinceStateCount,
+	(SELECT CAST(MAX([RowVersion]) AS bigint) FROM dbo.ProvinceState) AS ProvinceStateVersion
+
+SET NOCOUNT OFF
+
+END
+
+
+
+
+
+
+GO
+
+
+GRANT EXECUTE ON  [dbo].[sp_External_Community_s_Watermark] TO [web_user]
+GO
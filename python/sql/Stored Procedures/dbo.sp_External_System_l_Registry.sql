@@ -0,0 +1,24 @@
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+CREATE PROCEDURE [dbo].[sp_External_System_l_Registry] 
+AS
+BEGIN
+	SET NOCOUNT ON
+
+	SELECT	(SELECT COUNT(*) FROM External_System) AS SystemCount,
+			(SELECT CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM External_System) AS SystemChecksum
+
+	SELECT * FROM External_System ORDER BY SystemName
+
+	SET NOCOUNT OFF
+END
+
+
+
+
+GO
+GRANT EXECUTE ON  [dbo].[sp_External_System_l_Registry] TO [web_user]
+GO
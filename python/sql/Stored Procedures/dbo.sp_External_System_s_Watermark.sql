@@ -0,0 +1,22 @@
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+CREATE PROCEDURE [dbo].[sp_External_System_s_Watermark] 
+AS
+BEGIN
+	SET NOCOUNT ON
+
+	SELECT	(SELECT COUNT(*) FROM External_System) AS SystemCount,
+			(SELECT CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM External_System) AS SystemChecksum
+
+	SET NOCOUNT OFF
+END
+
+
+
+
+GO
+GRANT EXECUTE ON  [dbo].[sp_External_System_s_Watermark] TO [web_user]
+GO
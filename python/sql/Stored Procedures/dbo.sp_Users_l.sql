@@ -5,24 +5,81 @@ SET ANSI_NULLS ON
 GO
 
 CREATE PROCEDURE [dbo].[sp_Users_l]
+	@Name varchar(100) = NULL,
+	@Organization varchar(200) = NULL,
+	@Admin bit = NULL,
+	@Inactive bit = NULL,
+	@SortBy varchar(20) = NULL,
+	@Descending bit = 0,
+	@AfterKey varchar(200) = NULL,
+	@AfterUser_ID int = NULL,
+	@PageSize int = NULL
 AS BEGIN
 
 SET NOCOUNT ON
 
-SELECT *, (SELECT Name 
-			FROM Community_Name cmn
-			INNER JOIN Users_ManageArea	uma
-				ON cmn.CM_ID=uma.CM_ID AND LangID=(SELECT TOP 1 LangID FROM Community_Name WHERE cmn.CM_ID=CM_ID ORDER BY CASE WHEN LangID=@@LANGID THEN 0 ELSE 1 END, LangID)
-			WHERE uma.User_ID=u.User_ID
-			FOR XML AUTO, TYPE) AS ManageCommunities,
-			(SELECT ISNULL(SystemName, es.SystemCode) AS Name 
-			FROM External_System es
-			INNER JOIN Users_ManageExternalSystem umx
-				ON umx.SystemCode = es.SystemCode
-			WHERE umx.User_ID=u.User_ID
-			FOR XML AUTO, TYPE) AS ManageExternalSystems
+/*
+	Keyset paging: pass the SortKey and User_ID of the last row of the
+	previous page as @AfterKey and @AfterUser_ID to get the next page.
+	@SortBy is 'name', 'organization' or NULL for the user name.
+
+	The community and external system names each user on the page manages
+	are returned in the second and third result sets.
+*/
+
+DECLARE @Page TABLE (
+	RowNum int IDENTITY(1, 1) PRIMARY KEY,
+	[User_ID] int NOT NULL,
+	SortKey varchar(200) NOT NULL
+)
+
+INSERT INTO @Page ([User_ID], SortKey)
+SELECT TOP (ISNULL(@PageSize, 2147483647)) u.[User_ID], s.SortKey
 FROM Users u
-ORDER BY Inactive, CASE WHEN Admin = 1 THEN 0 ELSE 1 END, CASE WHEN ManageAreaList IS NOT NULL THEN 1 ELSE 0 END, u.UserName
+CROSS APPLY (SELECT CAST(CASE @SortBy
+		WHEN 'name' THEN u.LastName + ', ' + u.FirstName
+		WHEN 'organization' THEN ISNULL(u.Organization, '')
+		ELSE u.UserName
+	END AS varchar(200)) AS SortKey) s
+WHERE (@Name IS NULL
+		OR u.UserName LIKE '%' + @Name + '%'
+		OR u.FirstName + ' ' + u.LastName LIKE '%' + @Name + '%'
+		OR u.Initials=@Name)
+	AND (@Organization IS NULL OR u.Organization LIKE '%' + @Organization + '%')
+	AND (@Admin IS NULL OR u.[Admin]=@Admin)
+	AND (@Inactive IS NULL OR u.Inactive=@Inactive)
+	AND (@AfterUser_ID IS NULL
+		OR (@Descending=0 AND (s.SortKey > @AfterKey OR (s.SortKey=@AfterKey AND u.[User_ID] > @AfterUser_ID)))
+		OR (@Descending=1 AND (s.SortKey < @AfterKey OR (s.SortKey=@AfterKey AND u.[User_ID] < @AfterUser_ID))))
+ORDER BY
+	CASE WHEN @Descending=0 THEN s.SortKey END,
+	CASE WHEN @Descending=0 THEN u.[User_ID] END,
+	CASE WHEN @Descending=1 THEN s.SortKey END DESC,
+	CASE WHEN @Descending=1 THEN u.[User_ID] END DESC
+OPTION (RECOMPILE)
+
+SELECT u.[User_ID], u.UserName, u.FirstName, u.LastName, u.Initials, u.Organization, u.Email,
+		u.[Admin], u.Inactive, p.SortKey
+FROM @Page p
+INNER JOIN Users u
+	ON u.[User_ID]=p.[User_ID]
+ORDER BY p.RowNum
+
+SELECT uma.[User_ID], cmn.Name
+FROM @Page p
+INNER JOIN Users_ManageArea uma
+	ON uma.[User_ID]=p.[User_ID]
+INNER JOIN Community_DisplayName cmn
+	ON cmn.CM_ID=uma.CM_ID AND cmn.LangID=@@LANGID
+ORDER BY uma.[User_ID], cmn.Name
+
+SELECT umx.[User_ID], ISNULL(es.SystemName, es.SystemCode) AS Name
+FROM @Page p
+INNER JOIN Users_ManageExternalSystem umx
+	ON umx.[User_ID]=p.[User_ID]
+INNER JOIN External_System es
+	ON es.SystemCode=umx.SystemCode
+ORDER BY umx.[User_ID], Name
 
 SET NOCOUNT OFF
 
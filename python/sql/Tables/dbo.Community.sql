@@ -40,50 +40,95 @@ BEGIN
 		INNER JOIN inserted i ON i.CM_ID=cmn.CM_ID
 	END
 	
-	IF UPDATE(ParentCommunity) BEGIN		
-		WITH ParentList (CM_ID, Parent_CM_ID) AS
-		(
-			SELECT CM_ID, ParentCommunity
-			FROM Community
-			WHERE ParentCommunity IS NOT NULL
-		  UNION ALL
-			SELECT cm1.CM_ID, p.Parent_CM_ID
-			FROM Community cm1
-			INNER JOIN ParentList p
-				ON cm1.ParentCommunity=p.CM_ID
+	IF UPDATE(ParentCommunity) BEGIN
+		/* Only the communities whose parent actually changed (or that are new)
+			and everything below them get new Community_ParentList rows and
+			Depth. SortCode changes for those and for the siblings under the
+			old and new parents whose rank moved, with their subtrees. A new
+			community has no name yet, tr_Community_Name_iud ranks it once
+			its LangID=0 name is saved. */
+		DECLARE @Moved TABLE (
+			CM_ID int NOT NULL PRIMARY KEY,
+			IsNew bit NOT NULL,
+			OldParent int NULL,
+			NewParent int NULL
 		)
-		
-		MERGE INTO Community_ParentList AS cmpl
-		USING ParentList AS p
-		ON cmpl.CM_ID=p.CM_ID AND cmpl.Parent_CM_ID=p.Parent_CM_ID
-		WHEN NOT MATCHED BY TARGET
-			THEN INSERT (CM_ID, Parent_CM_ID) VALUES (p.CM_ID, p.Parent_CM_ID)
-		WHEN NOT MATCHED BY SOURCE
-			THEN DELETE
-		OPTION (MAXRECURSION 30);
-		
-		WITH SiblingRank(CM_ID, SortCode) AS 
-		(
-			SELECT cm.CM_ID, CAST(RIGHT('0000000' + CAST(RANK() OVER (ORDER BY cmn.Name) AS VARCHAR(3)), 3) AS varchar(MAX))
-			FROM Community cm
-			INNER JOIN Community_Name cmn
-				ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=0
-			WHERE ParentCommunity IS NULL
-			UNION ALL
-			SELECT cm.CM_ID, s.SortCode + '-' + CAST(RIGHT('0000000' + CAST(RANK() OVER (ORDER BY cmn.Name) AS VARCHAR(3)), 3) AS varchar(MAX))
+
+		INSERT INTO @Moved (CM_ID, IsNew, OldParent, NewParent)
+		SELECT i.CM_ID, CASE WHEN d.CM_ID IS NULL THEN 1 ELSE 0 END, d.ParentCommunity, i.ParentCommunity
+		FROM inserted i
+		LEFT JOIN deleted d
+			ON d.CM_ID=i.CM_ID
+		WHERE d.CM_ID IS NULL
+			OR ISNULL(d.ParentCommunity, -1)<>ISNULL(i.ParentCommunity, -1)
+
+		IF EXISTS(SELECT * FROM @Moved) BEGIN
+			DECLARE @Affected TABLE (
+				CM_ID int NOT NULL PRIMARY KEY
+			)
+
+			INSERT INTO @Affected (CM_ID)
+			SELECT CM_ID
+			FROM @Moved
+			UNION
+			SELECT cmpl.CM_ID
+			FROM Community_ParentList cmpl
+			INNER JOIN @Moved m
+				ON cmpl.Parent_CM_ID=m.CM_ID;
+
+			WITH ParentList (CM_ID, Parent_CM_ID) AS
+			(
+				SELECT cm.CM_ID, cm.ParentCommunity
+				FROM Community cm
+				INNER JOIN @Affected a
+					ON a.CM_ID=cm.CM_ID
+				WHERE cm.ParentCommunity IS NOT NULL
+			  UNION ALL
+				SELECT p.CM_ID, cm.ParentCommunity
+				FROM ParentList p
+				INNER JOIN Community cm
+					ON cm.CM_ID=p.Parent_CM_ID
+				WHERE cm.ParentCommunity IS NOT NULL
+			),
+			AffectedParentList AS
+			(
+				SELECT cmpl.CM_ID, cmpl.Parent_CM_ID
+				FROM Community_ParentList cmpl
+				WHERE EXISTS(SELECT * FROM @Affected a WHERE a.CM_ID=cmpl.CM_ID)
+			)
+			MERGE INTO AffectedParentList AS cmpl
+			USING ParentList AS p
+			ON cmpl.CM_ID=p.CM_ID AND cmpl.Parent_CM_ID=p.Parent_CM_ID
+			WHEN NOT MATCHED BY TARGET
+				THEN INSERT (CM_ID, Parent_CM_ID) VALUES (p.CM_ID, p.Parent_CM_ID)
+			WHEN NOT MATCHED BY SOURCE
+				THEN DELETE
+			OPTION (MAXRECURSION 30);
+
+			UPDATE cm
+				SET Depth = (SELECT COUNT(*) FROM Community_ParentList WHERE CM_ID=cm.CM_ID)
 			FROM Community cm
-			INNER JOIN Community_Name cmn
-				ON cm.CM_ID=cmn.CM_ID AND cmn.LangID=0
-			INNER JOIN SiblingRank s
-				ON s.CM_ID=cm.ParentCommunity
-		)	
-		UPDATE cm
-			SET
-				Depth = (SELECT COUNT(*) FROM Community_ParentList WHERE CM_ID=cm.CM_ID),
-				SortCode = s.SortCode
-		FROM Community cm
-		INNER JOIN SiblingRank s
-			ON cm.CM_ID=s.CM_ID
+			INNER JOIN @Affected a
+				ON a.CM_ID=cm.CM_ID
+
+			-- re-rank under the old and new parents
+			DECLARE @Parents dbo.IntID_Rows, @TopLevel bit
+
+			INSERT INTO @Parents (ID)
+			SELECT OldParent
+			FROM @Moved
+			WHERE IsNew=0 AND OldParent IS NOT NULL
+			UNION
+			SELECT NewParent
+			FROM @Moved
+			WHERE NewParent IS NOT NULL
+
+			SET @TopLevel = CASE WHEN EXISTS(SELECT * FROM @Moved
+					WHERE (IsNew=0 AND OldParent IS NULL) OR NewParent IS NULL)
+				THEN 1 ELSE 0 END
+
+			EXEC sp_Community_SortCode_u @Parents, @TopLevel
+		END
 	END
 
 	SET NOCOUNT OFF
@@ -15,3 +15,5 @@ ALTER TABLE [dbo].[Community_ChangeHistory] ADD CONSTRAINT [PK_Community_ChangeH
 GO
 ALTER TABLE [dbo].[Community_ChangeHistory] ADD CONSTRAINT [FK_Community_ChangeHistory_Community] FOREIGN KEY ([CM_ID]) REFERENCES [dbo].[Community] ([CM_ID]) ON DELETE SET NULL ON UPDATE CASCADE
 GO
+CREATE NONCLUSTERED INDEX [IX_Community_ChangeHistory_ModifiedDate] ON [dbo].[Community_ChangeHistory] ([MODIFIED_DATE]) ON [PRIMARY]
+GO
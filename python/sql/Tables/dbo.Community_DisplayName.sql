@@ -0,0 +1,17 @@
+CREATE TABLE [dbo].[Community_DisplayName]
+(
+[LangID] [smallint] NOT NULL,
+[CM_ID] [int] NOT NULL,
+[Name_LangID] [smallint] NOT NULL,
+[Name] [nvarchar] (200) COLLATE Latin1_General_100_CI_AI NOT NULL,
+[DuplicateName] [bit] NOT NULL CONSTRAINT [DF_Community_DisplayName_DuplicateName] DEFAULT ((0))
+) ON [PRIMARY]
+GO
+ALTER TABLE [dbo].[Community_DisplayName] ADD CONSTRAINT [PK_Community_DisplayName] PRIMARY KEY CLUSTERED  ([LangID], [CM_ID]) ON [PRIMARY]
+GO
+CREATE NONCLUSTERED INDEX [IX_Community_DisplayName_LangIDNameInclCMID] ON [dbo].[Community_DisplayName] ([LangID], [Name]) INCLUDE ([CM_ID]) ON [PRIMARY]
+GO
+ALTER TABLE [dbo].[Community_DisplayName] ADD CONSTRAINT [FK_Community_DisplayName_Community] FOREIGN KEY ([CM_ID]) REFERENCES [dbo].[Community] ([CM_ID]) ON DELETE CASCADE ON UPDATE CASCADE
+GO
+ALTER TABLE [dbo].[Community_DisplayName] ADD CONSTRAINT [FK_Community_DisplayName_Language] FOREIGN KEY ([LangID]) REFERENCES [dbo].[Language] ([LangID]) ON DELETE CASCADE
+GO
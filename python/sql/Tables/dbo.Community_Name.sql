@@ -3,9 +3,69 @@ CREATE TABLE [dbo].[Community_Name]
 [CM_ID] [int] NOT NULL,
 [LangID] [smallint] NOT NULL,
 [Name] [nvarchar] (200) COLLATE Latin1_General_100_CI_AI NOT NULL,
-[ProvinceStateCache] [int] NULL
+[ProvinceStateCache] [int] NULL,
+[FT_ID] [int] NOT NULL IDENTITY(1, 1)
 ) ON [PRIMARY]
 GO
+
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+CREATE TRIGGER [dbo].[tr_Community_Name_iud] ON [dbo].[Community_Name]
+FOR INSERT, DELETE, UPDATE AS 
+BEGIN
+	SET NOCOUNT ON
+
+	-- tr_Community_iu only touches ProvinceStateCache, which is not shown
+	IF UPDATE(CM_ID) OR UPDATE(LangID) OR UPDATE(Name) OR NOT EXISTS(SELECT * FROM inserted) BEGIN
+		DECLARE @CMList dbo.IntID_Rows
+
+		INSERT INTO @CMList (ID)
+		SELECT CM_ID FROM inserted
+		UNION
+		SELECT CM_ID FROM deleted
+
+		IF EXISTS(SELECT * FROM @CMList) BEGIN
+			EXEC sp_Community_DisplayName_u @CMList
+
+			-- other communities listed under a name that was added or removed
+			UPDATE cmd
+				SET DuplicateName=d.DuplicateName
+			FROM Community_DisplayName cmd
+			CROSS APPLY (SELECT CAST(CASE WHEN EXISTS(SELECT * FROM Community_Name cmn WHERE cmn.CM_ID<>cmd.CM_ID AND cmn.Name=cmd.Name) THEN 1 ELSE 0 END AS bit) AS DuplicateName) d
+			WHERE cmd.Name IN (SELECT Name FROM inserted UNION SELECT Name FROM deleted)
+				AND NOT EXISTS(SELECT * FROM @CMList t WHERE t.ID=cmd.CM_ID)
+				AND cmd.DuplicateName<>d.DuplicateName
+
+			-- SortCode ranks siblings by their LangID=0 name
+			IF EXISTS(SELECT * FROM inserted WHERE LangID=0) OR EXISTS(SELECT * FROM deleted WHERE LangID=0) BEGIN
+				DECLARE @Parents dbo.IntID_Rows, @TopLevel bit
+
+				INSERT INTO @Parents (ID)
+				SELECT DISTINCT cm.ParentCommunity
+				FROM Community cm
+				WHERE cm.ParentCommunity IS NOT NULL
+					AND cm.CM_ID IN (SELECT CM_ID FROM inserted WHERE LangID=0 UNION SELECT CM_ID FROM deleted WHERE LangID=0)
+
+				SET @TopLevel = CASE WHEN EXISTS(SELECT * FROM Community cm
+						WHERE cm.ParentCommunity IS NULL
+							AND cm.CM_ID IN (SELECT CM_ID FROM inserted WHERE LangID=0 UNION SELECT CM_ID FROM deleted WHERE LangID=0))
+					THEN 1 ELSE 0 END
+
+				IF @TopLevel=1 OR EXISTS(SELECT * FROM @Parents) BEGIN
+					EXEC sp_Community_SortCode_u @Parents, @TopLevel
+				END
+			END
+		END
+	END
+
+	SET NOCOUNT OFF
+END
+
+GO
+
 ALTER TABLE [dbo].[Community_Name] ADD CONSTRAINT [PK_Community_Name] PRIMARY KEY CLUSTERED  ([CM_ID], [LangID]) ON [PRIMARY]
 GO
 CREATE NONCLUSTERED INDEX [IX_Community_Name_CMIDInclLangID] ON [dbo].[Community_Name] ([CM_ID]) INCLUDE ([LangID]) ON [PRIMARY]
@@ -16,6 +76,8 @@ CREATE UNIQUE NONCLUSTERED INDEX [IX_Community_Name_UniqueName] ON [dbo].[Commun
 GO
 CREATE UNIQUE NONCLUSTERED INDEX [IX_Community_Name_NameLangIDInclCMID] ON [dbo].[Community_Name] ([Name], [LangID], [ProvinceStateCache]) INCLUDE ([CM_ID]) ON [PRIMARY]
 GO
+CREATE UNIQUE NONCLUSTERED INDEX [IX_Community_Name_FTID] ON [dbo].[Community_Name] ([FT_ID]) ON [PRIMARY]
+GO
 ALTER TABLE [dbo].[Community_Name] ADD CONSTRAINT [FK_Community_Name_Community] FOREIGN KEY ([CM_ID]) REFERENCES [dbo].[Community] ([CM_ID]) ON DELETE CASCADE ON UPDATE CASCADE
 GO
 ALTER TABLE [dbo].[Community_Name] ADD CONSTRAINT [FK_Community_Name_Language] FOREIGN KEY ([LangID]) REFERENCES [dbo].[Language] ([LangID])
@@ -5,7 +5,8 @@ CREATE TABLE [dbo].[External_System]
 [CopyrightHolder1] [nvarchar] (255) COLLATE Latin1_General_100_CI_AI NULL,
 [CopyrightHolder2] [nvarchar] (255) COLLATE Latin1_General_100_CI_AI NULL,
 [Description] [nvarchar] (255) COLLATE Latin1_General_100_CI_AI NULL,
-[ContactEmail] [varchar] (60) COLLATE Latin1_General_100_CI_AI NULL
+[ContactEmail] [varchar] (60) COLLATE Latin1_General_100_CI_AI NULL,
+[RowVersion] [rowversion] NOT NULL
 ) ON [PRIMARY]
 GO
 ALTER TABLE [dbo].[External_System] ADD CONSTRAINT [PK_External_System] PRIMARY KEY CLUSTERED  ([SystemCode]) ON [PRIMARY]
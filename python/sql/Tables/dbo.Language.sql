@@ -10,6 +10,25 @@ CREATE TABLE [dbo].[Language]
 [DateFormatCode] [int] NOT NULL CONSTRAINT [DF_Language_DateFormatCode] DEFAULT ((106))
 ) ON [PRIMARY]
 GO
+
+SET QUOTED_IDENTIFIER ON
+GO
+SET ANSI_NULLS ON
+GO
+
+CREATE TRIGGER [dbo].[tr_Language_i] ON [dbo].[Language]
+FOR INSERT AS 
+BEGIN
+	SET NOCOUNT ON
+
+	-- every community needs a display name in the new language
+	EXEC sp_Community_DisplayName_u @AllCommunities=1
+
+	SET NOCOUNT OFF
+END
+
+GO
+
 ALTER TABLE [dbo].[Language] ADD CONSTRAINT [PK_Language] PRIMARY KEY CLUSTERED  ([LangID]) ON [PRIMARY]
 GO
 CREATE UNIQUE NONCLUSTERED INDEX [IX_Language_LangIDIncl] ON [dbo].[Language] ([LangID]) INCLUDE ([DateFormatCode]) ON [PRIMARY]
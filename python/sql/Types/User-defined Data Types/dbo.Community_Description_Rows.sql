@@ -0,0 +1,8 @@
+CREATE TYPE [dbo].[Community_Description_Rows] AS TABLE
+(
+[Culture] [varchar] (5) COLLATE Latin1_General_100_CI_AI NOT NULL,
+[Name] [nvarchar] (200) COLLATE Latin1_General_100_CI_AI NULL
+)
+GO
+GRANT EXECUTE ON TYPE:: [dbo].[Community_Description_Rows] TO [web_user]
+GO
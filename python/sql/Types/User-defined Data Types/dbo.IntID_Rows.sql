@@ -0,0 +1,7 @@
+CREATE TYPE [dbo].[IntID_Rows] AS TABLE
+(
+[ID] [int] NOT NULL
+)
+GO
+GRANT EXECUTE ON TYPE:: [dbo].[IntID_Rows] TO [web_user]
+GO